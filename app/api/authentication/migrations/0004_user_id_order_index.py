@@ -0,0 +1,18 @@
+# Generated by Django 3.2.4 on 2026-10-18 10:29
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_user_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='user_id_order_idx'),
+        ),
+    ]
@@ -1,15 +1,15 @@
 
-from app.api.models import BaseModel
+from app.api.models import BaseManager, BaseModel
 from django.contrib.auth.models import (AbstractBaseUser, BaseUserManager,
                                         PermissionsMixin)
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from simple_history.models import HistoricalRecords
-from softdelete.models import SoftDeleteManager
 
 
 
-class UserManager(BaseUserManager, SoftDeleteManager):
+class UserManager(BaseUserManager, BaseManager):
     """
     Django requires that custom users define their own Manager class. By
     inheriting from `BaseUserManager`, we get a lot of the same code used by
@@ -81,6 +81,18 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
     # objects of this type.
     objects = UserManager()
 
+    class Meta(BaseModel.Meta):
+        indexes = BaseModel.Meta.indexes + [
+            GinIndex(fields=['first_name'], opclasses=['gin_trgm_ops'],
+                     name='user_first_name_trgm'),
+            GinIndex(fields=['last_name'], opclasses=['gin_trgm_ops'],
+                     name='user_last_name_trgm'),
+            GinIndex(fields=['username'], opclasses=['gin_trgm_ops'],
+                     name='user_username_trgm'),
+            GinIndex(fields=['email'], opclasses=['gin_trgm_ops'],
+                     name='user_email_trgm'),
+        ]
+
     def __str__(self):
         """
         Returns a string representation of this `User`.
@@ -2,8 +2,8 @@ import graphene
 from django_filters import OrderingFilter
 from graphene.types.generic import GenericScalar
 from graphene_django.types import DjangoObjectType
-from rolepermissions.roles import get_user_roles
 
+from ..helpers.loaders import load_roles
 from .models import User
 
 
@@ -29,11 +29,9 @@ class UserType(DjangoObjectType):
             self (obj): current model reference
             info (obj): metadata
         Return:
-            roles (list): user roles
+            roles (promise): user roles, batched across the request
         """
-        roles_ = get_user_roles(self)
-        roles = [role.get_name() for role in roles_ if roles_]
-        return roles
+        return load_roles(self, info)
 
 
 
@@ -88,3 +86,5 @@ class UsersPaginatedType(graphene.ObjectType):
     has_next = graphene.Boolean()
     has_prev = graphene.Boolean()
     items = graphene.List(UserType)
+    next_cursor = graphene.String()
+    prev_cursor = graphene.String()
@@ -5,6 +5,8 @@ from graphql_extensions.auth.decorators import login_required
 
 from ..helpers.pagination_helper import pagination_helper
 from ..helpers.permission_required import role_required, token_required
+from ..helpers.query_planner import optimize_queryset
+from ..helpers.trigram_helper import trigram_search
 from ..helpers.validation_errors import error_dict
 from .helpers.user_helpers import get_roles
 from ..helpers.validate_object_id import validate_object_id
@@ -19,8 +21,13 @@ class Query(ObjectType):
     profile = graphene.Field(UserType)
     users = graphene.Field(UsersPaginatedType,
                            search=graphene.String(),
+                           fuzzy=graphene.Boolean(),
+                           similarity=graphene.Float(),
                            page=graphene.Int(),
                            limit=graphene.Int(),
+                           after=graphene.String(),
+                           before=graphene.String(),
+                           count_mode=graphene.String(),
                            is_staff=graphene.Boolean())
     roles = graphene.List(graphene.String)
     role_permissions = graphene.Field(GenericScalar, role=graphene.String())
@@ -35,11 +42,22 @@ class Query(ObjectType):
 
     @token_required
     @login_required
-    def resolve_users(self, info, search=None, is_staff=False, **kwargs):
+    def resolve_users(self, info, search=None, is_staff=False, fuzzy=False,
+                      **kwargs):
         page = kwargs.get('page', 1)
         limit = kwargs.get('limit', 10)
         error_msg = error_dict['admin_only'].format('list users')
         role_required(info.context.user, ['admin', 'manager'], error_msg)
+        if search and fuzzy:
+            users = trigram_search(
+                User.objects.filter(username=info.context.user.username),
+                search, ['first_name', 'last_name', 'username', 'email'],
+                kwargs.get('similarity', None))
+            users = optimize_queryset(users, info, 'items')
+            return pagination_helper(
+                users, page, limit, UsersPaginatedType,
+                kwargs.get('after'), kwargs.get('before'),
+                kwargs.get('count_mode'))
         if search:
             filter = (
                 Q(first_name__icontains=search) |
@@ -55,7 +73,11 @@ class Query(ObjectType):
             if is_staff:
                 users = users.filter(is_staff=True)
         users = users.order_by('first_name')
-        return pagination_helper(users, page, limit, UsersPaginatedType)
+        users = optimize_queryset(users, info, 'items')
+        return pagination_helper(
+            users, page, limit, UsersPaginatedType,
+            kwargs.get('after'), kwargs.get('before'),
+            kwargs.get('count_mode'))
 
     @token_required
     @login_required
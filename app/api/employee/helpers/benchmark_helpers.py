@@ -0,0 +1,251 @@
+import random
+from datetime import date, timedelta
+from statistics import median
+from time import perf_counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...helpers.bulk_helper import bulk_create
+from ..models import (
+    Course, Department, Employee, Employer, Grade, Payroll, SubDepartment,
+    Title
+)
+from .search_helpers import update_employee_search_vector
+
+BATCH_SIZE = 5000
+FIRST_NAMES = ['Jane', 'Peter', 'Mary', 'John', 'Aisha', 'Brian', 'Faith',
+               'Kevin', 'Grace', 'Samuel', 'Mercy', 'Dennis']
+LAST_NAMES = ['Kiptoo', 'Otieno', 'Wanjiku', 'Mwangi', 'Achieng', 'Kamau',
+              'Njeri', 'Mutua', 'Chebet', 'Odhiambo']
+
+EMPLOYEE_FIELDS = '''
+            id
+            firstName
+            lastName
+            email
+            grade { gradeName }
+            jobTitle { titleName }
+            employerName { businessName }
+            department { departmentName subDepartments { name } }'''
+
+# Every query resolver with the variables it is benchmarked with. Detail
+# queries are given the id of a row of the model named last.
+BENCHMARK_CASES = [
+    ('employees', '''query {
+        employees(limit: 50) { count items {%s } } }''' % EMPLOYEE_FIELDS,
+     {}, None),
+    ('employees_deep_page', '''query {
+        employees(limit: 50, page: 100) { count items {%s } } }'''
+     % EMPLOYEE_FIELDS, {}, None),
+    ('employees_search', '''query($search: String) {
+        employees(search: $search, limit: 50) { count items {%s } } }'''
+     % EMPLOYEE_FIELDS, {'search': 'jane kiptoo'}, None),
+    ('employees_fuzzy', '''query($search: String) {
+        employees(search: $search, fuzzy: true, limit: 50) {
+            count items {%s } } }''' % EMPLOYEE_FIELDS,
+     {'search': 'Jaen'}, None),
+    ('employee', '''query($id: String) {
+        employee(id: $id) {%s } }''' % EMPLOYEE_FIELDS, {}, Employee),
+    ('employers', '''query {
+        employers(limit: 50) { count items {
+            id businessName employerDetails { username } } } }''',
+     {}, None),
+    ('employer', '''query($id: String) {
+        employer(id: $id) { id businessName } }''', {}, Employer),
+    ('courses', '''query {
+        courses(limit: 50) { count items { id courseName } } }''',
+     {}, None),
+    ('course', '''query($id: String) {
+        course(id: $id) { id courseName } }''', {}, Course),
+    ('departments', '''query {
+        departments(limit: 50) { count items {
+            id departmentName payGrade { gradeName }
+            subDepartments { name } } } }''', {}, None),
+    ('department', '''query($id: String) {
+        department(id: $id) { id departmentName } }''', {}, Department),
+    ('titles', '''query {
+        titles(limit: 50) { count items { id titleName } } }''', {}, None),
+    ('title', '''query($id: String) {
+        title(id: $id) { id titleName } }''', {}, Title),
+    ('grades', '''query {
+        grades(limit: 50) { count items { id gradeName } } }''', {}, None),
+    ('grade', '''query($id: String) {
+        grade(id: $id) { id gradeName } }''', {}, Grade),
+    ('payrolls', '''query {
+        payrolls(limit: 50) { count items {
+            id employeeNetSalary employee { firstName }
+            grade { gradeName } } } }''', {}, None),
+    ('payroll', '''query($id: String) {
+        payroll(id: $id) { id employeeNetSalary } }''', {}, Payroll),
+    ('users', '''query {
+        users(limit: 50) { count items { id username roles } } }''',
+     {}, None),
+    ('profile', '''query { profile { id username roles } }''', {}, None),
+    ('roles', '''query { roles }''', {}, None),
+    ('role_permissions', '''query {
+        rolePermissions(role: "admin") }''', {}, None),
+]
+
+
+def top_up(model, total, build):
+    '''
+    Creates rows of a model until it has the given number of them
+    Args:
+        model (obj): model class
+        total (int): number of rows wanted
+        build (func): builds the unsaved object for a row number
+    Return:
+        rows (list): every row of the model
+    '''
+    existing = model.objects.count()
+    for start in range(existing, total, BATCH_SIZE):
+        bulk_create(model, [build(number) for number in
+                            range(start, min(start + BATCH_SIZE, total))],
+                    BATCH_SIZE)
+    return list(model.objects.all())
+
+
+def generate_data(employees, user=None, seed=0):
+    '''
+    Grows the database to a synthetic data set of the given size. Rows
+    already there are kept so that data sets can be built up one size
+    after the other.
+    Args:
+        employees (int): number of employees and payroll rows
+        user (obj): user managing the employers
+        seed (int): random seed
+    '''
+    rng = random.Random(seed)
+    grades = top_up(Grade, 10, lambda number: Grade(
+        grade_name='Grade {}'.format(number), grade_basic=str(1000 * number),
+        grade_da='10%', grade_ta='500', grade_bonus=number, grade_pf='5%'))
+    titles = top_up(Title, 30, lambda number: Title(
+        title_name='Title {}'.format(number)))
+    courses = top_up(Course, 20, lambda number: Course(
+        course_name='Course {}'.format(number)))
+    sub_departments = top_up(SubDepartment, 40, lambda number: SubDepartment(
+        name='Unit {}'.format(number)))
+    new_departments = Department.objects.count() == 0
+    departments = top_up(Department, 20, lambda number: Department(
+        department_name='Department {}'.format(number),
+        pay_grade=rng.choice(grades)))
+    if new_departments:
+        through = Department.sub_departments.through
+        through.objects.bulk_create([
+            through(department_id=department.pk,
+                    subdepartment_id=sub_department.pk)
+            for department in departments
+            for sub_department in rng.sample(sub_departments, 2)])
+    employers = top_up(Employer, max(1, employees // 1000), lambda number:
+                       Employer(business_name='Employer {}'.format(number),
+                                location='Nairobi', employer_details=user))
+
+    def build_employee(number):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        return Employee(
+            first_name=first_name, last_name=last_name,
+            other_names=rng.choice(LAST_NAMES),
+            email='{}.{}{}@example.com'.format(
+                first_name, last_name, number).lower(),
+            address='Nairobi', date_of_birth=date(1980, 1, 1) + timedelta(
+                days=rng.randrange(10000)),
+            hiring_date=date(2015, 1, 1), current_salary=50000,
+            starting_salary=40000, job_title=rng.choice(titles),
+            employer_name=rng.choice(employers), grade=rng.choice(grades),
+            completed_courses=rng.choice(courses))
+
+    existing = Employee.objects.count()
+    through = Employee.department.through
+    for start in range(existing, employees, BATCH_SIZE):
+        batch = bulk_create(Employee, [
+            build_employee(number) for number in
+            range(start, min(start + BATCH_SIZE, employees))], BATCH_SIZE)
+        through.objects.bulk_create([
+            through(employee_id=employee.pk, department_id=department.pk)
+            for employee in batch
+            for department in rng.sample(departments, rng.randint(1, 2))])
+        bulk_create(Payroll, [
+            Payroll(period_number=1, employee_net_salary=45000,
+                    employee_gross_salary=50000,
+                    reimbursment_date=date(2021, 1, 31), employee=employee,
+                    grade=employee.grade) for employee in batch], BATCH_SIZE)
+        update_employee_search_vector(
+            Employee.objects.filter(pk__in=[item.pk for item in batch]))
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def explain_queries(queries):
+    '''
+    Gets the execution plans of the SELECT statements a request ran
+    Args:
+        queries (list): captured queries
+    Return:
+        plans (list): one text plan per statement
+    '''
+    plans = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            if not query['sql'].lstrip().upper().startswith('SELECT'):
+                continue
+            cursor.execute('EXPLAIN ' + query['sql'])
+            plans.append('\n'.join(row[0] for row in cursor.fetchall()))
+    return plans
+
+
+def run_case(client, query, variables, repeat):
+    '''
+    Times a query through the schema and records what it asks of the
+    database
+    Args:
+        client (obj): authenticated graphql test client
+        query (str): graphql query
+        variables (dict): query variables
+        repeat (int): number of timed runs
+    Return:
+        result (dict): median latency, query count, errors and plans
+    '''
+    # the first run warms up caches and is not timed
+    client.execute(query, variables)
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            start = perf_counter()
+            response = client.execute(query, variables)
+            timings.append((perf_counter() - start) * 1000)
+    return {
+        'latency_ms': round(median(timings), 3),
+        'queries': len(queries),
+        'errors': [str(error) for error in response.errors or []],
+        'plans': explain_queries(queries.captured_queries),
+    }
+
+
+def compare_with_baseline(results, baseline, tolerance, min_delta=2.0):
+    '''
+    Finds the cases that got slower or run more queries than recorded
+    in the baseline
+    Args:
+        results (dict): benchmark results keyed by case
+        baseline (dict): recorded results keyed by case
+        tolerance (float): allowed relative latency increase
+        min_delta (float): latency increase in ms always tolerated
+    Return:
+        regressions (list): regression messages
+    '''
+    regressions = []
+    for key, result in sorted(results.items()):
+        expected = baseline.get(key)
+        if not expected:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append('{}: {} queries, baseline {}'.format(
+                key, result['queries'], expected['queries']))
+        latency, allowed = result['latency_ms'], expected['latency_ms']
+        if latency > allowed * (1 + tolerance) and \
+                latency - allowed > min_delta:
+            regressions.append('{}: {:.1f}ms, baseline {:.1f}ms'.format(
+                key, latency, allowed))
+    return regressions
@@ -0,0 +1,238 @@
+import csv
+import io
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import models
+from django.db.models import Q
+
+from ...helpers.validation_errors import error_dict
+from ..models import Employee, Payroll
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # parquet exports are optional
+    pyarrow = None
+
+# Rows fetched from the server side cursor at a time
+EXPORT_CHUNK_SIZE = 2000
+
+# Columns of each export as header and lookup pairs. The headers are the
+# ones the import command reads so an export can be imported again.
+EXPORTS = {
+    'employees': (Employee, [
+        ('Id', 'id'),
+        ('First Name', 'first_name'),
+        ('Last Name', 'last_name'),
+        ('Other Names', 'other_names'),
+        ('Email', 'email'),
+        ('Address', 'address'),
+        ('Phone Numbers', 'phone_numbers'),
+        ('Emergency Numbers', 'emergency_numbers'),
+        ('Date Of Birth', 'date_of_birth'),
+        ('Hiring Date', 'hiring_date'),
+        ('Current Salary', 'current_salary'),
+        ('Starting Salary', 'starting_salary'),
+        ('Qualifications', 'qualifications'),
+        ('Employee Number', 'employee_number'),
+        ('Status', 'status'),
+        ('Gender', 'gender'),
+        ('Rate Hour', 'rate_hour'),
+        ('Period', 'period'),
+        ('Per Period', 'per_period'),
+        ('Job Title', 'job_title__title_name'),
+        ('Employer Name', 'employer_name__business_name'),
+        ('Grade', 'grade__grade_name'),
+        ('Completed Courses', 'completed_courses__course_name'),
+    ]),
+    'payrolls': (Payroll, [
+        ('Id', 'id'),
+        ('Employee Email', 'employee__email'),
+        ('Employee First Name', 'employee__first_name'),
+        ('Employee Last Name', 'employee__last_name'),
+        ('Period Number', 'period_number'),
+        ('Employee Net Salary', 'employee_net_salary'),
+        ('Employee Gross Salary', 'employee_gross_salary'),
+        ('Reimbursment Date', 'reimbursment_date'),
+        ('Grade', 'grade__grade_name'),
+    ]),
+}
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def get_export_queryset(kind):
+    '''
+    Builds the query of an export with its related names joined in and
+    the department names of employees aggregated into one column
+    Args:
+        kind (str): employees or payrolls
+    Return:
+        headers, queryset (tuple): column headers and a values list
+            queryset
+    '''
+    model, columns = EXPORTS[kind]
+    headers = [header for header, _ in columns]
+    queryset = model.objects.order_by('created_at', 'id').values_list(
+        *[lookup for _, lookup in columns])
+    if model is Employee:
+        headers.append('Department')
+        queryset = queryset.annotate(departments=StringAgg(
+            'department__department_name', ';', distinct=True,
+            filter=Q(department__deleted_at__isnull=True)))
+    return headers, queryset
+
+
+def get_export_rows(kind, chunk_size=EXPORT_CHUNK_SIZE):
+    '''
+    Reads the rows of an export through a server side cursor so that
+    only a chunk of them is held in memory at a time
+    Args:
+        kind (str): employees or payrolls
+        chunk_size (int): rows fetched at a time
+    Return:
+        headers, rows (tuple): column headers and a generator of row tuples
+    '''
+    headers, queryset = get_export_queryset(kind)
+    return headers, queryset.iterator(chunk_size=chunk_size)
+
+
+def export_csv(kind, chunk_size=EXPORT_CHUNK_SIZE):
+    '''
+    Writes an export as CSV text a chunk of rows at a time
+    Args:
+        kind (str): employees or payrolls
+        chunk_size (int): rows per chunk
+    Return:
+        chunks (generator): CSV text
+    '''
+    headers, rows = get_export_rows(kind, chunk_size)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % chunk_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+class ParquetStream(object):
+    """
+    Write only file that hands out what has been written to it so that a
+    parquet file can be sent while it is being written
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def get_parquet_type(model, lookup):
+    '''
+    Gets the parquet type of the model field a lookup reaches
+    Args:
+        model (obj): model class
+        lookup (str): field lookup
+    Return:
+        type (obj): arrow data type
+    '''
+    *relations, name = lookup.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    field = model._meta.get_field(name)
+    if isinstance(field, models.DateField):
+        return pyarrow.date32()
+    if isinstance(field, models.IntegerField):
+        return pyarrow.int64()
+    if isinstance(field, models.FloatField):
+        return pyarrow.float64()
+    return pyarrow.string()
+
+
+def export_parquet(kind, chunk_size=EXPORT_CHUNK_SIZE):
+    '''
+    Writes an export as a parquet file with a row group per chunk of rows
+    Args:
+        kind (str): employees or payrolls
+        chunk_size (int): rows per row group
+    Return:
+        chunks (generator): parquet file bytes
+    '''
+    model, columns = EXPORTS[kind]
+    headers, rows = get_export_rows(kind, chunk_size)
+    types = [get_parquet_type(model, lookup) for _, lookup in columns]
+    types += [pyarrow.string()] * (len(headers) - len(types))
+    schema = pyarrow.schema(list(zip(headers, types)))
+    stream = ParquetStream()
+    writer = pyarrow.parquet.ParquetWriter(stream, schema)
+
+    def write(chunk):
+        writer.write_table(pyarrow.Table.from_arrays(
+            [pyarrow.array(column, type=data_type) for column, data_type
+             in zip(zip(*chunk), types)], schema=schema))
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            write(chunk)
+            chunk = []
+            yield stream.drain()
+    if chunk:
+        write(chunk)
+    writer.close()
+    yield stream.drain()
+
+
+def stream_export(kind, file_format='csv', chunk_size=EXPORT_CHUNK_SIZE):
+    '''
+    Streams the employees or payrolls as a CSV or parquet file
+    Args:
+        kind (str): employees or payrolls
+        file_format (str): csv or parquet
+        chunk_size (int): rows per chunk
+    Return:
+        chunks (generator): file contents
+    Raise:
+        raise ValueError if the format is not available
+    '''
+    if file_format not in get_export_formats():
+        raise ValueError(error_dict['valid_options'].format(
+            'format', ', '.join(get_export_formats())))
+    if file_format == 'parquet':
+        return export_parquet(kind, chunk_size)
+    return export_csv(kind, chunk_size)
+
+
+def get_export_formats():
+    '''
+    Lists the export formats available in this environment
+    Return:
+        formats (list): format names
+    '''
+    return [name for name in EXPORT_FORMATS
+            if name != 'parquet' or pyarrow is not None]
@@ -0,0 +1,499 @@
+import csv
+import io
+import os
+
+import pandas as pd
+from django.db import connection, models, transaction
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+from ...helpers.push_id import push_id
+from ...helpers.reference_cache import reference_cache
+from ...helpers.response_cache import invalidate_models
+from ...helpers.validation_errors import error_dict
+from ..models import Department, Employee, Payroll
+from .search_helpers import update_employee_search_vector
+
+CHUNK_SIZE = 50000
+STAGE_TABLE = 'import_stage'
+# errors kept in the summary of an import, the rest are only written to
+# the errors file
+REPORTED_ERRORS = 100
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+
+
+def normalize_column(name):
+    '''
+    Turns a spreadsheet header into a field name e.g. "First Name" into
+    first_name
+    Args:
+        name (str): header
+    Return:
+        name (str): field name
+    '''
+    return '_'.join(str(name).strip().lower().split())
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    '''
+    Reads a CSV or Excel file a chunk of rows at a time. Every value is
+    read as stripped text and rows keep their position in the file as
+    their index.
+    Args:
+        path (str): file path
+        chunk_size (int): rows per chunk
+    Return:
+        chunks (generator): data frames
+    '''
+    if path.lower().endswith(('.xls', '.xlsx')):
+        # Excel files cannot be streamed but hold at most a million rows
+        frame = pd.read_excel(path, dtype=str, keep_default_na=False)
+        chunks = (frame.iloc[start:start + chunk_size]
+                  for start in range(0, len(frame), chunk_size))
+    else:
+        chunks = pd.read_csv(path, dtype=str, keep_default_na=False,
+                             chunksize=chunk_size)
+    for chunk in chunks:
+        chunk.columns = [normalize_column(name) for name in chunk.columns]
+        yield chunk.apply(lambda column: column.str.strip())
+
+
+def add_error(errors, mask, message):
+    '''
+    Adds a message to the errors of the rows selected by a mask
+    Args:
+        errors (obj): error messages series
+        mask (obj): boolean series
+        message (str): error message
+    '''
+    mask = mask.fillna(False).astype(bool)
+    errors[mask] = errors[mask] + '; ' + message
+
+
+def get_column(frame, name):
+    '''
+    Gets a column of a chunk, blank when the file does not have it
+    Args:
+        frame (obj): data frame
+        name (str): column name
+    Return:
+        column (obj): series
+    '''
+    if name in frame:
+        return frame[name]
+    return pd.Series('', index=frame.index, dtype=object)
+
+
+def convert(field, column, errors):
+    '''
+    Converts a text column to the values of a model field, recording
+    the rows whose value is missing or invalid
+    Args:
+        field (obj): model field
+        column (obj): text series
+        errors (obj): error messages series
+    Return:
+        values (obj): series of field values
+    '''
+    label = field.name.replace('_', ' ')
+    blank = column == ''
+    if not field.blank and not field.has_default():
+        add_error(errors, blank, error_dict['required'].format(label))
+    if isinstance(field, models.DateField):
+        values = pd.to_datetime(column, errors='coerce')
+        add_error(errors, ~blank & values.isna(),
+                  error_dict['invalid_input'].format(label))
+        values = values.dt.strftime('%Y-%m-%d')
+    elif isinstance(field, (models.FloatField, models.IntegerField)):
+        values = pd.to_numeric(column, errors='coerce')
+        invalid = ~blank & values.isna()
+        if isinstance(field, models.IntegerField):
+            invalid |= values.notna() & (values % 1 != 0)
+            values = values.where(~invalid).astype('Int64')
+        add_error(errors, invalid, error_dict['invalid_input'].format(label))
+    else:
+        values = column
+        if isinstance(field, models.EmailField):
+            values = column.str.lower()
+            add_error(errors, ~blank & ~values.str.match(EMAIL_PATTERN),
+                      error_dict['invalid_input'].format(label))
+        if field.choices:
+            options = [value for value, _ in field.choices]
+            add_error(errors, ~blank & ~values.isin(options),
+                      error_dict['valid_options'].format(
+                          label, ', '.join(options)))
+        if field.max_length:
+            add_error(errors, values.str.len() > field.max_length,
+                      error_dict['max_length'].format(
+                          label, field.max_length))
+    if field.has_default():
+        default = field.get_default()
+    else:
+        default = None if field.null else ''
+    return values.where(~blank, default)
+
+
+class Importer(object):
+    """
+    Loads the rows of a CSV or Excel file into a model. Each chunk of
+    rows is checked with vectorized pandas operations, copied into a
+    temporary staging table with COPY and merged into the table of the
+    model with set based statements, one transaction per chunk.
+    """
+    model = None
+    # model fields read from the columns of the same name
+    fields = ()
+    # foreign keys given by the value of a column of the related model
+    references = {}
+    # columns identifying the existing row an imported row updates
+    key = ()
+    # condition matching rows of the table t to staged rows s
+    match = ''
+    # staging columns that are not columns of the table
+    extra_columns = {}
+    # other models whose cached responses an import changes
+    related_models = ()
+
+    def __init__(self):
+        self.lookups = {
+            name: self.get_lookup(name) for name in self.references}
+
+    def get_lookup(self, name):
+        '''
+        Maps the names of the rows a foreign key may point to to their ids
+        Args:
+            name (str): foreign key name
+        Return:
+            lookup (dict): ids keyed by name
+        '''
+        related_model = self.model._meta.get_field(name).related_model
+        return dict(related_model.objects.values_list(
+            self.references[name], 'id'))
+
+    def clean(self, frame):
+        '''
+        Validates a chunk and converts it into staging table rows. Rows
+        replaced by a later row of the chunk with the same key are
+        rejected too.
+        Args:
+            frame (obj): data frame read from the file
+        Return:
+            staged, errors (tuple): data frame of the valid rows and the
+                row number and message of every invalid row
+        '''
+        errors = pd.Series('', index=frame.index, dtype=object)
+        staged = pd.DataFrame(index=frame.index)
+        # existing rows only take the values of the columns in the file
+        self.updated_columns = [
+            self.model._meta.get_field(name).column
+            for name in self.fields + tuple(self.references)
+            if name in frame] + ['updated_at']
+        for name in self.fields:
+            field = self.model._meta.get_field(name)
+            staged[field.column] = convert(
+                field, get_column(frame, name), errors)
+        for name in self.references:
+            field = self.model._meta.get_field(name)
+            column = get_column(frame, name)
+            ids = column.map(self.lookups[name])
+            add_error(errors, (column != '') & ids.isna(),
+                      error_dict['does_not_exist'].format(
+                          field.related_model.__name__))
+            staged[field.column] = ids.where(ids.notna(), None)
+        self.clean_extra(frame, staged, errors)
+        staged['row_number'] = frame.index + 2
+        valid = errors == ''
+        rejected = [(int(row), message) for row, message in zip(
+            staged['row_number'][~valid], errors[~valid].str[2:])]
+        staged = staged[valid]
+        if self.key:
+            # the last of the rows sharing a key replaces the others
+            key = list(self.key)
+            duplicated = staged.duplicated(subset=key, keep='last')
+            kept = staged.groupby(key, dropna=False)['row_number'].transform(
+                'last')
+            label = ', '.join(name.replace('_', ' ') for name in key)
+            rejected = sorted(rejected + [
+                (int(row), error_dict['duplicate_row'].format(
+                    int(replacement), label))
+                for row, replacement in zip(
+                    staged['row_number'][duplicated], kept[duplicated])])
+            staged = staged[~duplicated]
+        return staged, rejected
+
+    def clean_extra(self, frame, staged, errors):
+        '''
+        Fills the extra staging columns of a chunk
+        Args:
+            frame (obj): data frame read from the file
+            staged (obj): staging data frame
+            errors (obj): error messages series
+        '''
+
+    def stage(self, cursor, staged):
+        '''
+        Copies the valid rows of a chunk into a new staging table
+        Args:
+            cursor (obj): database cursor
+            staged (obj): staging data frame
+        Return:
+            columns (list): table columns to insert
+        '''
+        table = self.model._meta.db_table
+        now = timezone.now().isoformat()
+        staged = staged.assign(
+            id=push_id.next_ids(len(staged)),
+            created_at=now, updated_at=now)
+        cursor.execute('DROP TABLE IF EXISTS {}'.format(STAGE_TABLE))
+        cursor.execute(
+            'CREATE TEMPORARY TABLE {} (LIKE {} INCLUDING DEFAULTS) '
+            'ON COMMIT DROP'.format(STAGE_TABLE, table))
+        columns = dict(self.extra_columns, row_number='integer',
+                       existing='boolean NOT NULL DEFAULT false')
+        cursor.execute('ALTER TABLE {} {}'.format(STAGE_TABLE, ', '.join(
+            'ADD COLUMN {} {}'.format(name, kind)
+            for name, kind in columns.items())))
+        # empty values of text columns that cannot be null are empty
+        # strings rather than nulls
+        not_null = [field.column for field in self.model._meta.concrete_fields
+                    if isinstance(field, (models.CharField, models.TextField)) and
+                    not field.null and field.column in staged]
+        buffer = io.StringIO()
+        staged.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cursor.copy_expert('COPY {} ({}) FROM STDIN WITH (FORMAT csv{})'.format(
+            STAGE_TABLE, ', '.join(staged.columns),
+            ', FORCE_NOT_NULL ({})'.format(', '.join(not_null))
+            if not_null else ''), buffer)
+        return [column for column in staged.columns if column not in columns]
+
+    def resolve(self, cursor):
+        '''
+        Resolves staged references that are looked up in the database
+        Args:
+            cursor (obj): database cursor
+        Return:
+            errors (list): row number and message of every dropped row
+        '''
+        return []
+
+    def upsert(self, cursor, columns):
+        '''
+        Updates the rows the staged rows match and inserts the others
+        Args:
+            cursor (obj): database cursor
+            columns (list): table columns to insert
+        Return:
+            created, updated (tuple): inserted and updated row counts
+        '''
+        table = self.model._meta.db_table
+        updated = 0
+        if self.match:
+            cursor.execute(
+                'UPDATE {stage} s SET id = t.id, existing = true FROM {table} t '
+                'WHERE t.deleted_at IS NULL AND {match}'.format(
+                    stage=STAGE_TABLE, table=table, match=self.match))
+            cursor.execute(
+                'UPDATE {table} t SET {assignments} FROM {stage} s '
+                'WHERE s.existing AND t.id = s.id'.format(
+                    table=table, stage=STAGE_TABLE,
+                    assignments=', '.join('{0} = s.{0}'.format(column)
+                                          for column in self.updated_columns)))
+            updated = cursor.rowcount
+        cursor.execute(
+            'INSERT INTO {table} ({columns}) SELECT {columns} FROM {stage} '
+            'WHERE NOT existing'.format(
+                table=table, columns=', '.join(columns), stage=STAGE_TABLE))
+        return cursor.rowcount, updated
+
+    def after_upsert(self, cursor):
+        '''
+        Brings the rows that depend on the imported rows up to date
+        Args:
+            cursor (obj): database cursor
+        '''
+
+    def load(self, staged):
+        '''
+        Copies a chunk into the database in one transaction
+        Args:
+            staged (obj): staging data frame
+        Return:
+            created, updated, errors (tuple): inserted and updated row
+                counts and the rows dropped while loading
+        '''
+        with transaction.atomic(), connection.cursor() as cursor:
+            columns = self.stage(cursor, staged)
+            errors = self.resolve(cursor)
+            created, updated = self.upsert(cursor, columns)
+            self.after_upsert(cursor)
+            cursor.execute('DROP TABLE {}'.format(STAGE_TABLE))
+        return created, updated, errors
+
+    def run(self, path, chunk_size=CHUNK_SIZE, progress=None,
+            write_errors=None):
+        '''
+        Imports a file
+        Args:
+            path (str): CSV or Excel file path
+            chunk_size (int): rows per chunk
+            progress (func): called with the summary after every chunk
+            write_errors (func): called with the row errors of every chunk
+        Return:
+            summary (dict): row counts and the first row errors
+        '''
+        summary = {'rows': 0, 'created': 0, 'updated': 0, 'failed': 0,
+                   'errors': []}
+        for frame in read_chunks(path, chunk_size):
+            staged, errors = self.clean(frame)
+            created, updated = 0, 0
+            if len(staged):
+                created, updated, load_errors = self.load(staged)
+                errors = sorted(errors + load_errors)
+            summary['rows'] += len(frame)
+            summary['created'] += created
+            summary['updated'] += updated
+            summary['failed'] += len(errors)
+            summary['errors'] += errors[
+                :REPORTED_ERRORS - len(summary['errors'])]
+            if write_errors and errors:
+                write_errors(errors)
+            if progress:
+                progress(summary)
+        invalidate_models(self.model, *self.related_models)
+        return summary
+
+
+class DepartmentImporter(Importer):
+    """
+    Imports departments by name with their pay grade given by name
+    """
+    model = Department
+    fields = ('department_name',)
+    references = {'pay_grade': 'grade_name'}
+    key = ('department_name',)
+    match = 't.department_name = s.department_name'
+
+    def after_upsert(self, cursor):
+        # departments are looked up through the reference cache
+        reference_cache.clear()
+
+
+class EmployeeImporter(Importer):
+    """
+    Imports employees by email. The job title, employer, grade and
+    completed course are given by name and the department column holds
+    department names separated by semicolons.
+    """
+    model = Employee
+    fields = ('first_name', 'last_name', 'other_names', 'email', 'address',
+              'phone_numbers', 'emergency_numbers', 'date_of_birth',
+              'hiring_date', 'current_salary', 'starting_salary',
+              'qualifications', 'employee_number', 'status', 'gender',
+              'rate_hour', 'period', 'per_period')
+    references = {'job_title': 'title_name',
+                  'employer_name': 'business_name',
+                  'grade': 'grade_name',
+                  'completed_courses': 'course_name'}
+    key = ('email',)
+    match = 'lower(t.email) = s.email'
+    extra_columns = {'department_ids': 'text[]'}
+    related_models = (Department,)
+
+    def __init__(self):
+        super().__init__()
+        self.departments = dict(Department.objects.values_list(
+            'department_name', 'id'))
+
+    def clean_extra(self, frame, staged, errors):
+        names = get_column(frame, 'department').str.split(';').explode()
+        names = names.str.strip()
+        names = names[names != '']
+        ids = names.map(self.departments)
+        add_error(errors, ids.isna().groupby(level=0).any().reindex(
+            frame.index, fill_value=False),
+            error_dict['does_not_exist'].format('Department'))
+        links = ids.dropna().groupby(level=0).agg(
+            lambda values: '{' + ','.join(values) + '}')
+        staged['department_ids'] = links.reindex(frame.index).fillna('{}')
+
+    def after_upsert(self, cursor):
+        through = Employee.department.through._meta.db_table
+        cursor.execute(
+            'INSERT INTO {through} (employee_id, department_id) '
+            'SELECT DISTINCT s.id, d.department_id FROM {stage} s, '
+            'unnest(s.department_ids) AS d(department_id) '
+            'WHERE NOT EXISTS (SELECT 1 FROM {through} x '
+            'WHERE x.employee_id = s.id '
+            'AND x.department_id = d.department_id)'.format(
+                through=through, stage=STAGE_TABLE))
+        update_employee_search_vector(Employee.objects.filter(
+            pk__in=RawSQL('SELECT id FROM {}'.format(STAGE_TABLE), ())))
+
+
+class PayrollImporter(Importer):
+    """
+    Imports payroll rows by the email of the employee and the period
+    number, with the grade given by name
+    """
+    model = Payroll
+    fields = ('period_number', 'employee_net_salary',
+              'employee_gross_salary', 'reimbursment_date')
+    references = {'grade': 'grade_name'}
+    key = ('employee_email', 'period_number')
+    match = 't.employee_id = s.employee_id ' \
+            'AND t.period_number = s.period_number'
+    extra_columns = {'employee_email': 'text'}
+
+    def clean_extra(self, frame, staged, errors):
+        emails = get_column(frame, 'employee_email').str.lower()
+        add_error(errors, emails == '',
+                  error_dict['required'].format('employee email'))
+        staged['employee_email'] = emails
+        # filled in from the emails once the rows are staged
+        staged['employee_id'] = None
+
+    def resolve(self, cursor):
+        employees = Employee._meta.db_table
+        cursor.execute(
+            'UPDATE {stage} s SET employee_id = e.id FROM {employees} e '
+            'WHERE e.deleted_at IS NULL AND lower(e.email) = '
+            's.employee_email'.format(stage=STAGE_TABLE, employees=employees))
+        cursor.execute(
+            'DELETE FROM {} WHERE employee_id IS NULL '
+            'RETURNING row_number'.format(STAGE_TABLE))
+        return [(row, error_dict['does_not_exist'].format('Employee'))
+                for row, in cursor.fetchall()]
+
+
+IMPORTERS = {
+    'departments': DepartmentImporter,
+    'employees': EmployeeImporter,
+    'payrolls': PayrollImporter,
+}
+
+
+def import_file(kind, path, chunk_size=CHUNK_SIZE, progress=None,
+                errors_path=None):
+    '''
+    Imports a CSV or Excel file of departments, employees or payrolls
+    Args:
+        kind (str): one of the IMPORTERS
+        path (str): file path
+        chunk_size (int): rows per chunk
+        progress (func): called with the summary after every chunk
+        errors_path (str): CSV file to write every row error to
+    Return:
+        summary (dict): row counts and the first row errors
+    '''
+    importer = IMPORTERS[kind]()
+    if not errors_path:
+        return importer.run(path, chunk_size, progress)
+    # errors are written as they are found rather than kept in memory
+    with open(errors_path, 'w', newline='') as output:
+        writer = csv.writer(output)
+        writer.writerow(['row', 'error'])
+        summary = importer.run(path, chunk_size, progress, writer.writerows)
+    if not summary['failed']:
+        os.remove(errors_path)
+    return summary
@@ -0,0 +1,276 @@
+import pandas as pd
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from ...helpers.bulk_helper import bulk_create
+from ...helpers.response_cache import invalidate_models
+from ..models import Employee, Payroll, PayrollRun
+
+# Working days and hours in a month, used to scale daily and hourly pay
+WORKING_DAYS_PER_MONTH = 22
+WORKING_HOURS_PER_MONTH = WORKING_DAYS_PER_MONTH * 8
+# Pay periods in a month keyed by Employee.PeriodOptions
+PERIODS_PER_MONTH = {
+    Employee.PeriodOptions.DAILY: WORKING_DAYS_PER_MONTH,
+    Employee.PeriodOptions.WEEKLY: 52 / 12,
+    Employee.PeriodOptions.MONTHLY: 1,
+    Employee.PeriodOptions.YEARLY: 1 / 12,
+}
+# Columns read for every employee, named after the lookups they read
+PAYROLL_COLUMNS = {
+    'employee_id': 'id',
+    'current_salary': 'current_salary',
+    'rate_hour': 'rate_hour',
+    'period': 'period',
+    'per_period': 'per_period',
+    'grade_id': 'grade_id',
+    'grade_basic': 'grade__grade_basic',
+    'grade_da': 'grade__grade_da',
+    'grade_ta': 'grade__grade_ta',
+    'grade_bonus': 'grade__grade_bonus',
+    'grade_pf': 'grade__grade_pf',
+}
+EMPLOYEE_CHUNK_SIZE = 10000
+
+
+def get_partition_filters(partition):
+    '''
+    Turns a payroll partition into employee filters
+    Args:
+        partition (dict): employer id and employee id range
+    Return:
+        filters (dict): employee queryset filters
+    '''
+    if partition is None:
+        return {}
+    filters = {'id__gte': partition['start']}
+    if partition['employer'] is None:
+        filters['employer_name__isnull'] = True
+    else:
+        filters['employer_name'] = partition['employer']
+    if partition['end'] is not None:
+        filters['id__lt'] = partition['end']
+    return filters
+
+
+def get_payroll_partitions(size=None):
+    '''
+    Splits the active employees into partitions of one employer, or of a
+    range of employee ids of an employer with more than size employees
+    Args:
+        size (int): most employees of a partition
+    Return:
+        partitions (list): partition dicts holding a key, the employer id
+            and the first employee id of the partition and of the next
+    '''
+    size = size or settings.PAYROLL_PARTITION_SIZE
+    employer = Employee._meta.get_field('employer_name').column
+    with connection.cursor() as cursor:
+        # every size'th employee of an employer starts a partition
+        cursor.execute(
+            'SELECT employer, id FROM (SELECT {employer} AS employer, id, '
+            'row_number() OVER (PARTITION BY {employer} ORDER BY id) '
+            'AS position FROM {table} WHERE deleted_at IS NULL '
+            'AND status <> %s) e WHERE (position - 1) %% %s = 0 '
+            'ORDER BY employer NULLS FIRST, id'.format(
+                employer=employer, table=Employee._meta.db_table),
+            [Employee.StatusOptions.LAID_OFF, size])
+        starts = cursor.fetchall()
+    partitions = []
+    for index, (employer, start) in enumerate(starts):
+        following = starts[index + 1] if index + 1 < len(starts) else None
+        end = following[1] if following and following[0] == employer \
+            else None
+        partitions.append({'key': '{}:{}'.format(employer or '', start),
+                           'employer': employer, 'start': start,
+                           'end': end})
+    return partitions
+
+
+def lock_payroll(period_number, partition=None):
+    '''
+    Takes the transaction level advisory locks that keep runs of the
+    same period from paying an employee twice. A whole period run locks
+    the period, a partition shares the period lock and locks itself.
+    Args:
+        period_number (int): payroll period
+        partition (dict): partition being paid, if any
+    '''
+    key = 'payroll:{}'.format(period_number)
+    with connection.cursor() as cursor:
+        if partition is None:
+            cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))',
+                           [key])
+        else:
+            cursor.execute(
+                'SELECT pg_advisory_xact_lock_shared(hashtext(%s)), '
+                'pg_advisory_xact_lock(hashtext(%s))',
+                [key, '{}:{}'.format(key, partition['key'])])
+
+
+def load_payroll_frame(period_number, **filters):
+    '''
+    Reads the pay of the employees still owed a payroll for a period,
+    with the components of their grades, in one query
+    Args:
+        period_number (int): payroll period
+        filters (dict): employee filters
+    Return:
+        frame (obj): data frame with a row per employee
+    '''
+    employees = Employee.objects.filter(**filters).exclude(
+        status=Employee.StatusOptions.LAID_OFF).exclude(
+            id__in=Payroll.objects.filter(
+                period_number=period_number,
+                employee__isnull=False).values('employee_id'))
+    rows = employees.order_by().values_list(*PAYROLL_COLUMNS.values())
+    return pd.DataFrame.from_records(
+        rows.iterator(chunk_size=EMPLOYEE_CHUNK_SIZE),
+        columns=list(PAYROLL_COLUMNS))
+
+
+def compute_payroll(frame):
+    '''
+    Computes the monthly pay of every employee of a frame at once.
+    The base pay is the pay per period scaled to a month, else the hourly
+    rate over the working hours of a month, else the current salary.
+    The grade adds its basic, dearness and travel allowances and a bonus
+    percentage of the base pay. The provident fund percentage of the
+    grade is deducted from the base and basic pay. Grade components that
+    are not numbers count as zero.
+    Args:
+        frame (obj): data frame read by load_payroll_frame
+    Return:
+        frame (obj): the frame with gross, deductions and net columns
+    '''
+    def number(column):
+        return pd.to_numeric(frame[column], errors='coerce').fillna(0)
+
+    per_period = pd.to_numeric(frame['per_period'], errors='coerce')
+    rate_hour = pd.to_numeric(frame['rate_hour'], errors='coerce')
+    periods = frame['period'].map(PERIODS_PER_MONTH).fillna(1)
+    base = number('current_salary')
+    base = base.mask(rate_hour.notna(), rate_hour * WORKING_HOURS_PER_MONTH)
+    base = base.mask(per_period.notna(), per_period * periods)
+    basic = number('grade_basic')
+    gross = base + basic + number('grade_da') + number('grade_ta') + \
+        base * number('grade_bonus') / 100
+    deductions = (base + basic) * number('grade_pf') / 100
+    return frame.assign(gross=gross.round(2), deductions=deductions.round(2),
+                        net=(gross - deductions).round(2))
+
+
+def run_payroll(period_number, reimbursment_date, partition=None,
+                run_id=None):
+    '''
+    Creates the payroll of a period for every active employee, or those
+    of a partition, who does not have one yet, computing it for all of
+    them in one pass and inserting the rows in bulk
+    Args:
+        period_number (int): payroll period
+        reimbursment_date (date): payment date
+        partition (dict): partition of the employees to pay
+        run_id (str): payroll run the partition belongs to
+    Return:
+        summary (dict): payrolls created and their total gross,
+            deductions and net pay
+    '''
+    with transaction.atomic():
+        lock_payroll(period_number, partition)
+        frame = compute_payroll(load_payroll_frame(
+            period_number, **get_partition_filters(partition)))
+        payrolls = [
+            Payroll(period_number=period_number, employee_id=employee_id,
+                    grade_id=grade_id, employee_gross_salary=gross,
+                    employee_net_salary=net,
+                    reimbursment_date=reimbursment_date,
+                    payroll_run_id=run_id)
+            for employee_id, grade_id, gross, net in zip(
+                frame['employee_id'].tolist(), frame['grade_id'].tolist(),
+                frame['gross'].tolist(), frame['net'].tolist())
+        ]
+        bulk_create(Payroll, payrolls)
+    if payrolls:
+        invalidate_models(Payroll)
+    return {
+        'count': len(payrolls),
+        'gross': round(float(frame['gross'].sum()), 2),
+        'deductions': round(float(frame['deductions'].sum()), 2),
+        'net': round(float(frame['net'].sum()), 2),
+    }
+
+
+def create_payroll_run(period_number, reimbursment_date):
+    '''
+    Records a payroll run of a period split into partitions
+    Args:
+        period_number (int): payroll period
+        reimbursment_date (date): payment date
+    Return:
+        run (obj): payroll run
+    '''
+    run = PayrollRun(period_number=period_number,
+                     reimbursment_date=reimbursment_date,
+                     partitions=get_payroll_partitions())
+    run.save()
+    if not run.partitions:
+        finish_payroll_run(run)
+        run.save()
+    return run
+
+
+def get_pending_partitions(run):
+    '''
+    Lists the partitions of a run that have not been paid
+    Args:
+        run (obj): payroll run
+    Return:
+        partitions (list): partition dicts
+    '''
+    return [partition for partition in run.partitions
+            if partition['key'] not in run.completed]
+
+
+def finish_payroll_run(run):
+    '''
+    Totals the payrolls created by a run from the database, so that the
+    totals are right however many times partitions were retried and
+    leave out payrolls of the period created in other ways
+    Args:
+        run (obj): payroll run
+    '''
+    totals = Payroll.objects.filter(payroll_run=run).aggregate(
+        count=Count('id'), gross=Sum('employee_gross_salary'),
+        net=Sum('employee_net_salary'))
+    run.payroll_count = totals['count']
+    run.total_gross = round(totals['gross'] or 0, 2)
+    run.total_net = round(totals['net'] or 0, 2)
+    run.total_deductions = round(run.total_gross - run.total_net, 2)
+    run.status = PayrollRun.StatusOptions.FAILED if run.failed \
+        else PayrollRun.StatusOptions.COMPLETED
+
+
+def record_partition(run_id, key, error=None):
+    '''
+    Records that a partition of a run was paid or failed and totals the
+    run once every partition is done
+    Args:
+        run_id (str): payroll run id
+        key (str): partition key
+        error (str): error of a failed partition
+    Return:
+        run (obj): payroll run
+    '''
+    with transaction.atomic():
+        run = PayrollRun.objects.select_for_update().get(id=run_id)
+        if error is None:
+            run.failed.pop(key, None)
+            if key not in run.completed:
+                run.completed.append(key)
+        else:
+            run.failed[key] = error
+        if len(run.completed) + len(run.failed) >= len(run.partitions):
+            finish_payroll_run(run)
+        run.save()
+    return run
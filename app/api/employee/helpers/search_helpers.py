@@ -0,0 +1,128 @@
+import re
+
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector)
+from django.db.models import F, OuterRef, Subquery, TextField
+
+# The 'simple' configuration neither stems nor drops stop words which is
+# what we want for names, emails, phone numbers and employee numbers.
+SEARCH_CONFIG = 'simple'
+
+
+class ArrayToString(Subquery):
+    """
+    Collapses a single column subquery that returns many rows
+    (e.g. the names of all the departments of an employee) into
+    one space separated string.
+    """
+    template = "ARRAY_TO_STRING(ARRAY(%(subquery)s), ' ')"
+    output_field = TextField()
+
+
+def related_value(model, field_name, value):
+    """
+    Builds a subquery that returns a column of the row
+    an employee foreign key points to
+    Args:
+        model (obj): employee model
+        field_name (str): name of the foreign key on the employee
+        value (str): column (or lookup path) to return
+    Return:
+        subquery (obj): subquery expression
+    """
+    related_model = model._meta.get_field(field_name).related_model
+    # the soft delete manager includes deleted rows when filtering by pk
+    # so filter the queryset instead
+    return Subquery(
+        related_model._default_manager.all().filter(
+            pk=OuterRef(field_name)).values(value)[:1])
+
+
+def get_employee_search_vector(model):
+    """
+    Builds the weighted search document of an employee. The document
+    is made up of the employee's own columns together with the names of
+    the rows it is related to so that searching does not need any joins.
+    The model is passed in so that migrations can use their
+    historical models.
+    Args:
+        model (obj): employee model
+    Return:
+        search_vector (obj): search vector expression
+    """
+    department_model = model._meta.get_field('department').related_model
+    department_names = ArrayToString(
+        department_model._default_manager.filter(
+            employee=OuterRef('pk')).values('department_name'))
+    return (
+        SearchVector('first_name', 'last_name', 'other_names',
+                     weight='A', config=SEARCH_CONFIG) +
+        SearchVector('employee_number', 'email', 'phone_numbers',
+                     'emergency_numbers', weight='B', config=SEARCH_CONFIG) +
+        SearchVector(
+            related_value(model, 'job_title', 'title_name'),
+            related_value(model, 'employer_name', 'business_name'),
+            related_value(model, 'employer_name',
+                          'employer_details__username'),
+            related_value(model, 'employer_name',
+                          'employer_details__first_name'),
+            related_value(model, 'employer_name',
+                          'employer_details__last_name'),
+            department_names,
+            related_value(model, 'completed_courses', 'course_name'),
+            related_value(model, 'grade', 'grade_name'),
+            weight='C', config=SEARCH_CONFIG) +
+        SearchVector('address', 'qualifications', 'date_of_birth',
+                     'hiring_date', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_employee_search_vector(queryset):
+    """
+    Recomputes the stored search document of the given employees
+    in a single UPDATE statement
+    Args:
+        queryset (obj): employees queryset
+    Return:
+        count (int): number of updated employees
+    """
+    return queryset.update(
+        search_vector=get_employee_search_vector(queryset.model))
+
+
+def get_search_query(search):
+    '''
+    Converts the text typed by the user into a prefix matching
+    full text query so that partially typed words still match
+    Args:
+        search (str): search text
+    Return:
+        query (obj): search query or None if there is nothing to search
+    '''
+    terms = []
+    for word in search.split():
+        word = re.sub(r"[\\:*&|!()<>]", '', word).replace("'", "''")
+        if word:
+            terms.append("'{}':*".format(word))
+    if not terms:
+        return None
+    return SearchQuery(' & '.join(terms), search_type='raw',
+                       config=SEARCH_CONFIG)
+
+
+def search_employees(queryset, search):
+    '''
+    Filters employees using the indexed search document and
+    orders them by relevance
+    Args:
+        queryset (obj): employees queryset
+        search (str): search text
+    Return:
+        queryset (obj): matching employees, best matches first
+    '''
+    query = get_search_query(search)
+    if query is None:
+        return queryset
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F('search_vector'), query)
+    ).order_by('-rank', '-created_at')
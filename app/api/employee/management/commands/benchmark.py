@@ -0,0 +1,110 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from graphql_jwt.testcases import JSONWebTokenClient
+from rolepermissions.roles import assign_role
+
+from ...helpers.benchmark_helpers import (
+    BENCHMARK_CASES, compare_with_baseline, generate_data, run_case
+)
+from ....authentication.models import User
+
+
+class Command(BaseCommand):
+    help = ('Times every query resolver through the schema against '
+            'synthetic data sets in a throwaway database, and fails when '
+            'latency or query counts regress past a stored baseline.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default='1000,10000',
+            help='Comma separated employee counts to benchmark, '
+                 'e.g. 100000,1000000')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Timed runs per query')
+        parser.add_argument('--baseline', default='benchmark_baseline.json',
+                            help='Baseline file to compare against')
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Record the results as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed relative latency increase')
+        parser.add_argument('--output',
+                            help='File to write the results and query plans to')
+        parser.add_argument('--keepdb', action='store_true',
+                            help='Keep the benchmark database and its data '
+                                 'between runs')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            # time the resolvers rather than the response cache
+            with override_settings(GRAPHQL_RESPONSE_CACHE_URL=None):
+                results = self.run_benchmarks(sizes, options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options['keepdb'])
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+        summary = {key: {'latency_ms': result['latency_ms'],
+                         'queries': result['queries']}
+                   for key, result in results.items()}
+        if options['save_baseline']:
+            with open(options['baseline'], 'w') as baseline:
+                json.dump(summary, baseline, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(
+                'Baseline saved to {}'.format(options['baseline'])))
+            return
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(self.style.WARNING(
+                'No baseline at {}, nothing to compare'.format(
+                    options['baseline'])))
+            return
+        with open(options['baseline']) as baseline:
+            regressions = compare_with_baseline(
+                summary, json.load(baseline), options['tolerance'])
+        if regressions:
+            raise CommandError('Performance regressed:\n' +
+                               '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions'))
+
+    def run_benchmarks(self, sizes, repeat):
+        user = self.get_admin()
+        client = JSONWebTokenClient()
+        client.authenticate(user)
+        results = {}
+        for size in sizes:
+            self.stdout.write('Generating {} employees'.format(size))
+            generate_data(size, user)
+            for name, query, variables, model in BENCHMARK_CASES:
+                if model is not None:
+                    variables = dict(variables, id=model.objects.order_by(
+                        'created_at').values_list('pk', flat=True).first())
+                result = run_case(client, query, variables, repeat)
+                key = '{}:{}'.format(size, name)
+                results[key] = result
+                self.stdout.write('{:<32} {:>10.1f}ms {:>4} queries'.format(
+                    key, result['latency_ms'], result['queries']))
+                for error in result['errors']:
+                    self.stdout.write(self.style.WARNING(
+                        '{} failed: {}'.format(key, error)))
+        return results
+
+    def get_admin(self):
+        user = User.objects.filter(username='benchmark').first()
+        if user is None:
+            user = User.objects.create_user(
+                username='benchmark', email='benchmark@example.com',
+                password='Benchmark@123', first_name='Bench',
+                last_name='Mark', phone_number='+254700000000')
+            user.is_active = True
+            user.save()
+            assign_role(user, 'admin')
+        return user
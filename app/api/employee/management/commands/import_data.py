@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from ...helpers.import_helpers import CHUNK_SIZE, IMPORTERS, import_file
+from ...tasks import import_data
+
+
+class Command(BaseCommand):
+    help = ('Imports departments, employees or payrolls from a CSV or '
+            'Excel file, updating the rows that already exist.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(IMPORTERS),
+                            help='What the file holds')
+        parser.add_argument('path', help='CSV or Excel file to import')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                            help='Rows loaded per transaction')
+        parser.add_argument('--errors',
+                            help='CSV file to write the rejected rows to')
+        parser.add_argument('--async', action='store_true', dest='run_async',
+                            help='Queue the import on a celery worker')
+
+    def handle(self, *args, **options):
+        arguments = (options['kind'], options['path'],
+                     options['chunk_size'])
+        if options['run_async']:
+            result = import_data.delay(*arguments, options['errors'])
+            self.stdout.write('Queued import {}'.format(result.id))
+            return
+
+        def progress(summary):
+            self.stdout.write('{rows} rows read, {failed} rejected'.format(
+                **summary))
+        summary = import_file(*arguments, progress, options['errors'])
+        for row, message in summary['errors']:
+            self.stderr.write('Row {}: {}'.format(row, message))
+        self.stdout.write(self.style.SUCCESS(
+            '{rows} rows: {created} created, {updated} updated, '
+            '{failed} rejected'.format(**summary)))
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.4 on 2026-10-18 09:41
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from app.api.employee.helpers.search_helpers import update_employee_search_vector
+
+
+def populate_search_vector(apps, schema_editor):
+    Employee = apps.get_model('employee', 'Employee')
+    update_employee_search_vector(Employee.objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0009_employee_employee_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='employee_search_vector_idx'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
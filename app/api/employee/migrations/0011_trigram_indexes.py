@@ -0,0 +1,59 @@
+# Generated by Django 3.2.4 on 2026-10-18 09:43
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_user_trigram_indexes'),
+        ('employee', '0010_employee_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['course_name'], name='course_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['department_name'], name='department_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['first_name'], name='employee_first_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['last_name'], name='employee_last_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['other_names'], name='employee_other_names_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['email'], name='employee_email_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['phone_numbers'], name='employee_phone_numbers_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='employer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['business_name'], name='employer_business_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='employer',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['contact_name'], name='employer_contact_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['grade_name'], name='grade_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title_name'], name='title_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
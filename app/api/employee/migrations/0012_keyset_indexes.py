@@ -0,0 +1,65 @@
+# Generated by Django 3.2.4 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0011_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['created_at', 'id'], name='course_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['created_at', 'id'], name='department_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['created_at', 'id'], name='employee_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employer',
+            index=models.Index(fields=['created_at', 'id'], name='employer_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fulltimeemployee',
+            index=models.Index(fields=['created_at', 'id'], name='fulltimeemployee_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(fields=['created_at', 'id'], name='grade_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parttimeemployee',
+            index=models.Index(fields=['created_at', 'id'], name='parttimeemployee_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['created_at', 'id'], name='payroll_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['created_at', 'id'], name='receipt_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seasonalemployee',
+            index=models.Index(fields=['created_at', 'id'], name='seasonalemployee_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subdepartment',
+            index=models.Index(fields=['created_at', 'id'], name='subdepartment_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='temporaryemployee',
+            index=models.Index(fields=['created_at', 'id'], name='temporaryemployee_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['created_at', 'id'], name='title_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.4 on 2026-10-18 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0012_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollRun',
+            fields=[
+                ('deleted_at', models.DateTimeField(blank=True, db_index=True, default=None, editable=False, null=True)),
+                ('id', models.CharField(db_index=True, max_length=255, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('period_number', models.IntegerField()),
+                ('reimbursment_date', models.DateField()),
+                ('status', models.CharField(choices=[('R', 'Running'), ('C', 'Completed'), ('F', 'Failed')], default='R', max_length=2)),
+                ('partitions', models.JSONField(default=list)),
+                ('completed', models.JSONField(default=list)),
+                ('failed', models.JSONField(default=dict)),
+                ('payroll_count', models.IntegerField(default=0)),
+                ('total_gross', models.FloatField(default=0)),
+                ('total_deductions', models.FloatField(default=0)),
+                ('total_net', models.FloatField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='payrollrun',
+            index=models.Index(fields=['created_at', 'id'], name='payrollrun_keyset_idx'),
+        ),
+    ]
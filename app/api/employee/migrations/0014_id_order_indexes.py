@@ -0,0 +1,70 @@
+# Generated by Django 3.2.4 on 2026-10-18 10:29
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0013_payroll_run'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='course_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='department_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='employee_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employer',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='employer_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fulltimeemployee',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='fulltimeemployee_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grade',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='grade_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parttimeemployee',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='parttimeemployee_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='payroll_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payrollrun',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='payrollrun_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='receipt_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='seasonalemployee',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='seasonalemployee_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subdepartment',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='subdepartment_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='temporaryemployee',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='temporaryemployee_id_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='title_id_order_idx'),
+        ),
+    ]
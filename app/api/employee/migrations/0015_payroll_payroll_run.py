@@ -0,0 +1,19 @@
+# Generated by Django 3.2.4 on 2026-10-18 10:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0014_id_order_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payroll',
+            name='payroll_run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payrolls', to='employee.payrollrun'),
+        ),
+    ]
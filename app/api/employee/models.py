@@ -3,6 +3,8 @@ from app.api.models import BaseModel
 from ..authentication.helpers.user_helpers import create_username_slug
 from ..authentication.models import User
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.translation import gettext_lazy as _
 # Create your models here.
 
@@ -62,6 +64,14 @@ class Employer(BaseModel):
     industry = models.CharField(max_length=255, null=True, blank=True)
     size = models.TextField(blank=True, null=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = BaseModel.Meta.indexes + [
+            GinIndex(fields=['business_name'], opclasses=['gin_trgm_ops'],
+                     name='employer_business_name_trgm'),
+            GinIndex(fields=['contact_name'], opclasses=['gin_trgm_ops'],
+                     name='employer_contact_name_trgm'),
+        ]
+
 
 class Grade(BaseModel):
     """
@@ -83,6 +93,12 @@ class Grade(BaseModel):
     grade_bonus = models.FloatField()
     grade_pf = models.CharField(max_length=255)
 
+    class Meta(BaseModel.Meta):
+        indexes = BaseModel.Meta.indexes + [
+            GinIndex(fields=['grade_name'], opclasses=['gin_trgm_ops'],
+                     name='grade_name_trgm'),
+        ]
+
 class SubDepartment(BaseModel):
     name =  models.CharField(max_length=255)
 
@@ -103,6 +119,12 @@ class Department(BaseModel):
     pay_grade = models.ForeignKey(Grade, on_delete=models.CASCADE,
                                 null=True, blank=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = BaseModel.Meta.indexes + [
+            GinIndex(fields=['department_name'], opclasses=['gin_trgm_ops'],
+                     name='department_name_trgm'),
+        ]
+
 
 
 
@@ -116,6 +138,12 @@ class Title(BaseModel):
     """
     title_name = models.TextField()
 
+    class Meta(BaseModel.Meta):
+        indexes = BaseModel.Meta.indexes + [
+            GinIndex(fields=['title_name'], opclasses=['gin_trgm_ops'],
+                     name='title_name_trgm'),
+        ]
+
 
 class Course(BaseModel):
     """
@@ -137,8 +165,12 @@ class Course(BaseModel):
                                     choices=LevelOptions.choices,
                                     default=LevelOptions.DEGREE)
 
-    class Meta:
+    class Meta(BaseModel.Meta):
         unique_together = ['course_name', 'course_level']
+        indexes = BaseModel.Meta.indexes + [
+            GinIndex(fields=['course_name'], opclasses=['gin_trgm_ops'],
+                     name='course_name_trgm'),
+        ]
 
 
 class Employee(BaseModel):
@@ -168,6 +200,7 @@ class Employee(BaseModel):
         - recommendations(text field)
         - employee grade(character field)
         - status(character field choices)
+        - search vector(full text search document)
         - reviews (to do)
         - recruitment (to do)
     """
@@ -226,6 +259,23 @@ class Employee(BaseModel):
                             default=PeriodOptions.MONTHLY)
     per_period = models.FloatField(blank=True, null=True)
     grade = models.ForeignKey(Grade, on_delete=models.SET_NULL, null=True, blank=True)
+    # weighted search document kept up to date by the employee signals
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta(BaseModel.Meta):
+        indexes = BaseModel.Meta.indexes + [
+            GinIndex(fields=['search_vector'], name='employee_search_vector_idx'),
+            GinIndex(fields=['first_name'], opclasses=['gin_trgm_ops'],
+                     name='employee_first_name_trgm'),
+            GinIndex(fields=['last_name'], opclasses=['gin_trgm_ops'],
+                     name='employee_last_name_trgm'),
+            GinIndex(fields=['other_names'], opclasses=['gin_trgm_ops'],
+                     name='employee_other_names_trgm'),
+            GinIndex(fields=['email'], opclasses=['gin_trgm_ops'],
+                     name='employee_email_trgm'),
+            GinIndex(fields=['phone_numbers'], opclasses=['gin_trgm_ops'],
+                     name='employee_phone_numbers_trgm'),
+        ]
 
     def __str__(self):
         """
@@ -333,6 +383,7 @@ class Payroll(BaseModel):
         - reimbursment_date(date field)
         - transaction_id (to do )
         - emp_id(foreign key field)
+        - payroll_run(foreign key field)
     """
     period_number = models.IntegerField()
     employee_net_salary = models.FloatField()
@@ -341,6 +392,48 @@ class Payroll(BaseModel):
     employee = models.ForeignKey(
         Employee, on_delete=models.CASCADE, null=True, blank=True)
     grade = models.ForeignKey(Grade, on_delete=models.SET_NULL, blank=True, null=True)
+    # the partitioned run that created the payroll, if any
+    payroll_run = models.ForeignKey(
+        'PayrollRun', on_delete=models.SET_NULL, blank=True, null=True,
+        related_name='payrolls')
+
+
+class PayrollRun(BaseModel):
+    """
+    This class(database table) tracks a payroll run
+    of a period that is split into partitions of
+    employees paid in parallel by the celery workers.
+    The fields belonging to this class are:
+        - period_number(integer field)
+        - reimbursment_date(date field)
+        - status(character field choices)
+        - partitions(json field)
+        - completed(json field)
+        - failed(json field)
+        - payroll_count(integer field)
+        - total_gross(float field)
+        - total_deductions(float field)
+        - total_net(float field)
+    """
+    class StatusOptions(models.TextChoices):
+        RUNNING = 'R', _('Running')
+        COMPLETED = 'C', _('Completed')
+        FAILED = 'F', _('Failed')
+
+    period_number = models.IntegerField()
+    reimbursment_date = models.DateField()
+    status = models.CharField(max_length=2, choices=StatusOptions.choices,
+                              default=StatusOptions.RUNNING)
+    # employer and employee id range of every partition
+    partitions = models.JSONField(default=list)
+    # keys of the partitions paid
+    completed = models.JSONField(default=list)
+    # errors of the partitions that failed keyed by partition
+    failed = models.JSONField(default=dict)
+    payroll_count = models.IntegerField(default=0)
+    total_gross = models.FloatField(default=0)
+    total_deductions = models.FloatField(default=0)
+    total_net = models.FloatField(default=0)
 
 
 class Receipt(BaseModel):
@@ -1,14 +1,26 @@
 import graphene
+from django.conf import settings
+from django.db import transaction
+from graphql import GraphQLError
 from graphql_extensions.auth.decorators import login_required
 
+from ..helpers.bulk_helper import BATCH_SIZE, bulk_create
 from ..helpers.permission_required import role_required, token_required
 from ..helpers.validation_errors import error_dict
 from ..helpers.constants import SUCCESS_ACTION
+from ..helpers.reference_cache import get_reference, get_references
+from ..helpers.response_cache import invalidate_models
 from .models import (
     Employee, Employer, Grade,
-    Title, Course, Payroll, Department, SubDepartment
+    Title, Course, Payroll, PayrollRun, Department, SubDepartment
 )
 from ..authentication.models import User
+from .helpers.payroll_helpers import (
+    create_payroll_run, finish_payroll_run, get_pending_partitions,
+    run_payroll
+)
+from .helpers.search_helpers import update_employee_search_vector
+from .tasks import queue_payroll_run
 from .validators.validate_input import EmployeeValidations
 from app.api.helpers.validate_object_id import validate_object_id
 from .object_types import (
@@ -19,7 +31,8 @@ from .object_types import (
     GradeInput, GradeType,
     DepartmentInput, DepartmentType,
     SubDepartmentInput,SubDepartmentType,
-    PayrollInput, PayrollType,
+    PayrollInput, PayrollType, PayrollRunType,
+    RowErrorType,
     TitleInput, TitleType
 )
 from datetime import datetime
@@ -56,18 +69,78 @@ class CreateEmployee(graphene.Mutation):
         data = validator.validate_employee_registration_data(
             kwargs.get("input", '')
         )
-        departments = data.pop("department", [])
+        departments = get_references(
+            data.pop("department", None) or [], Department, "Department")
         new_employee = Employee(**data)
         new_employee.save()
         if departments:
-            for department in departments:
-                department_ = Department.objects.get(id=department)
-                new_employee.department.add(department_)
+            new_employee.department.add(*departments)
         return CreateEmployee(status="Success",
                               employee=new_employee,
                               message=SUCCESS_ACTION.format("Employee created"))
 
 
+class CreateEmployees(graphene.Mutation):
+    """
+    This class handles the creation of many employees
+    at once. Every row is validated before any is saved
+    and nothing is saved unless all of them are valid.
+    """
+    employees = graphene.List(EmployeeType)
+    errors = graphene.List(RowErrorType)
+    status = graphene.String()
+    message = graphene.String()
+
+    class Arguments:
+        """
+        this class handles the arguments to be
+        passed in during the employees creation
+        """
+        input = graphene.List(EmployeeInput, required=True)
+
+    @staticmethod
+    @token_required
+    @login_required
+    def mutate(self, info, **kwargs):
+        """
+        the mutation for the bulk employee creation.
+        The employees and their department links are
+        inserted in batches within one transaction.
+        """
+        error_msg = error_dict['admin_only'].format("create employees")
+        role_required(info.context.user, ['admin', 'manager'], error_msg)
+        rows = kwargs.get("input", [])
+        if len(rows) > settings.BULK_CREATE_MAX_ROWS:
+            raise GraphQLError(error_dict['too_many_rows'].format(
+                settings.BULK_CREATE_MAX_ROWS))
+        validator = EmployeeValidations()
+        employees, errors = validator.validate_employee_rows(rows)
+        if errors:
+            return CreateEmployees(
+                status="Failed", employees=[],
+                errors=[RowErrorType(index=index, message=message)
+                        for index, message in errors],
+                message=error_dict['invalid_rows'].format(len(errors)))
+
+        employees = [employee for _, employee in employees]
+        through = Employee.department.through
+        with transaction.atomic():
+            bulk_create(Employee, employees)
+            through.objects.bulk_create([
+                through(employee_id=employee.pk, department_id=department.pk)
+                for employee in employees
+                for department in employee.departments
+            ], batch_size=BATCH_SIZE)
+            # bulk inserts send no signals
+            update_employee_search_vector(Employee.objects.filter(
+                pk__in=[employee.pk for employee in employees]))
+        invalidate_models(Employee, Department)
+        return CreateEmployees(
+            status="Success", employees=employees, errors=[],
+            message=SUCCESS_ACTION.format(
+                "{} employees created".format(len(employees))))
+
+
 class UpdateEmployee(graphene.Mutation):
     """
     this class does the literal updating
@@ -93,13 +166,15 @@ class UpdateEmployee(graphene.Mutation):
         error_msg = error_dict['admin_only'].format('update employee records')
         role_required(info.context.user, ['admin', 'manager'], error_msg)
         id = kwargs.get('id', None)
-        departments = kwargs['input'].pop('department', '')
+        departments = get_references(
+            kwargs['input'].pop('department', None) or [], Department,
+            "Department")
         if kwargs['input']['employer_name']:
-            kwargs['input']['employer_name'] = validate_object_id(
+            kwargs['input']['employer_name'] = get_reference(
                 kwargs['input']['employer_name'], Employer,
                 "Employer")
         if kwargs['input']['job_title']:
-            kwargs['input']['job_title'] = validate_object_id(
+            kwargs['input']['job_title'] = get_reference(
                 kwargs['input']['job_title'], Title,
                 "Title")
         employee_ = Employee.objects.get(id=id)
@@ -110,9 +185,7 @@ class UpdateEmployee(graphene.Mutation):
 
 
         if departments:
-            for department in departments:
-                department_ = Department.objects.get(id=department)
-                employee_.department.add(department_)
+            employee_.department.add(*departments)
 
         status = "Success"
         message = SUCCESS_ACTION.format("Employee record updated")
@@ -404,6 +477,134 @@ class CreatePayroll(graphene.Mutation):
                              message=SUCCESS_ACTION.format("Payroll created"))
 
 
+class RunPayroll(graphene.Mutation):
+    """
+    This class computes and saves the payroll
+    of a period for every active employee
+    who does not have one yet.
+    """
+    count = graphene.Int()
+    total_gross = graphene.Float()
+    total_deductions = graphene.Float()
+    total_net = graphene.Float()
+    status = graphene.String()
+    message = graphene.String()
+
+    class Arguments:
+        """
+        this class handles the arguments to be
+        passed in during the payroll run
+        """
+        period_number = graphene.Int(required=True)
+        reimbursment_date = graphene.Date()
+
+    @staticmethod
+    @token_required
+    @login_required
+    def mutate(self, info, **kwargs):
+        """
+        the mutation for the payroll run. The pay of
+        every employee is computed at once and the
+        payrolls are inserted in batches.
+        """
+        error_msg = error_dict['admin_only'].format("run a payroll")
+        role_required(info.context.user, ['admin', 'manager'], error_msg)
+        summary = run_payroll(
+            kwargs['period_number'],
+            kwargs.get('reimbursment_date') or datetime.now().date())
+        return RunPayroll(
+            status="Success", count=summary['count'],
+            total_gross=summary['gross'],
+            total_deductions=summary['deductions'],
+            total_net=summary['net'],
+            message=SUCCESS_ACTION.format(
+                "{} payrolls created".format(summary['count'])))
+
+
+class StartPayrollRun(graphene.Mutation):
+    """
+    This class splits the payroll of a period
+    into partitions of employees that the
+    celery workers pay in parallel.
+    """
+    payroll_run = graphene.Field(PayrollRunType)
+    status = graphene.String()
+    message = graphene.String()
+
+    class Arguments:
+        """
+        this class handles the arguments to be
+        passed in during the payroll run
+        """
+        period_number = graphene.Int(required=True)
+        reimbursment_date = graphene.Date()
+
+    @staticmethod
+    @token_required
+    @login_required
+    def mutate(self, info, **kwargs):
+        """
+        the mutation for starting a payroll run.
+        Its progress is read with the payrollRun query.
+        """
+        error_msg = error_dict['admin_only'].format("run a payroll")
+        role_required(info.context.user, ['admin', 'manager'], error_msg)
+        with transaction.atomic():
+            run = create_payroll_run(
+                kwargs['period_number'],
+                kwargs.get('reimbursment_date') or datetime.now().date())
+            queue_payroll_run(run)
+        return StartPayrollRun(
+            status="Success", payroll_run=run,
+            message=SUCCESS_ACTION.format("Payroll run started"))
+
+
+class ResumePayrollRun(graphene.Mutation):
+    """
+    This class queues the partitions of a
+    payroll run that failed or were not paid.
+    """
+    payroll_run = graphene.Field(PayrollRunType)
+    status = graphene.String()
+    message = graphene.String()
+
+    class Arguments:
+        """
+        this class handles the arguments to be
+        passed in during the payroll run
+        """
+        id = graphene.String(required=True)
+
+    @staticmethod
+    @token_required
+    @login_required
+    def mutate(self, info, **kwargs):
+        """
+        the mutation for resuming a failed payroll run.
+        Partitions already paid are not queued again.
+        """
+        error_msg = error_dict['admin_only'].format("run a payroll")
+        role_required(info.context.user, ['admin', 'manager'], error_msg)
+        validate_object_id(kwargs.get('id'), PayrollRun, "Payroll run")
+        with transaction.atomic():
+            run = PayrollRun.objects.select_for_update().get(
+                id=kwargs['id'])
+            # the partitions of a running run are still queued
+            if run.status != PayrollRun.StatusOptions.FAILED:
+                raise GraphQLError(
+                    error_dict['not_resumable'].format('payroll runs'))
+            run.failed = {}
+            if get_pending_partitions(run):
+                run.status = PayrollRun.StatusOptions.RUNNING
+            else:
+                finish_payroll_run(run)
+            run.save()
+            queue_payroll_run(run)
+        return ResumePayrollRun(
+            status="Success", payroll_run=run,
+            message=SUCCESS_ACTION.format("Payroll run resumed"))
+
+
 class UpdatePayroll(graphene.Mutation):
     """
     this class does the literal updating
@@ -654,7 +855,7 @@ class UpdateDepartment(graphene.Mutation):
         department_ = Department.objects.get(id=id)
         sub_departments = kwargs['input'].pop('sub_departments', [])
         if kwargs['input']['pay_grade']:
-            kwargs['input']['pay_grade'] = validate_object_id(
+            kwargs['input']['pay_grade'] = get_reference(
                 kwargs['input']['pay_grade'], Grade,
                 "Grade")
         for sub_dept in sub_departments:
@@ -692,6 +893,8 @@ class UpdateSubDepartment(graphene.Mutation):
         data = kwargs['input']
         add_ben = SubDepartment.objects.filter(id=id)
         add_ben.update(**data)
+        # queryset updates send no signals
+        invalidate_models(SubDepartment)
 
         sub_department = SubDepartment.objects.get(id=id)
         status = "Success"
@@ -870,6 +1073,7 @@ class DeleteGrade(graphene.Mutation):
 
 class Mutation(graphene.ObjectType):
     create_employee = CreateEmployee.Field()
+    create_employees = CreateEmployees.Field()
     update_employee = UpdateEmployee.Field()
     delete_employee = DeleteEmployee.Field()
     create_employer = CreateEmployer.Field()
@@ -882,6 +1086,9 @@ class Mutation(graphene.ObjectType):
     update_title = UpdateTitle.Field()
     delete_title = DeleteTitle.Field()
     create_payroll = CreatePayroll.Field()
+    run_payroll = RunPayroll.Field()
+    start_payroll_run = StartPayrollRun.Field()
+    resume_payroll_run = ResumePayrollRun.Field()
     update_payroll = UpdatePayroll.Field()
     delete_payroll = DeletePayroll.Field()
     create_grade = CreateGrade.Field()
@@ -3,6 +3,7 @@ from django_filters import OrderingFilter
 from graphene.types.generic import GenericScalar
 from graphene_django.types import DjangoObjectType
 
+from ..helpers.loaders import load_related
 from .models import (
     Employer,
     Employee,
@@ -11,6 +12,7 @@ from .models import (
     Title,
     Course,
     Payroll,
+    PayrollRun,
     SubDepartment
 )
 
@@ -27,6 +29,8 @@ class EmployerType(DjangoObjectType):
         """
         model = Employer
 
+    resolve_employer_details = load_related('employer_details')
+
 
 class EmployeeType(DjangoObjectType):
     """
@@ -42,6 +46,13 @@ class EmployeeType(DjangoObjectType):
         to be serialized in the user model
         """
         model = Employee
+        exclude_fields = ('search_vector',)
+
+    resolve_job_title = load_related('job_title')
+    resolve_employer_name = load_related('employer_name')
+    resolve_department = load_related('department')
+    resolve_completed_courses = load_related('completed_courses')
+    resolve_grade = load_related('grade')
 
 
 class DepartmentType(DjangoObjectType):
@@ -56,6 +67,9 @@ class DepartmentType(DjangoObjectType):
         """
         model = Department
 
+    resolve_pay_grade = load_related('pay_grade')
+    resolve_sub_departments = load_related('sub_departments')
+
 
 class SubDepartmentType(DjangoObjectType):
     """
@@ -123,6 +137,45 @@ class PayrollType(DjangoObjectType):
         """
         model = Payroll
 
+    resolve_employee = load_related('employee')
+    resolve_grade = load_related('grade')
+
+
+class PayrollRunType(DjangoObjectType):
+    """
+    This class creates a graphql type for
+    the progress of a payroll run
+    """
+    total_partitions = graphene.Int()
+    completed_partitions = graphene.Int()
+    failed_partitions = GenericScalar()
+
+    class Meta:
+        """
+        This class defines the fields
+        to be serialized in the payroll run model
+        """
+        model = PayrollRun
+        exclude = ('partitions', 'completed', 'failed', 'payrolls')
+
+    def resolve_total_partitions(self, info, **kwargs):
+        return len(self.partitions)
+
+    def resolve_completed_partitions(self, info, **kwargs):
+        return len(self.completed)
+
+    def resolve_failed_partitions(self, info, **kwargs):
+        return self.failed
+
+
+class RowErrorType(graphene.ObjectType):
+    """
+    This class creates a graphql type for an
+    error found in one row of a bulk input
+    """
+    index = graphene.Int()
+    message = graphene.String()
+
 
 
 
@@ -214,6 +267,8 @@ class EmployeePaginatedType(graphene.ObjectType):
     has_next = graphene.Boolean()
     has_prev = graphene.Boolean()
     items = graphene.List(EmployeeType)
+    next_cursor = graphene.String()
+    prev_cursor = graphene.String()
 
 
 class EmployerPaginatedType(graphene.ObjectType):
@@ -226,6 +281,8 @@ class EmployerPaginatedType(graphene.ObjectType):
     has_next = graphene.Boolean()
     has_prev = graphene.Boolean()
     items = graphene.List(EmployerType)
+    next_cursor = graphene.String()
+    prev_cursor = graphene.String()
 
 
 class PayrollPaginatedType(graphene.ObjectType):
@@ -238,6 +295,8 @@ class PayrollPaginatedType(graphene.ObjectType):
     has_next = graphene.Boolean()
     has_prev = graphene.Boolean()
     items = graphene.List(PayrollType)
+    next_cursor = graphene.String()
+    prev_cursor = graphene.String()
 
 
 class CoursePaginatedType(graphene.ObjectType):
@@ -250,6 +309,8 @@ class CoursePaginatedType(graphene.ObjectType):
     has_next = graphene.Boolean()
     has_prev = graphene.Boolean()
     items = graphene.List(CourseType)
+    next_cursor = graphene.String()
+    prev_cursor = graphene.String()
 
 class TitlePaginatedType(graphene.ObjectType):
     """
@@ -261,6 +322,8 @@ class TitlePaginatedType(graphene.ObjectType):
     has_next = graphene.Boolean()
     has_prev = graphene.Boolean()
     items = graphene.List(TitleType)
+    next_cursor = graphene.String()
+    prev_cursor = graphene.String()
 
 class DepartmentPaginatedType(graphene.ObjectType):
     """
@@ -272,6 +335,8 @@ class DepartmentPaginatedType(graphene.ObjectType):
     has_next = graphene.Boolean()
     has_prev = graphene.Boolean()
     items = graphene.List(DepartmentType)
+    next_cursor = graphene.String()
+    prev_cursor = graphene.String()
 
 class GradePaginatedType(graphene.ObjectType):
     """
@@ -283,6 +348,8 @@ class GradePaginatedType(graphene.ObjectType):
     has_next = graphene.Boolean()
     has_prev = graphene.Boolean()
     items = graphene.List(GradeType)
+    next_cursor = graphene.String()
+    prev_cursor = graphene.String()
 
 
 class EmployeeInput(graphene.InputObjectType):
@@ -6,23 +6,26 @@ from graphene.types.generic import GenericScalar
 
 from app.api.helpers.pagination_helper import pagination_helper
 from app.api.helpers.permission_required import token_required
+from app.api.helpers.query_planner import optimize_queryset
+from app.api.helpers.trigram_helper import trigram_search
 from app.api.helpers.validate_object_id import validate_object_id
 from .models import (
     Employee, Employer,
-    Course,Payroll,Grade,
+    Course,Payroll,PayrollRun,Grade,
     Title,Department
 )
 from .object_types import (
     EmployeeType, EmployeePaginatedType,
     EmployerType, EmployerPaginatedType,
     CourseType,CoursePaginatedType,
-    PayrollType,PayrollPaginatedType,
+    PayrollType,PayrollPaginatedType,PayrollRunType,
     TitleType,TitlePaginatedType,
     DepartmentType,DepartmentPaginatedType,
     GradeType,GradePaginatedType
 )
 
 from .helpers.employee_helpers import get_default_status
+from .helpers.search_helpers import search_employees
 
 
 class Query(ObjectType):
@@ -31,49 +34,85 @@ class Query(ObjectType):
         EmployeePaginatedType,
         page=graphene.Int(),
         search=graphene.String(),
-        limit=graphene.Int()
+        fuzzy=graphene.Boolean(),
+        similarity=graphene.Float(),
+        limit=graphene.Int(),
+        after=graphene.String(),
+        before=graphene.String(),
+        count_mode=graphene.String()
     )
     employer = graphene.Field(EmployerType, id=graphene.String())
     employers = graphene.Field(
         EmployerPaginatedType,
         page=graphene.Int(),
         search=graphene.String(),
-        limit=graphene.Int()
+        fuzzy=graphene.Boolean(),
+        similarity=graphene.Float(),
+        limit=graphene.Int(),
+        after=graphene.String(),
+        before=graphene.String(),
+        count_mode=graphene.String()
     )
     course = graphene.Field(CourseType, id=graphene.String())
     courses = graphene.Field(
         CoursePaginatedType,
         page=graphene.Int(),
         search=graphene.String(),
-        limit=graphene.Int()
+        fuzzy=graphene.Boolean(),
+        similarity=graphene.Float(),
+        limit=graphene.Int(),
+        after=graphene.String(),
+        before=graphene.String(),
+        count_mode=graphene.String()
     )
     department = graphene.Field(DepartmentType, id=graphene.String())
     departments = graphene.Field(
         DepartmentPaginatedType,
         page=graphene.Int(),
         search=graphene.String(),
-        limit=graphene.Int()
+        fuzzy=graphene.Boolean(),
+        similarity=graphene.Float(),
+        limit=graphene.Int(),
+        after=graphene.String(),
+        before=graphene.String(),
+        count_mode=graphene.String()
     )
     title = graphene.Field(TitleType, id=graphene.String())
     titles = graphene.Field(
         TitlePaginatedType,
         page=graphene.Int(),
         search=graphene.String(),
-        limit=graphene.Int()
+        fuzzy=graphene.Boolean(),
+        similarity=graphene.Float(),
+        limit=graphene.Int(),
+        after=graphene.String(),
+        before=graphene.String(),
+        count_mode=graphene.String()
     )
     grade = graphene.Field(GradeType, id=graphene.String())
     grades = graphene.Field(
         GradePaginatedType,
         page=graphene.Int(),
         search=graphene.String(),
-        limit=graphene.Int()
+        fuzzy=graphene.Boolean(),
+        similarity=graphene.Float(),
+        limit=graphene.Int(),
+        after=graphene.String(),
+        before=graphene.String(),
+        count_mode=graphene.String()
     )
     payroll = graphene.Field(PayrollType, id=graphene.String())
+    payroll_run = graphene.Field(PayrollRunType, id=graphene.String())
     payrolls = graphene.Field(
         PayrollPaginatedType,
         page=graphene.Int(),
         search=graphene.String(),
-        limit=graphene.Int()
+        fuzzy=graphene.Boolean(),
+        similarity=graphene.Float(),
+        limit=graphene.Int(),
+        after=graphene.String(),
+        before=graphene.String(),
+        count_mode=graphene.String()
     )
 
 
@@ -90,36 +129,27 @@ class Query(ObjectType):
 
     @token_required
     @login_required
-    def resolve_employees(self, info, search=None, **kwargs):
+    def resolve_employees(self, info, search=None, fuzzy=False, **kwargs):
         page = kwargs.get('page', 1)
         limit = kwargs.get('limit', 10)
-        if search:
-            filter = (
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search) |
-                Q(other_names__icontains=search) |
-                Q(email__icontains=search) |
-                Q(address__icontains=search) |
-                Q(phone_numbers__icontains=search) |
-                Q(emergency_numbers__icontains=search) |
-                Q(date_of_birth__icontains=search) |
-                Q(job_title__title_name__icontains=search) |
-                Q(employer_name__employer_details__username__icontains=search) |
-                Q(employer_name__employer_details__first_name__icontains=search) |
-                Q(employer_name__employer_details__last_name__icontains=search) |
-                Q(employer_name__business_name__icontains=search) |
-                Q(department__department_name__icontains=search) |
-                Q(hiring_date__icontains=search) |
-                Q(qualifications__icontains=search) |
-                Q(completed_courses__course_name__icontains=search) |
-                Q(grade__grade_name__icontains=search)
-            )
-            employees = Employee.objects.filter(
-                filter).all().order_by('-created_at')
-        else:
-            employees = Employee.objects.filter().all().order_by('-created_at')
-
-        return pagination_helper(employees, page, limit, EmployeePaginatedType)
+        employees = Employee.objects.order_by('-created_at', '-pk')
+        if search and fuzzy:
+            employees = trigram_search(
+                employees, search,
+                ['first_name', 'last_name', 'other_names',
+                 'email', 'phone_numbers'],
+                kwargs.get('similarity', None),
+                {'department': ['department_name'],
+                 'job_title': ['title_name'],
+                 'employer_name': ['business_name']})
+        elif search:
+            employees = search_employees(employees, search)
+
+        employees = optimize_queryset(employees, info, 'items')
+        return pagination_helper(
+            employees, page, limit, EmployeePaginatedType,
+            kwargs.get('after'), kwargs.get('before'),
+            kwargs.get('count_mode'))
 
     @token_required
     @login_required
@@ -129,10 +159,14 @@ class Query(ObjectType):
 
     @token_required
     @login_required
-    def resolve_employers(self, info, search=None, **kwargs):
+    def resolve_employers(self, info, search=None, fuzzy=False, **kwargs):
         page = kwargs.get('page', 1)
         limit = kwargs.get('limit', 10)
-        if search:
+        if search and fuzzy:
+            employers = trigram_search(
+                Employer.objects.all(), search, ['business_name', 'contact_name'],
+                kwargs.get('similarity', None))
+        elif search:
             filter = (
                 Q(business_name__icontains=search) |
                 Q(website_link__icontains=search) |
@@ -141,19 +175,23 @@ class Query(ObjectType):
                 Q(contact_role__icontains=search) |
                 Q(address__icontains=search) |
                 Q(phone_numbers__icontains=search) |
-                Q(employer_details__user__username__icontains=search) |
-                Q(employer_details__user__first_name__icontains=search) |
-                Q(employer_details__user__last_name__icontains=search) |
+                Q(employer_details__username__icontains=search) |
+                Q(employer_details__first_name__icontains=search) |
+                Q(employer_details__last_name__icontains=search) |
                 Q(location__icontains=search) |
                 Q(industry__icontains=search) |
                 Q(size__icontains=search) 
             )
             employers = Employer.objects.filter(
-                filter).all().order_by('-created_at')
+                filter).order_by('-created_at', '-pk')
         else:
-            employers = Employer.objects.filter().all().order_by('-created_at')
+            employers = Employer.objects.order_by('-created_at', '-pk')
 
-        return pagination_helper(employers, page, limit, EmployerPaginatedType)
+        employers = optimize_queryset(employers, info, 'items')
+        return pagination_helper(
+            employers, page, limit, EmployerPaginatedType,
+            kwargs.get('after'), kwargs.get('before'),
+            kwargs.get('count_mode'))
 
     @token_required
     @login_required
@@ -163,21 +201,29 @@ class Query(ObjectType):
 
     @token_required
     @login_required
-    def resolve_courses(self, info, search=None, **kwargs):
+    def resolve_courses(self, info, search=None, fuzzy=False, **kwargs):
         page = kwargs.get('page',None)
         limit = kwargs.get('limit',None)
 
-        if search:
+        if search and fuzzy:
+            courses = trigram_search(
+                Course.objects.all(), search, ['course_name'],
+                kwargs.get('similarity', None))
+        elif search:
             filter = (
                 Q(course_name__icontains=search) |
                 Q(course_level__icontains=search) 
             )
             courses = Course.objects.filter(
-                filter).all().order_by('-created_at')
+                filter).order_by('-created_at', '-pk')
         else:
-            courses = Course.objects.filter().all().order_by('-created_at')
+            courses = Course.objects.order_by('-created_at', '-pk')
 
-        return pagination_helper(courses, page, limit, CoursePaginatedType)
+        courses = optimize_queryset(courses, info, 'items')
+        return pagination_helper(
+            courses, page, limit, CoursePaginatedType,
+            kwargs.get('after'), kwargs.get('before'),
+            kwargs.get('count_mode'))
 
     @token_required
     @login_required
@@ -187,21 +233,29 @@ class Query(ObjectType):
 
     @token_required
     @login_required
-    def resolve_departments(self, info, search=None, **kwargs):
+    def resolve_departments(self, info, search=None, fuzzy=False, **kwargs):
         page = kwargs.get('page',None)
         limit = kwargs.get('limit',None)
 
-        if search:
+        if search and fuzzy:
+            courses = trigram_search(
+                Department.objects.all(), search, ['department_name'],
+                kwargs.get('similarity', None))
+        elif search:
             filter = (
                 Q(department_name__icontains=search) |
                 Q(pay_grade__grade_name__icontains=search) 
             )
             courses = Department.objects.filter(
-                filter).all().order_by('-created_at')
+                filter).order_by('-created_at', '-pk')
         else:
-            courses = Department.objects.filter().all().order_by('-created_at')
+            courses = Department.objects.order_by('-created_at', '-pk')
 
-        return pagination_helper(courses, page, limit, DepartmentPaginatedType)
+        courses = optimize_queryset(courses, info, 'items')
+        return pagination_helper(
+            courses, page, limit, DepartmentPaginatedType,
+            kwargs.get('after'), kwargs.get('before'),
+            kwargs.get('count_mode'))
 
     @token_required
     @login_required
@@ -211,20 +265,28 @@ class Query(ObjectType):
 
     @token_required
     @login_required
-    def resolve_titles(self, info, search=None, **kwargs):
+    def resolve_titles(self, info, search=None, fuzzy=False, **kwargs):
         page = kwargs.get('page',None)
         limit = kwargs.get('limit',None)
 
-        if search:
+        if search and fuzzy:
+            titles = trigram_search(
+                Title.objects.all(), search, ['title_name'],
+                kwargs.get('similarity', None))
+        elif search:
             filter = (
                 Q(title_name__icontains=search) 
             )
             titles = Title.objects.filter(
-                filter).all().order_by('-created_at')
+                filter).order_by('-created_at', '-pk')
         else:
-            titles = Title.objects.filter().all().order_by('-created_at')
+            titles = Title.objects.order_by('-created_at', '-pk')
 
-        return pagination_helper(titles, page, limit, TitlePaginatedType)
+        titles = optimize_queryset(titles, info, 'items')
+        return pagination_helper(
+            titles, page, limit, TitlePaginatedType,
+            kwargs.get('after'), kwargs.get('before'),
+            kwargs.get('count_mode'))
 
     @token_required
     @login_required
@@ -234,25 +296,40 @@ class Query(ObjectType):
 
     @token_required
     @login_required
-    def resolve_payrolls(self, info, search=None, **kwargs):
+    def resolve_payroll_run(self, info, **kwargs):
+        return validate_object_id(
+            kwargs.get('id', None), PayrollRun, "Payroll run")
+
+    @token_required
+    @login_required
+    def resolve_payrolls(self, info, search=None, fuzzy=False, **kwargs):
         page = kwargs.get('page',None)
         limit = kwargs.get('limit',None)
 
-        if search:
+        if search and fuzzy:
+            payrolls = trigram_search(
+                Payroll.objects.all(), search,
+                ['employee__first_name', 'employee__last_name'],
+                kwargs.get('similarity', None))
+        elif search:
             filter = (
                 Q(period_number__icontains=search)|
                 Q(employee_net_salary__icontains=search)|
                 Q(employee_gross_salary__icontains=search)|
                 Q(reimbursment_date__icontains=search)|
                 Q(employee__first_name__icontains=search)|
-                Q(grade__grade__name__icontains=search)
+                Q(grade__grade_name__icontains=search)
             )
             payrolls = Payroll.objects.filter(
-                filter).all().order_by('-created_at')
+                filter).order_by('-created_at', '-pk')
         else:
-            payrolls = Payroll.objects.filter().all().order_by('-created_at')
+            payrolls = Payroll.objects.order_by('-created_at', '-pk')
 
-        return pagination_helper(payrolls, page, limit, PayrollPaginatedType)
+        payrolls = optimize_queryset(payrolls, info, 'items')
+        return pagination_helper(
+            payrolls, page, limit, PayrollPaginatedType,
+            kwargs.get('after'), kwargs.get('before'),
+            kwargs.get('count_mode'))
 
     @token_required
     @login_required
@@ -262,11 +339,15 @@ class Query(ObjectType):
 
     @token_required
     @login_required
-    def resolve_grades(self, info, search=None, **kwargs):
+    def resolve_grades(self, info, search=None, fuzzy=False, **kwargs):
         page = kwargs.get('page',None)
         limit = kwargs.get('limit',None)
 
-        if search:
+        if search and fuzzy:
+            grades = trigram_search(
+                Grade.objects.all(), search, ['grade_name'],
+                kwargs.get('similarity', None))
+        elif search:
             filter = (
                 Q(grade_name__icontains=search)|
                 Q(grade_basic__icontains=search)|
@@ -276,10 +357,14 @@ class Query(ObjectType):
                 Q(grade_pf__icontains=search)
             )
             grades = Grade.objects.filter(
-                filter).all().order_by('-created_at')
+                filter).order_by('-created_at', '-pk')
         else:
-            grades = Grade.objects.filter().all().order_by('-created_at')
+            grades = Grade.objects.order_by('-created_at', '-pk')
 
-        return pagination_helper(grades, page, limit, GradePaginatedType)
+        grades = optimize_queryset(grades, info, 'items')
+        return pagination_helper(
+            grades, page, limit, GradePaginatedType,
+            kwargs.get('after'), kwargs.get('before'),
+            kwargs.get('count_mode'))
 
     
\ No newline at end of file
@@ -0,0 +1,157 @@
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from ..authentication.models import User
+from ..helpers.reference_cache import reference_cache
+from ..helpers.response_cache import invalidate_models
+from .helpers.search_helpers import update_employee_search_vector
+from .models import (
+    Course, Department, Employee, Employer, Grade, Payroll, SubDepartment,
+    Title
+)
+
+# Models whose columns are part of the employee search document mapped to
+# the lookup that finds the affected employees and the columns that are
+# indexed.
+RELATED_SEARCH_FIELDS = {
+    Title: ('job_title', {'title_name'}),
+    Employer: ('employer_name', {'business_name'}),
+    User: ('employer_name__employer_details',
+           {'username', 'first_name', 'last_name'}),
+    Department: ('department', {'department_name'}),
+    Course: ('completed_courses', {'course_name'}),
+    Grade: ('grade', {'grade_name'}),
+}
+
+
+@receiver(post_save, sender=Employee)
+def refresh_employee_search_vector(sender, instance, raw=False, **kwargs):
+    """
+    Rebuild the search document of an employee whenever it is saved
+    """
+    if raw:
+        return
+    update_employee_search_vector(Employee.objects.filter(pk=instance.pk))
+
+
+@receiver(m2m_changed, sender=Employee.department.through)
+def refresh_department_search_vector(sender, instance, action, reverse,
+                                     pk_set, **kwargs):
+    """
+    Rebuild the search document of the employees whose
+    departments have changed
+    """
+    if reverse and action == 'pre_clear':
+        # the links are gone after the clear so remember who is affected
+        instance._cleared_employees = list(
+            instance.employee_set.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        employees = [instance.pk]
+    elif action == 'post_clear':
+        employees = getattr(instance, '_cleared_employees', [])
+    else:
+        employees = pk_set or []
+    if employees:
+        update_employee_search_vector(
+            Employee.objects.filter(pk__in=employees))
+
+
+def refresh_related_search_vector(sender, instance, raw=False,
+                                  update_fields=None, **kwargs):
+    """
+    Rebuild the search document of the employees related to a
+    row whose indexed columns may have changed
+    """
+    lookup, indexed_fields = RELATED_SEARCH_FIELDS[sender]
+    if raw or (update_fields and not indexed_fields & set(update_fields)):
+        return
+    update_employee_search_vector(
+        Employee.objects.filter(**{lookup: instance}))
+
+
+def collect_related_search_employees(sender, instance, **kwargs):
+    """
+    Remember the employees related to a row that is about to be
+    deleted since the links to it are cleared or soft deleted
+    before it is gone
+    """
+    lookup, _ = RELATED_SEARCH_FIELDS[sender]
+    instance._search_employees = list(
+        Employee.objects.all_with_deleted().filter(
+            **{lookup: instance}).values_list('pk', flat=True))
+
+
+def refresh_deleted_search_vector(sender, instance, **kwargs):
+    """
+    Rebuild the search document of the employees that were related
+    to a deleted row
+    """
+    employees = getattr(instance, '_search_employees', [])
+    if employees:
+        update_employee_search_vector(
+            Employee.objects.all_with_deleted().filter(pk__in=employees))
+
+
+for model in RELATED_SEARCH_FIELDS:
+    post_save.connect(refresh_related_search_vector, sender=model,
+                      dispatch_uid='employee_search_{}'.format(
+                          model._meta.label_lower))
+    pre_delete.connect(collect_related_search_employees, sender=model,
+                       dispatch_uid='employee_search_pre_delete_{}'.format(
+                           model._meta.label_lower))
+    post_delete.connect(refresh_deleted_search_vector, sender=model,
+                        dispatch_uid='employee_search_delete_{}'.format(
+                            model._meta.label_lower))
+
+
+def invalidate_cached_responses(sender, raw=False, **kwargs):
+    """
+    Drop the cached responses built from a model that has changed
+    """
+    if not raw:
+        invalidate_models(sender)
+
+
+def invalidate_cached_relations(sender, instance, action, model, **kwargs):
+    """
+    Drop the cached responses built from either side of a changed
+    many to many relation
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_models(type(instance), model)
+
+
+for model in (Course, Department, Employee, Employer, Grade, Payroll,
+              SubDepartment, Title, User):
+    post_save.connect(invalidate_cached_responses, sender=model,
+                      dispatch_uid='response_cache_{}'.format(
+                          model._meta.label_lower))
+    post_delete.connect(invalidate_cached_responses, sender=model,
+                        dispatch_uid='response_cache_delete_{}'.format(
+                            model._meta.label_lower))
+for through in (Employee.department.through,
+                Department.sub_departments.through):
+    m2m_changed.connect(invalidate_cached_relations, sender=through,
+                        dispatch_uid='response_cache_{}'.format(
+                            through._meta.label_lower))
+
+
+def invalidate_reference(sender, instance, **kwargs):
+    """
+    Drop a reference row that has changed from the reference cache
+    """
+    reference_cache.invalidate(sender, instance.pk)
+
+
+for model in (Course, Department, Employer, Grade, Title):
+    post_save.connect(invalidate_reference, sender=model,
+                      dispatch_uid='reference_cache_{}'.format(
+                          model._meta.label_lower))
+    post_delete.connect(invalidate_reference, sender=model,
+                        dispatch_uid='reference_cache_delete_{}'.format(
+                            model._meta.label_lower))
@@ -0,0 +1,89 @@
+from celery import group
+from django.db import transaction
+
+from app import celery_app
+
+from .helpers.export_helpers import EXPORT_CHUNK_SIZE, stream_export
+from .helpers.import_helpers import CHUNK_SIZE, import_file
+from .helpers.payroll_helpers import (
+    get_pending_partitions, record_partition, run_payroll
+)
+from .models import PayrollRun
+
+
+@celery_app.task(name="import data", bind=True)
+def import_data(self, kind, path, chunk_size=CHUNK_SIZE, errors_path=None):
+    """
+    import a spreadsheet of departments, employees or payrolls in the
+    background, reporting the rows done after every chunk
+    Args:
+        kind (str): departments, employees or payrolls
+        path (str): CSV or Excel file path
+        chunk_size (int): rows per chunk
+        errors_path (str): CSV file to write every row error to
+    Return:
+        summary (dict): row counts and the first row errors
+    """
+    def progress(summary):
+        self.update_state(state='PROGRESS', meta={
+            key: summary[key]
+            for key in ('rows', 'created', 'updated', 'failed')})
+    return import_file(kind, path, chunk_size, progress, errors_path)
+
+
+@celery_app.task(name="export data")
+def export_data(kind, path, file_format='csv', chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    write every employee or payroll row to a CSV or parquet file in the
+    background
+    Args:
+        kind (str): employees or payrolls
+        path (str): file to write
+        file_format (str): csv or parquet
+        chunk_size (int): rows per chunk
+    Return:
+        path (str): file written
+    """
+    # an unavailable format is rejected before the file is created
+    chunks = stream_export(kind, file_format, chunk_size)
+    with open(path, 'wb') as output:
+        for chunk in chunks:
+            output.write(chunk.encode('utf-8') if isinstance(chunk, str)
+                         else chunk)
+    return path
+
+
+@celery_app.task(name="run payroll partition")
+def run_payroll_partition(run_id, partition):
+    """
+    pay the employees of one partition of a payroll run, recording
+    whether it succeeded so that a failed run can be resumed
+    Args:
+        run_id (str): payroll run id
+        partition (dict): partition of the employees to pay
+    Return:
+        summary (dict): payrolls created and their totals
+    """
+    run = PayrollRun.objects.get(id=run_id)
+    try:
+        summary = run_payroll(
+            run.period_number, run.reimbursment_date, partition, run.id)
+    except Exception as error:
+        record_partition(run_id, partition['key'], str(error) or repr(error))
+        raise
+    record_partition(run_id, partition['key'])
+    return summary
+
+
+def queue_payroll_run(run):
+    """
+    queue a task for every partition of a payroll run that has not been
+    paid, once the transaction saving the run commits
+    Args:
+        run (obj): payroll run
+    """
+    partitions = get_pending_partitions(run)
+    if partitions:
+        transaction.on_commit(lambda: group(
+            run_payroll_partition.si(run.id, partition)
+            for partition in partitions).apply_async())
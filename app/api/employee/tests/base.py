@@ -0,0 +1,78 @@
+from datetime import date
+
+from graphql_jwt.testcases import JSONWebTokenTestCase
+from rolepermissions.roles import assign_role
+
+from ...authentication.models import User
+from ..models import Department, Employee, Employer, Grade, Title
+
+
+class BaseTest(JSONWebTokenTestCase):
+    """
+    Employee API base test case
+    """
+
+    def setUp(self):
+        self.admin = self.create_admin()
+        self.client.authenticate(self.admin)
+
+    def create_admin(self):
+        """
+        Create an active admin
+        Return:
+            user (obj): admin user
+        """
+        user = User.objects.create_user(
+            username="Admin", email="admin@example.com",
+            password="String@123", first_name="Admin",
+            last_name="Kiptoo", phone_number="+254743542155")
+        user.is_active = True
+        user.save()
+        assign_role(user, 'admin')
+        return user
+
+    def create_employee(self, **kwargs):
+        """
+        Create an employee
+        Args:
+            kwargs (dict): fields to override
+        Return:
+            employee (obj): employee object
+        """
+        departments = kwargs.pop('department', [])
+        data = {
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "other_names": "Wanjiku",
+            "email": "jane@example.com",
+            "address": "Nairobi",
+            "date_of_birth": date(1990, 1, 1),
+            "hiring_date": date(2020, 1, 1),
+            "current_salary": 50000,
+            "starting_salary": 40000,
+        }
+        data.update(kwargs)
+        employee = Employee(**data)
+        employee.save()
+        for department in departments:
+            employee.department.add(department)
+        return employee
+
+    def create_references(self):
+        """
+        Create the rows an employee is usually related to
+        Return:
+            references (dict): grade, title, employer and department
+        """
+        grade = Grade(grade_name="Senior", grade_basic="1000", grade_da="100",
+                      grade_ta="50", grade_bonus=10, grade_pf="5")
+        grade.save()
+        title = Title(title_name="Accountant")
+        title.save()
+        employer = Employer(business_name="Samar Insurance",
+                            location="Nairobi", employer_details=self.admin)
+        employer.save()
+        department = Department(department_name="Finance", pay_grade=grade)
+        department.save()
+        return {"grade": grade, "job_title": title,
+                "employer_name": employer, "department": [department]}
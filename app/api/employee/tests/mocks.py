@@ -0,0 +1,163 @@
+# Queries
+list_employees_query = '''query getEmployees($search: String) {
+    employees(search: $search) {
+        count
+        items {
+            id
+            firstName
+            lastName
+        }}}'''
+
+fuzzy_employees_query = '''query getEmployees($search: String, $similarity: Float) {
+    employees(search: $search, fuzzy: true, similarity: $similarity) {
+        count
+        items {
+            id
+            firstName
+            lastName
+        }}}'''
+
+fuzzy_titles_query = '''query getTitles($search: String) {
+    titles(search: $search, fuzzy: true, page: 1, limit: 10) {
+        count
+        items {
+            titleName
+        }}}'''
+
+cursor_titles_query = '''query getTitles($after: String, $before: String) {
+    titles(limit: 2, after: $after, before: $before) {
+        count
+        hasNext
+        hasPrev
+        nextCursor
+        prevCursor
+        items {
+            titleName
+        }}}'''
+
+cursor_employees_query = '''query getEmployees($search: String, $fuzzy: Boolean,
+        $limit: Int, $after: String, $before: String) {
+    employees(search: $search, fuzzy: $fuzzy, limit: $limit, after: $after,
+              before: $before) {
+        hasNext
+        nextCursor
+        items {
+            id
+        }}}'''
+
+counted_titles_query = '''query getTitles($page: Int, $countMode: String) {
+    titles(limit: 2, page: $page, countMode: $countMode) {
+        count
+        page
+        pages
+        hasNext
+        hasPrev
+        items {
+            titleName
+        }}}'''
+
+nested_employees_query = '''query getEmployees {
+    employees(limit: 20) {
+        count
+        items {
+            ...employeeFields
+            grade {
+                gradeName
+            }
+            employerName {
+                businessName
+                employerDetails {
+                    username
+                }
+            }
+            department {
+                departmentName
+                payGrade {
+                    gradeName
+                }
+                subDepartments {
+                    name
+                }
+            }
+        }}}
+fragment employeeFields on EmployeeType {
+    firstName
+    jobTitle {
+        titleName
+    }
+}'''
+
+list_employers_query = '''query getEmployers($search: String) {
+    employers(search: $search) {
+        count
+        items {
+            businessName
+        }}}'''
+
+create_employee_mutation = '''mutation createEmployee($input: EmployeeInput!) {
+    createEmployee(input: $input) {
+        status
+        employee {
+            firstName
+            grade {
+                gradeName
+            }
+            department {
+                departmentName
+            }
+        }}}'''
+
+create_employees_mutation = '''mutation createEmployees($input: [EmployeeInput]!) {
+    createEmployees(input: $input) {
+        status
+        message
+        errors {
+            index
+            message
+        }
+        employees {
+            firstName
+            grade {
+                gradeName
+            }
+            department {
+                departmentName
+            }
+        }}}'''
+
+run_payroll_mutation = '''mutation runPayroll($periodNumber: Int!) {
+    runPayroll(periodNumber: $periodNumber,
+               reimbursmentDate: "2021-01-31") {
+        status
+        message
+        count
+        totalGross
+        totalDeductions
+        totalNet
+        }}'''
+
+start_payroll_run_mutation = '''mutation startPayrollRun($periodNumber: Int!) {
+    startPayrollRun(periodNumber: $periodNumber,
+                    reimbursmentDate: "2021-01-31") {
+        status
+        payrollRun {
+            id
+        }
+        }}'''
+
+resume_payroll_run_mutation = '''mutation resumePayrollRun($id: String!) {
+    resumePayrollRun(id: $id) {
+        status
+        }}'''
+
+payroll_run_query = '''query payrollRun($id: String!) {
+    payrollRun(id: $id) {
+        status
+        totalPartitions
+        completedPartitions
+        failedPartitions
+        payrollCount
+        totalGross
+        totalDeductions
+        totalNet
+        }}'''
@@ -0,0 +1,82 @@
+import json
+
+from django.test import Client, override_settings
+from graphql_jwt.shortcuts import get_token
+
+from .base import BaseTest
+
+employee_query = '''query($id: String) {
+    employee(id: $id) { jobTitle { titleName } } }'''
+update_title_mutation = '''mutation($id: String!) {
+    updateTitle(id: $id, input: {titleName: "Director"}) {
+        title { titleName } } }'''
+
+
+class TestBatchedOperations(BaseTest):
+    """
+    Batched operation request tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.http = Client(HTTP_AUTHORIZATION='JWT {}'.format(
+            get_token(self.admin)))
+        references = self.create_references()
+        self.employee = self.create_employee(**references)
+        self.title = references['job_title']
+
+    def post(self, operations):
+        return self.http.post('/api/v1/graphql/', json.dumps(operations),
+                              content_type='application/json')
+
+    def test_operations_are_answered_in_order(self):
+        """
+        Test an array of operations gets an array of results
+        """
+        response = self.post([
+            {'id': 'titles', 'query': 'query { titles { count } }'},
+            {'id': 'grades', 'query': 'query { grades { count } }'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual([result['id'] for result in results],
+                         ['titles', 'grades'])
+        self.assertEqual(results[0]['data'], {'titles': {'count': 1}})
+        self.assertEqual(results[1]['data'], {'grades': {'count': 1}})
+
+    def test_operations_after_a_mutation_see_its_changes(self):
+        """
+        Test loaders shared by the batch are dropped by a mutation
+        """
+        variables = {'id': self.employee.id}
+        results = self.post([
+            {'query': employee_query, 'variables': variables},
+            {'query': update_title_mutation, 'variables': {
+                'id': self.title.id}},
+            {'query': employee_query, 'variables': variables},
+        ]).json()
+        self.assertEqual(
+            results[0]['data']['employee']['jobTitle']['titleName'],
+            self.title.title_name)
+        self.assertEqual(
+            results[2]['data']['employee']['jobTitle']['titleName'],
+            'Director')
+
+    def test_single_operations_are_unchanged(self):
+        """
+        Test an operation posted on its own gets a single result
+        """
+        response = self.post({'query': 'query { titles { count } }'})
+        self.assertEqual(response.json(), {
+            'data': {'titles': {'count': 1}},
+            'extensions': response.json()['extensions']})
+
+    @override_settings(GRAPHQL_MAX_BATCH_SIZE=2)
+    def test_oversized_batch_is_rejected(self):
+        """
+        Test a batch over the maximum size is rejected
+        """
+        response = self.post([{'query': 'query { titles { count } }'}] * 3)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'][0]['message'],
+                         'A batch can hold at most 2 operations.')
@@ -0,0 +1,45 @@
+from ..helpers.benchmark_helpers import (
+    BENCHMARK_CASES, compare_with_baseline, generate_data, run_case
+)
+from ..models import Employee, Payroll
+from .base import BaseTest
+
+
+class TestBenchmark(BaseTest):
+    """
+    Benchmark suite tests
+    """
+
+    def test_generated_data_grows_to_size(self):
+        """
+        Test the data set is topped up to the requested size
+        """
+        generate_data(10, self.admin)
+        generate_data(25, self.admin)
+        self.assertEqual(Employee.objects.count(), 25)
+        self.assertEqual(Payroll.objects.count(), 25)
+        self.assertFalse(
+            Employee.objects.filter(department__isnull=True).exists())
+
+    def test_case_records_queries_and_plans(self):
+        """
+        Test a benchmark case is timed and its plans are recorded
+        """
+        generate_data(10, self.admin)
+        _, query, variables, _ = BENCHMARK_CASES[0]
+        result = run_case(self.client, query, variables, 2)
+        self.assertEqual(result['errors'], [])
+        self.assertGreater(result['queries'], 0)
+        self.assertEqual(len(result['plans']), result['queries'])
+
+    def test_regressions_are_reported(self):
+        """
+        Test slower cases and extra queries are reported
+        """
+        baseline = {'a': {'latency_ms': 10, 'queries': 4},
+                    'b': {'latency_ms': 10, 'queries': 4}}
+        results = {'a': {'latency_ms': 11, 'queries': 4},
+                   'b': {'latency_ms': 30, 'queries': 5}}
+        self.assertEqual(compare_with_baseline(results, baseline, 0.25),
+                         ['b: 5 queries, baseline 4',
+                          'b: 30.0ms, baseline 10.0ms'])
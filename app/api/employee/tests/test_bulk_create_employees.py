@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from ...helpers.reference_cache import reference_cache
+from ..models import Employee
+from .base import BaseTest
+from .mocks import create_employees_mutation
+
+
+class TestBulkCreateEmployees(BaseTest):
+    """
+    Bulk employee creation tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        reference_cache.clear()
+        self.references = self.create_references()
+
+    def build_rows(self, count):
+        return [{
+            "firstName": "Jane{}".format(index), "lastName": "Doe",
+            "otherNames": "Wanjiku",
+            "email": "jane{}@example.com".format(index),
+            "address": "Nairobi", "dateOfBirth": "1990-01-01",
+            "hiringDate": "2020-01-01", "currentSalary": 50000,
+            "startingSalary": 40000, "grade": self.references['grade'].id,
+            "jobTitle": self.references['job_title'].id,
+            "department": [self.references['department'][0].id],
+        } for index in range(count)]
+
+    def create(self, rows):
+        return self.client.execute(create_employees_mutation,
+                                   {"input": rows})
+
+    def test_employees_are_created(self):
+        """
+        Test every row is saved with its references and departments
+        """
+        response = self.create(self.build_rows(3))
+        self.assertIsNone(response.errors)
+        result = response.data['createEmployees']
+        self.assertEqual(result['status'], 'Success')
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(result['employees'][0], {
+            'firstName': 'Jane0', 'grade': {'gradeName': 'Senior'},
+            'department': [{'departmentName': 'Finance'}]})
+        employees = Employee.objects.filter(last_name='Doe')
+        self.assertEqual(employees.count(), 3)
+        self.assertEqual(Employee.department.through.objects.filter(
+            employee__in=employees).count(), 3)
+        self.assertTrue(all(employees.values_list('search_vector',
+                                                  flat=True)))
+
+    def test_queries_do_not_grow_with_rows(self):
+        """
+        Test the rows are validated and inserted in batches
+        """
+        with CaptureQueriesContext(connection) as few:
+            self.create(self.build_rows(2))
+        reference_cache.clear()
+        with CaptureQueriesContext(connection) as many:
+            self.create(self.build_rows(40))
+        self.assertEqual(len(many), len(few))
+
+    def test_invalid_rows_are_reported(self):
+        """
+        Test nothing is saved when a row is invalid
+        """
+        rows = self.build_rows(4)
+        del rows[1]['firstName']
+        rows[2]['grade'] = '-missing'
+        rows[3]['status'] = 'X'
+        result = self.create(rows).data['createEmployees']
+        self.assertEqual(result['status'], 'Failed')
+        self.assertEqual(result['message'],
+                         '3 rows are invalid. Nothing was saved')
+        self.assertEqual([error['index'] for error in result['errors']],
+                         [1, 2, 3])
+        self.assertEqual(result['errors'][1]['message'],
+                         'Grade does not exist')
+        self.assertIn('status', result['errors'][2]['message'])
+        self.assertFalse(Employee.objects.exists())
+
+    @override_settings(BULK_CREATE_MAX_ROWS=2)
+    def test_too_many_rows_fail(self):
+        """
+        Test more rows than the BULK_CREATE_MAX_ROWS setting are refused
+        """
+        response = self.create(self.build_rows(3))
+        self.assertEqual(response.errors[0].message,
+                         'You can submit at most 2 rows at a time')
+        self.assertFalse(Employee.objects.exists())
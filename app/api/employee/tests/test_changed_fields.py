@@ -0,0 +1,93 @@
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Employee, PayrollRun, Title
+from .base import BaseTest
+
+
+class TestChangedFields(BaseTest):
+    """
+    Saves that write only the changed columns
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.employee = self.create_employee(
+            status='A', gender='F', period='M', phone_numbers='0700000000',
+            emergency_numbers='0711111111', qualifications='BCom')
+
+    def get_update(self, instance, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            instance.save(**kwargs)
+        prefix = 'UPDATE "{}"'.format(instance._meta.db_table)
+        updates = [query['sql'] for query in queries.captured_queries
+                   if query['sql'].startswith(prefix)]
+        # the save is followed by the search document update of employees
+        return updates[0].split(' WHERE ')[0]
+
+    def test_loaded_rows_update_changed_columns(self):
+        """
+        Test a loaded row writes only what was changed and updated_at
+        """
+        employee = Employee.objects.get(id=self.employee.id)
+        employee.first_name = 'Janet'
+        employee.last_name = employee.last_name
+        update = self.get_update(employee)
+        self.assertIn('"first_name"', update)
+        self.assertIn('"updated_at"', update)
+        self.assertNotIn('"last_name"', update)
+        self.assertNotIn('"current_salary"', update)
+        employee = Employee.objects.get(id=self.employee.id)
+        self.assertEqual(employee.first_name, 'Janet')
+        self.assertGreater(employee.updated_at, self.employee.updated_at)
+
+    def test_changes_in_place_are_found(self):
+        """
+        Test lists and dicts changed in place are written
+        """
+        PayrollRun(period_number=1, reimbursment_date=date(2021, 1, 31),
+                   partitions=[{'key': 'a'}]).save()
+        run = PayrollRun.objects.get()
+        run.completed.append('a')
+        update = self.get_update(run)
+        self.assertIn('"completed"', update)
+        self.assertNotIn('"partitions"', update)
+        run.failed['b'] = 'error'
+        self.assertIn('"failed"', self.get_update(run))
+        run.refresh_from_db()
+        self.assertEqual((run.completed, run.failed), (['a'], {'b': 'error'}))
+
+    def test_saved_rows_track_later_changes(self):
+        """
+        Test a saved row only writes what changed since the last save
+        """
+        self.employee.email = 'janet@example.com'
+        update = self.get_update(self.employee)
+        self.assertIn('"email"', update)
+        self.assertNotIn('"first_name"', update)
+        self.employee.address = 'Mombasa'
+        self.assertNotIn('"email"', self.get_update(self.employee))
+
+    def test_save_arguments_are_passed_on(self):
+        """
+        Test update_fields given by callers are used as they are
+        """
+        title = Title(title_name='Accountant')
+        title.save()
+        title.title_name = 'Auditor'
+        title.save(update_fields=['updated_at'])
+        self.assertEqual(Title.objects.get(id=title.id).title_name,
+                         'Accountant')
+        title.save()
+        self.assertEqual(Title.objects.get(id=title.id).title_name, 'Auditor')
+
+    def test_soft_deletes_are_written(self):
+        """
+        Test soft deleting a loaded row still writes deleted_at
+        """
+        Title(title_name='Accountant').save()
+        Title.objects.get().delete()
+        self.assertEqual(Title.objects.count(), 0)
+        self.assertEqual(Title.objects.all_with_deleted().count(), 1)
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django.test import SimpleTestCase
+from django.test.utils import isolate_apps
+from django.utils import timezone
+
+from ...helpers.push_id import (
+    PushID, get_id_bound, push_id, push_id_to_uuid, uuid_to_push_id
+)
+from ...models import CompactBaseModel, PushIDField
+from .base import BaseTest
+
+
+class TestPushIDCodec(SimpleTestCase):
+    """
+    Push id and UUID conversion tests
+    """
+
+    def test_round_trip_keeps_the_order(self):
+        """
+        Test packed ids unpack to themselves and sort like the ids
+        """
+        ids = PushID().next_ids(500) + ['-' * 20, 'z' * 20, 'A' * 20,
+                                        '_' * 20, 'a' * 20, '0' * 20]
+        values = [push_id_to_uuid(id) for id in ids]
+        self.assertEqual([uuid_to_push_id(value) for value in values], ids)
+        self.assertEqual(sorted(values), [push_id_to_uuid(id)
+                                          for id in sorted(ids)])
+
+    def test_invalid_ids_are_rejected(self):
+        """
+        Test strings that are not push ids are not packed
+        """
+        for value in ['short', 'a' * 21, 'a' * 19 + '=', None]:
+            with self.assertRaises(ValueError):
+                push_id_to_uuid(value)
+
+    def test_field_converts_values(self):
+        """
+        Test the field reads strings and writes UUIDs
+        """
+        field = PushIDField()
+        id = push_id.next_id()
+        value = push_id_to_uuid(id)
+        self.assertEqual(field.get_prep_value(id), value)
+        self.assertEqual(field.get_db_prep_value(id, connection), value)
+        self.assertEqual(field.from_db_value(value, None, connection), id)
+        self.assertEqual(field.from_db_value(str(value), None, connection),
+                         id)
+        self.assertEqual(field.to_python(value), id)
+        self.assertIsNone(field.get_prep_value(None))
+        with self.assertRaises(ValidationError):
+            field.get_prep_value('not an id')
+
+
+@isolate_apps('app.api')
+class TestCompactBaseModel(BaseTest):
+    """
+    Models keyed by push ids stored as UUIDs
+    """
+
+    def create_models(self):
+        class Team(CompactBaseModel):
+            name = models.CharField(max_length=50)
+
+        class Member(CompactBaseModel):
+            team = models.ForeignKey(Team, on_delete=models.CASCADE)
+
+        with connection.schema_editor() as editor:
+            editor.create_model(Team)
+            editor.create_model(Member)
+        return Team, Member
+
+    def test_ids_are_stored_as_uuids(self):
+        """
+        Test ids and foreign keys are strings stored in uuid columns
+        """
+        Team, Member = self.create_models()
+        team = Team(name='Payroll')
+        team.save()
+        member = Member(team=team)
+        member.save()
+        self.assertEqual(len(team.id), 20)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT team_id FROM {}'.format(
+                Member._meta.db_table))
+            self.assertIsInstance(cursor.fetchone()[0], UUID)
+        member = Member.objects.get(id=member.id)
+        self.assertEqual(member.team_id, team.id)
+        self.assertEqual(Member.objects.filter(team__name='Payroll').values_list(
+            'team_id', flat=True).get(), team.id)
+        self.assertEqual(Team.objects.get(id=team.id), team)
+
+    def test_created_between(self):
+        """
+        Test time ranges and newest first lists read the packed ids
+        """
+        Team, _ = self.create_models()
+        now = timezone.now()
+        teams = []
+        for name, age in [('Old', timedelta(days=2)), ('New', timedelta())]:
+            team = Team(name=name, id=get_id_bound(now - age) + 'a' * 12)
+            team.save()
+            teams.append(team)
+        self.assertEqual(list(Team.objects.newest_first()), teams[::-1])
+        self.assertEqual(list(Team.objects.created_between(
+            now - timedelta(days=1))), teams[1:])
+        self.assertEqual(list(Team.objects.created_between(
+            end=now)), teams[:1])
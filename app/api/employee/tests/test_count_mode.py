@@ -0,0 +1,53 @@
+from ..models import Title
+from .base import BaseTest
+from .mocks import counted_titles_query
+
+
+class TestCountMode(BaseTest):
+    """
+    Paginated list count mode tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        for name in ["One", "Two", "Three", "Four", "Five"]:
+            Title(title_name=name).save()
+
+    def list_titles(self, **variables):
+        response = self.client.execute(counted_titles_query, variables)
+        self.assertIsNone(response.errors)
+        return response.data['titles']
+
+    def test_count_can_be_skipped(self):
+        """
+        Test the count is omitted while has_next is still reported
+        """
+        page = self.list_titles(page=2, countMode="none")
+        self.assertIsNone(page['count'])
+        self.assertIsNone(page['pages'])
+        self.assertEqual([item['titleName'] for item in page['items']],
+                         ["Three", "Two"])
+        self.assertTrue(page['hasNext'])
+        self.assertTrue(page['hasPrev'])
+        self.assertFalse(self.list_titles(page=3, countMode="none")['hasNext'])
+
+    def test_count_can_be_estimated(self):
+        """
+        Test an estimated count is returned and is exact on the last page
+        """
+        page = self.list_titles(page=1, countMode="estimate")
+        self.assertGreaterEqual(page['count'], 3)
+        page = self.list_titles(page=3, countMode="estimate")
+        self.assertEqual(page['count'], 5)
+        self.assertEqual(page['pages'], 3)
+
+    def test_invalid_count_mode_fails(self):
+        """
+        Test an unknown count mode is rejected
+        """
+        response = self.client.execute(counted_titles_query,
+                                        {"countMode": "all"})
+        self.assertEqual(
+            response.errors[0].message,
+            "Invalid count mode options. Allowed options are "
+            "exact, estimate, none")
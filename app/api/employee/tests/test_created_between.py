@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ...helpers.push_id import get_id_bound, get_id_time
+from ..models import Title
+from .base import BaseTest
+
+
+class TestCreatedBetween(BaseTest):
+    """
+    Creation time queries answered from push ids
+    """
+
+    def create_title(self, name, moment):
+        title = Title(title_name=name, id=get_id_bound(moment) + 'a' * 12)
+        title.save()
+        return title
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.old = self.create_title('Old', self.now - timedelta(days=2))
+        self.recent = self.create_title('Recent', self.now - timedelta(hours=1))
+        self.new = self.create_title('New', self.now)
+
+    def test_id_bounds_round_trip(self):
+        """
+        Test an id bound reads back as the millisecond it was made from
+        """
+        self.assertEqual(get_id_time(get_id_bound(self.now)),
+                         self.now.replace(
+                             microsecond=self.now.microsecond // 1000 * 1000))
+        self.assertLess(get_id_bound(self.now - timedelta(milliseconds=1)),
+                        get_id_bound(self.now))
+
+    def test_created_between(self):
+        """
+        Test rows are filtered by the time encoded in their ids
+        """
+        day_ago = self.now - timedelta(days=1)
+        self.assertEqual(list(Title.objects.created_between(
+            day_ago).newest_first()), [self.new, self.recent])
+        self.assertEqual(list(Title.objects.created_between(
+            day_ago, self.now)), [self.recent])
+        self.assertEqual(list(Title.objects.created_between(
+            end=day_ago)), [self.old])
+        naive = timezone.make_naive(day_ago)
+        self.assertEqual(Title.objects.created_between(naive).count(), 2)
+
+    def test_ids_compare_in_ascii_order(self):
+        """
+        Test ids are ordered as ASCII strings, where upper case letters
+        sort before underscores and lower case letters
+        """
+        bound = get_id_bound(self.now + timedelta(days=1))
+        titles = [Title(title_name=name, id=bound + char * 12)
+                  for name, char in [('Upper', 'A'), ('Score', '_'),
+                                     ('Lower', 'a')]]
+        for title in titles:
+            title.save()
+        self.assertEqual(
+            list(Title.objects.created_between(
+                self.now + timedelta(hours=1)).newest_first()),
+            titles[::-1])
+
+    def test_list_resolvers_list_latest_created_first(self):
+        """
+        Test lists are ordered by creation time, which the keyset index
+        serves, rather than by id
+        """
+        Title.objects.filter(pk=self.new.pk).update(
+            created_at=self.now - timedelta(days=3))
+        response = self.client.execute(
+            'query { titles { items { titleName } } }')
+        self.assertEqual(
+            [item['titleName'] for item in response.data['titles']['items']],
+            ['Recent', 'Old', 'New'])
@@ -0,0 +1,111 @@
+from ..models import Title
+from .base import BaseTest
+from .mocks import cursor_employees_query, cursor_titles_query
+
+
+class TestCursorPagination(BaseTest):
+    """
+    Keyset pagination tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.titles = []
+        for name in ["One", "Two", "Three", "Four", "Five"]:
+            title = Title(title_name=name)
+            title.save()
+            self.titles.append(title)
+
+    def list_titles(self, **variables):
+        response = self.client.execute(cursor_titles_query, variables)
+        self.assertIsNone(response.errors)
+        return response.data['titles']
+
+    def test_after_cursor_walks_forward(self):
+        """
+        Test following next cursors lists every row once, newest first
+        """
+        names, after = [], None
+        while True:
+            page = self.list_titles(after=after)
+            names += [item['titleName'] for item in page['items']]
+            if not page['hasNext']:
+                break
+            after = page['nextCursor']
+        self.assertEqual(names, ["Five", "Four", "Three", "Two", "One"])
+        self.assertEqual(page['count'], 5)
+
+    def test_before_cursor_walks_backward(self):
+        """
+        Test a before cursor returns the rows just above it
+        """
+        first = self.list_titles()
+        last = self.list_titles(
+            after=self.list_titles(after=first['nextCursor'])['nextCursor'])
+        self.assertEqual([item['titleName'] for item in last['items']],
+                         ["One"])
+        page = self.list_titles(before=last['prevCursor'])
+        self.assertEqual([item['titleName'] for item in page['items']],
+                         ["Three", "Two"])
+        self.assertTrue(page['hasPrev'])
+        self.assertTrue(page['hasNext'])
+
+    def test_cursor_is_stable_under_inserts(self):
+        """
+        Test rows created after a cursor was issued do not shift the page
+        """
+        page = self.list_titles()
+        Title(title_name="Six").save()
+        page = self.list_titles(after=page['nextCursor'])
+        self.assertEqual([item['titleName'] for item in page['items']],
+                         ["Three", "Two"])
+
+    def test_invalid_cursor_fails(self):
+        """
+        Test a tampered cursor is rejected
+        """
+        response = self.client.execute(cursor_titles_query,
+                                       {"after": "not-a-cursor"})
+        self.assertEqual(response.errors[0].message, "Enter a valid cursor.")
+
+    def page_employees(self, **variables):
+        """
+        Follows the next cursors of an employee list to its end
+        """
+        ids, after = [], None
+        while True:
+            response = self.client.execute(cursor_employees_query, dict(
+                variables, limit=2, after=after))
+            self.assertIsNone(response.errors)
+            page = response.data['employees']
+            ids += [item['id'] for item in page['items']]
+            if not page['hasNext']:
+                return ids
+            after = page['nextCursor']
+
+    def test_search_results_are_paged_in_rank_order(self):
+        """
+        Test cursors of ranked and fuzzy searches follow their order
+        """
+        for first_name, last_name in [("Jane", "Doe"), ("Janet", "Jane"),
+                                      ("Mary", "Jane"), ("Jane", "Jane"),
+                                      ("Mary", "Janes"), ("Peter", "Otieno")]:
+            self.create_employee(first_name=first_name, last_name=last_name,
+                                 status='A', gender='F', period='M')
+        for fuzzy in [False, True]:
+            response = self.client.execute(cursor_employees_query, {
+                "search": "Jane", "fuzzy": fuzzy, "limit": 20})
+            ids = [item['id'] for item in
+                   response.data['employees']['items']]
+            self.assertGreater(len(ids), 3)
+            self.assertEqual(self.page_employees(search="Jane", fuzzy=fuzzy),
+                             ids)
+
+    def test_cursor_of_another_ordering_fails(self):
+        """
+        Test a cursor of a newest first list is not taken by a search
+        """
+        page = self.list_titles()
+        response = self.client.execute(cursor_employees_query, {
+            "search": "Jane", "after": page['nextCursor']})
+        self.assertEqual(response.errors[0].message, "Enter a valid cursor.")
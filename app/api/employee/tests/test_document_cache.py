@@ -0,0 +1,63 @@
+import json
+from unittest.mock import patch
+
+from django.test import Client
+from graphql_jwt.shortcuts import get_token
+
+from ...helpers.document_cache import (
+    DOCUMENT_CACHE_EVICTIONS, DOCUMENT_CACHE_HITS, CachedGraphQLBackend
+)
+from ...views import document_backend
+from ....schema import schema
+from .base import BaseTest
+
+titles_query = '''query { titles { items { titleName } } }'''
+
+
+class TestDocumentCache(BaseTest):
+    """
+    Parsed and validated document cache tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        document_backend.documents.clear()
+        self.http = Client(HTTP_AUTHORIZATION='JWT {}'.format(
+            get_token(self.admin)))
+
+    def post(self, query):
+        return self.http.post('/api/v1/graphql/', json.dumps(
+            {'query': query}), content_type='application/json').json()
+
+    def test_repeat_operations_skip_validation(self):
+        """
+        Test a repeated operation is neither parsed nor validated again
+        """
+        hits = DOCUMENT_CACHE_HITS.value
+        self.assertNotIn('errors', self.post(titles_query))
+        with patch('app.api.helpers.document_cache.validate') as validate, \
+                patch('graphql.backend.core.parse') as parse:
+            self.assertNotIn('errors', self.post(titles_query))
+        validate.assert_not_called()
+        parse.assert_not_called()
+        self.assertEqual(DOCUMENT_CACHE_HITS.value, hits + 1)
+
+    def test_invalid_documents_are_not_cached(self):
+        """
+        Test a document failing validation reports errors and is not kept
+        """
+        response = self.post('query { titles { unknownField } }')
+        self.assertIn('unknownField', response['errors'][0]['message'])
+        self.assertEqual(len(document_backend.documents), 0)
+
+    def test_cache_is_bounded(self):
+        """
+        Test the least recently used documents are evicted
+        """
+        backend = CachedGraphQLBackend(max_size=2)
+        evictions = DOCUMENT_CACHE_EVICTIONS.value
+        for field in ['titles', 'grades', 'courses']:
+            backend.document_from_string(
+                schema, 'query {{ {} {{ count }} }}'.format(field))
+        self.assertEqual(len(backend.documents), 2)
+        self.assertEqual(DOCUMENT_CACHE_EVICTIONS.value, evictions + 1)
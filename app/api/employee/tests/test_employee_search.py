@@ -0,0 +1,81 @@
+from ..helpers.search_helpers import get_search_query
+from ..models import Employee
+from .base import BaseTest
+from .mocks import list_employees_query
+
+
+class TestEmployeeSearch(BaseTest):
+    """
+    Employee full text search tests
+    """
+
+    def search(self, search):
+        response = self.client.execute(list_employees_query,
+                                       {"search": search})
+        self.assertIsNone(response.errors)
+        return [item['firstName']
+                for item in response.data['employees']['items']]
+
+    def test_search_matches_prefix_of_employee_columns(self):
+        """
+        Test searching with a partially typed name succeeds
+        """
+        self.create_employee(first_name="Jane")
+        self.create_employee(first_name="Peter", email="peter@example.com")
+        self.assertEqual(self.search("jan"), ["Jane"])
+
+    def test_search_matches_related_rows(self):
+        """
+        Test searching by the names of related rows succeeds
+        """
+        references = self.create_references()
+        self.create_employee(first_name="Jane", **references)
+        self.create_employee(first_name="Peter")
+        self.assertEqual(self.search("finance"), ["Jane"])
+        self.assertEqual(self.search("accountant samar"), ["Jane"])
+
+    def test_search_document_follows_related_changes(self):
+        """
+        Test the search document is refreshed when a related row changes
+        """
+        references = self.create_references()
+        self.create_employee(first_name="Jane", **references)
+        title = references['job_title']
+        title.title_name = "Auditor"
+        title.save()
+        self.assertEqual(self.search("auditor"), ["Jane"])
+        self.assertEqual(self.search("accountant"), [])
+        references['department'][0].employee_set.clear()
+        self.assertEqual(self.search("finance"), [])
+
+    def test_search_document_follows_deleted_related_rows(self):
+        """
+        Test the search document drops the names of deleted related rows
+        """
+        references = self.create_references()
+        self.create_employee(first_name="Jane", **references)
+        employees = Employee.objects.all_with_deleted()
+        senior = get_search_query("senior")
+        self.assertTrue(employees.filter(search_vector=senior).exists())
+        references['grade'].delete()
+        self.assertFalse(employees.filter(search_vector=senior).exists())
+        self.assertTrue(employees.filter(
+            search_vector=get_search_query("jane")).exists())
+
+    def test_search_ranks_name_matches_first(self):
+        """
+        Test employees matching on their names rank above other matches
+        """
+        self.create_employee(first_name="Peter", address="Kisumu road")
+        self.create_employee(first_name="Kisumu")
+        self.assertEqual(self.search("kisumu"), ["Kisumu", "Peter"])
+
+    def test_search_query_ignores_operators(self):
+        """
+        Test tsquery operators typed by the user are not interpreted
+        """
+        self.assertIsNone(get_search_query(" & | ! "))
+        self.create_employee(first_name="O'Brien")
+        self.assertEqual(
+            Employee.objects.filter(
+                search_vector=get_search_query("o'brien")).count(), 1)
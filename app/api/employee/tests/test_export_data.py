@@ -0,0 +1,104 @@
+import csv
+import os
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.test import Client
+from graphql_jwt.shortcuts import get_token
+
+from ...authentication.models import User
+from ..helpers import export_helpers
+from ..helpers.import_helpers import import_file
+from ..models import Payroll
+from ..tasks import export_data
+from .base import BaseTest
+
+
+class TestExportData(BaseTest):
+    """
+    Streaming export tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.references = self.create_references()
+        self.employee = self.create_employee(
+            status='F', gender='F', phone_numbers='', emergency_numbers='',
+            qualifications='', period='M', **self.references)
+        Payroll(period_number=1, employee_net_salary=40000,
+                employee_gross_salary=50000,
+                reimbursment_date=date(2021, 1, 31), employee=self.employee,
+                grade=self.references['grade']).save()
+        self.http = Client(HTTP_AUTHORIZATION='JWT {}'.format(
+            get_token(self.admin)))
+
+    def read(self, response):
+        content = b''.join(response.streaming_content).decode('utf-8')
+        return list(csv.DictReader(content.splitlines()))
+
+    def test_export_employees(self):
+        """
+        Test employees are streamed with their related names
+        """
+        response = self.http.get('/api/v1/export/employees/')
+        self.assertEqual(response['Content-Disposition'],
+                         'attachment; filename="employees.csv"')
+        rows = self.read(response)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['Email'], 'jane@example.com')
+        self.assertEqual(rows[0]['Grade'], 'Senior')
+        self.assertEqual(rows[0]['Job Title'], 'Accountant')
+        self.assertEqual(rows[0]['Department'], 'Finance')
+
+    def test_export_payrolls(self):
+        """
+        Test payrolls are streamed with the email of their employee
+        """
+        rows = self.read(self.http.get('/api/v1/export/payrolls/'))
+        self.assertEqual(rows[0]['Employee Email'], 'jane@example.com')
+        self.assertEqual(rows[0]['Reimbursment Date'], '2021-01-31')
+
+    def test_export_requires_a_manager(self):
+        """
+        Test anonymous users and users without a role cannot export
+        """
+        response = Client().get('/api/v1/export/employees/')
+        self.assertEqual(response.status_code, 401)
+        user = User.objects.create_user(
+            username="Staff", email="staff@example.com",
+            password="String@123", first_name="Staff",
+            last_name="Member", phone_number="+254743542156")
+        user.is_active = True
+        user.save()
+        response = Client(HTTP_AUTHORIZATION='JWT {}'.format(
+            get_token(user))).get('/api/v1/export/employees/')
+        self.assertEqual(response.status_code, 403)
+        response = self.http.get('/api/v1/export/employees/?format=pdf')
+        self.assertEqual(response.status_code, 400)
+        response = self.http.get('/api/v1/export/users/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_task_output_can_be_imported(self):
+        """
+        Test the background export writes a file the import reads back
+        """
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'employees.csv')
+        try:
+            export_data('employees', path, chunk_size=1)
+            summary = import_file('employees', path)
+        finally:
+            os.remove(path)
+            os.rmdir(directory)
+        self.assertEqual((summary['updated'], summary['failed']), (1, 0))
+
+    def test_export_task_rejects_unavailable_formats(self):
+        """
+        Test parquet exports fail clearly when pyarrow is not installed
+        """
+        path = os.path.join(tempfile.gettempdir(), 'employees.parquet')
+        with mock.patch.object(export_helpers, 'pyarrow', None):
+            with self.assertRaisesRegex(ValueError, 'Allowed options are csv'):
+                export_data('employees', path, 'parquet')
+        self.assertFalse(os.path.exists(path))
@@ -0,0 +1,182 @@
+import csv
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+import pandas as pd
+from django.core.management import call_command
+
+from ..helpers.import_helpers import REPORTED_ERRORS, import_file
+from ..models import Department, Employee, Payroll
+from .base import BaseTest
+
+EMPLOYEE_HEADER = ['First Name', 'Last Name', 'Other Names', 'Email',
+                   'Address', 'Date Of Birth', 'Hiring Date',
+                   'Current Salary', 'Starting Salary', 'Status', 'Gender',
+                   'Job Title', 'Grade', 'Department']
+
+
+class TestImportData(BaseTest):
+    """
+    Spreadsheet import tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.references = self.create_references()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, header, rows):
+        path = os.path.join(self.directory, 'import.csv')
+        with open(path, 'w', newline='') as output:
+            writer = csv.writer(output)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return path
+
+    def employee_row(self, email, **kwargs):
+        row = {'First Name': 'Jane', 'Last Name': 'Doe',
+               'Other Names': 'Wanjiku', 'Email': email,
+               'Address': 'Nairobi', 'Date Of Birth': '1990-01-01',
+               'Hiring Date': '2020-01-01', 'Current Salary': '50000',
+               'Starting Salary': '40000', 'Status': 'F', 'Gender': 'F',
+               'Job Title': 'Accountant', 'Grade': 'Senior',
+               'Department': 'Finance'}
+        row.update(kwargs)
+        return [row[name] for name in EMPLOYEE_HEADER]
+
+    def test_import_employees(self):
+        """
+        Test employees are created with their references and departments
+        """
+        path = self.write(EMPLOYEE_HEADER, [
+            self.employee_row('jane@example.com'),
+            self.employee_row('john@example.com', **{'First Name': 'John'}),
+        ])
+        summary = import_file('employees', path, chunk_size=1)
+        self.assertEqual((summary['created'], summary['failed']), (2, 0))
+        employee = Employee.objects.get(email='john@example.com')
+        self.assertEqual(employee.job_title, self.references['job_title'])
+        self.assertEqual(employee.grade, self.references['grade'])
+        self.assertEqual(list(employee.department.all()),
+                         self.references['department'])
+        self.assertEqual(employee.phone_numbers, '')
+        self.assertIsNotNone(employee.search_vector)
+
+    def test_import_updates_employees_by_email(self):
+        """
+        Test a row with the email of an employee updates the employee
+        """
+        employee = self.create_employee(email='jane@example.com')
+        path = self.write(EMPLOYEE_HEADER, [
+            self.employee_row('Jane@Example.com', **{'Current Salary': '90000'})
+        ])
+        summary = import_file('employees', path)
+        self.assertEqual((summary['created'], summary['updated']), (0, 1))
+        employee.refresh_from_db()
+        self.assertEqual(employee.current_salary, 90000)
+        self.assertEqual(employee.department.count(), 1)
+
+    def test_invalid_rows_are_reported(self):
+        """
+        Test invalid rows are rejected with their row numbers
+        """
+        path = self.write(EMPLOYEE_HEADER, [
+            self.employee_row('jane@example.com'),
+            self.employee_row('not-an-email', **{'Date Of Birth': 'soon'}),
+            self.employee_row('john@example.com', Grade='Junior'),
+        ])
+        errors_path = os.path.join(self.directory, 'errors.csv')
+        summary = import_file('employees', path, errors_path=errors_path)
+        self.assertEqual((summary['created'], summary['failed']), (1, 2))
+        self.assertEqual([row for row, _ in summary['errors']], [3, 4])
+        self.assertIn('Enter a valid date of birth.', summary['errors'][0][1])
+        self.assertIn('Enter a valid email.', summary['errors'][0][1])
+        self.assertEqual(summary['errors'][1][1], 'Grade does not exist')
+        with open(errors_path) as errors:
+            self.assertEqual(len(errors.readlines()), 3)
+
+    def test_errors_are_written_as_they_are_found(self):
+        """
+        Test every row error is written while only the first are reported
+        """
+        path = self.write(EMPLOYEE_HEADER, [
+            self.employee_row('jane{}@example.com'.format(number),
+                              Grade='Junior')
+            for number in range(REPORTED_ERRORS + 5)])
+        errors_path = os.path.join(self.directory, 'errors.csv')
+        summary = import_file('employees', path, chunk_size=10,
+                              errors_path=errors_path)
+        self.assertEqual(summary['failed'], REPORTED_ERRORS + 5)
+        self.assertEqual(len(summary['errors']), REPORTED_ERRORS)
+        with open(errors_path) as errors:
+            self.assertEqual(len(errors.readlines()), REPORTED_ERRORS + 6)
+        path = self.write(EMPLOYEE_HEADER, [
+            self.employee_row('jane@example.com')])
+        import_file('employees', path, errors_path=errors_path)
+        self.assertFalse(os.path.exists(errors_path))
+
+    def test_import_excel_workbook(self):
+        """
+        Test employees are imported from an xlsx workbook
+        """
+        path = os.path.join(self.directory, 'import.xlsx')
+        pd.DataFrame([self.employee_row('jane@example.com')],
+                     columns=EMPLOYEE_HEADER).to_excel(path, index=False)
+        summary = import_file('employees', path)
+        self.assertEqual((summary['created'], summary['failed']), (1, 0))
+
+    def test_duplicate_rows_are_reported(self):
+        """
+        Test rows replaced by a later row with the same key are reported
+        """
+        path = self.write(EMPLOYEE_HEADER, [
+            self.employee_row('jane@example.com'),
+            self.employee_row('JANE@example.com', **{'First Name': 'Janet'}),
+            self.employee_row('john@example.com', Grade='Junior'),
+        ])
+        summary = import_file('employees', path)
+        self.assertEqual((summary['created'], summary['failed']), (1, 2))
+        self.assertEqual(summary['errors'], [
+            (2, 'Replaced by row 3 with the same email'),
+            (4, 'Grade does not exist')])
+        self.assertEqual(Employee.objects.get().first_name, 'Janet')
+
+    def test_import_payrolls(self):
+        """
+        Test payrolls are matched to employees by email
+        """
+        employee = self.create_employee(email='jane@example.com')
+        header = ['Employee Email', 'Period Number', 'Employee Net Salary',
+                  'Employee Gross Salary', 'Reimbursment Date', 'Grade']
+        path = self.write(header, [
+            ['jane@example.com', '1', '40000', '50000', '2021-01-31',
+             'Senior'],
+            ['nobody@example.com', '1', '40000', '50000', '2021-01-31', ''],
+        ])
+        summary = import_file('payrolls', path)
+        self.assertEqual(summary['errors'], [(3, 'Employee does not exist')])
+        payroll = Payroll.objects.get()
+        self.assertEqual(payroll.employee, employee)
+        self.assertEqual(payroll.period_number, 1)
+        summary = import_file('payrolls', path)
+        self.assertEqual((summary['created'], summary['updated']), (0, 1))
+
+    def test_import_command(self):
+        """
+        Test the command imports departments
+        """
+        path = self.write(['Department Name', 'Pay Grade'],
+                          [['Sales', 'Senior'], ['Finance', '']])
+        output = StringIO()
+        call_command('import_data', 'departments', path, stdout=output)
+        self.assertIn('2 rows: 1 created, 1 updated, 0 rejected',
+                      output.getvalue())
+        self.assertEqual(Department.objects.get(
+            department_name='Sales').pay_grade, self.references['grade'])
+        self.assertIsNone(Department.objects.get(
+            department_name='Finance').pay_grade)
@@ -0,0 +1,96 @@
+import json
+
+from django.test import Client, override_settings
+from graphql_jwt.middleware import JSONWebTokenMiddleware
+from graphql_jwt.shortcuts import get_token
+
+from ...helpers.instrumentation import (
+    OPERATION_QUERIES, RESOLVER_DURATION, RESOLVER_QUERIES,
+    InstrumentationMiddleware, operation_labels
+)
+from ...helpers.metrics import registry
+from .base import BaseTest
+
+employees_query = '''query listEmployees {
+    employees { items { firstName grade { gradeName } } } }'''
+
+
+class TestInstrumentation(BaseTest):
+    """
+    Resolver and operation instrumentation tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+        operation_labels.clear()
+        self.create_employee(**self.create_references())
+
+    def test_resolvers_are_measured(self):
+        """
+        Test object fields are timed and their queries counted
+        """
+        self.client.middleware(
+            [JSONWebTokenMiddleware, InstrumentationMiddleware])
+        response = self.client.execute(employees_query)
+        self.assertIsNone(response.errors)
+        count, _ = RESOLVER_DURATION.get(path='Query.employees')
+        self.assertEqual(count, 1)
+        count, queries = RESOLVER_QUERIES.get(path='Query.employees')
+        self.assertGreater(queries, 0)
+        self.assertEqual(RESOLVER_DURATION.get(
+            path='EmployeeType.firstName'), (0, 0))
+
+    @override_settings(GRAPHQL_SLOW_OPERATION_MS='0')
+    def test_operations_are_exported(self):
+        """
+        Test operations are measured, logged when slow and scraped
+        """
+        client = Client(HTTP_AUTHORIZATION='JWT {}'.format(
+            get_token(self.admin)))
+        with self.assertLogs('app.api.helpers.instrumentation', 'WARNING'):
+            response = client.post('/api/v1/graphql/', json.dumps(
+                {'query': employees_query}),
+                content_type='application/json')
+        self.assertNotIn('errors', response.json())
+        count, queries = OPERATION_QUERIES.get(operation='listEmployees')
+        self.assertEqual(count, 1)
+        self.assertGreater(queries, 0)
+        metrics = client.get('/api/v1/metrics/').content.decode()
+        self.assertIn('graphql_operation_duration_seconds_count'
+                      '{operation="listEmployees"} 1', metrics)
+        self.assertIn('graphql_resolver_queries_bucket'
+                      '{path="EmployeeType.grade",le="0"}', metrics)
+
+    @override_settings(GRAPHQL_OPERATION_LABEL_LIMIT=1)
+    def test_operation_labels_are_bounded(self):
+        """
+        Test names past the label limit are recorded as other
+        """
+        client = Client(HTTP_AUTHORIZATION='JWT {}'.format(
+            get_token(self.admin)))
+        for query in (employees_query,
+                      employees_query.replace('listEmployees', 'second'),
+                      employees_query.replace('listEmployees', ''),
+                      employees_query):
+            client.post('/api/v1/graphql/', json.dumps({'query': query}),
+                        content_type='application/json')
+        self.assertEqual(
+            OPERATION_QUERIES.get(operation='listEmployees')[0], 2)
+        self.assertEqual(OPERATION_QUERIES.get(operation='second')[0], 0)
+        self.assertEqual(OPERATION_QUERIES.get(operation='other')[0], 1)
+        self.assertEqual(OPERATION_QUERIES.get(operation='anonymous')[0], 1)
+        self.assertEqual(operation_labels.get('third', registered=True),
+                         'third')
+
+    @override_settings(METRICS_SCRAPE_TOKEN='scrape-secret')
+    def test_metrics_are_not_public(self):
+        """
+        Test only admins and scrapers holding the token read the metrics
+        """
+        self.assertEqual(Client().get('/api/v1/metrics/').status_code, 401)
+        self.assertEqual(Client(HTTP_AUTHORIZATION='Bearer wrong').get(
+            '/api/v1/metrics/').status_code, 401)
+        response = Client(HTTP_AUTHORIZATION='Bearer scrape-secret').get(
+            '/api/v1/metrics/')
+        self.assertEqual(response.status_code, 200)
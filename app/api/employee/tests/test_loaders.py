@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+from promise import Promise
+
+from ...authentication.models import User
+from ...helpers.loaders import load_related, load_roles
+from ..models import Department, Employee, Grade, SubDepartment
+from .base import BaseTest
+
+
+class TestLoaders(BaseTest):
+    """
+    Request scoped data loader tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.info = SimpleNamespace(context=SimpleNamespace())
+        references = self.create_references()
+        for index in range(3):
+            # every employee gets a grade of its own
+            references['grade'] = Grade(grade_name="Grade{}".format(index),
+                                       grade_bonus=10)
+            references['grade'].save()
+            self.create_employee(first_name="Jane{}".format(index),
+                                 **references)
+        self.employees = list(Employee.objects.all())
+
+    def resolve(self, resolver, rows):
+        # resolve inside a promise callback as graphql execution does so
+        # that the loads are queued up before the loaders dispatch
+        return Promise.resolve(None).then(lambda _: Promise.all(
+            [resolver(row, self.info) for row in rows])).get()
+
+    def test_foreign_keys_are_batched(self):
+        """
+        Test sibling foreign keys are loaded in a single query
+        """
+        with self.assertNumQueries(1):
+            grades = self.resolve(load_related('grade'), self.employees)
+        self.assertEqual(
+            sorted(grade.grade_name for grade in grades),
+            ["Grade0", "Grade1", "Grade2"])
+
+    def test_many_to_many_fields_are_batched(self):
+        """
+        Test sibling many to many fields are loaded in a single query
+        """
+        department = Department.objects.get()
+        for name in ["Payables", "Receivables"]:
+            sub_department = SubDepartment(name=name)
+            sub_department.save()
+            department.sub_departments.add(sub_department)
+        with self.assertNumQueries(1):
+            departments = self.resolve(load_related('department'),
+                                       self.employees)
+        self.assertEqual(
+            [[item.department_name for item in items]
+             for items in departments], [["Finance"]] * 3)
+        with self.assertNumQueries(1):
+            sub_departments = self.resolve(load_related('sub_departments'),
+                                           [department])
+        self.assertEqual(sorted(item.name for item in sub_departments[0]),
+                         ["Payables", "Receivables"])
+
+    def test_roles_are_batched(self):
+        """
+        Test the roles of several users are loaded in a single query
+        """
+        other = User.objects.create_user(
+            username="Other", email="other@example.com",
+            password="String@123")
+        with self.assertNumQueries(1):
+            roles = self.resolve(load_roles, [self.admin, other])
+        self.assertEqual(roles, [['admin'], []])
@@ -0,0 +1,151 @@
+from unittest import mock
+
+from django.test import override_settings
+
+from app import celery_app
+
+from ..helpers.payroll_helpers import get_payroll_partitions, run_payroll
+from ..models import Employee, Employer, Payroll, PayrollRun
+from .base import BaseTest
+from .mocks import (
+    payroll_run_query, resume_payroll_run_mutation, start_payroll_run_mutation
+)
+
+
+class TestPayrollRun(BaseTest):
+    """
+    Partitioned payroll run tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.references = self.create_references()
+        self.other_employer = Employer(business_name="Other", location="Mombasa")
+        self.other_employer.save()
+        employers = [self.references['employer_name']] * 3 + \
+            [self.other_employer, None]
+        for index, employer in enumerate(employers):
+            self.create_employee(
+                email='employee{}@example.com'.format(index),
+                employer_name=employer, status='F', gender='F',
+                phone_numbers='', emergency_numbers='', qualifications='',
+                period='M', current_salary=1000)
+        celery_app.conf.task_always_eager = True
+
+    def tearDown(self):
+        celery_app.conf.task_always_eager = False
+
+    def start_run(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.execute(
+                start_payroll_run_mutation, variables={'periodNumber': 1})
+        return response.data['startPayrollRun']['payrollRun']['id']
+
+    def get_run(self, id):
+        return self.client.execute(
+            payroll_run_query, variables={'id': id}).data['payrollRun']
+
+    @override_settings(PAYROLL_PARTITION_SIZE=2)
+    def test_partitions(self):
+        """
+        Test employers are split into ranges of at most the partition size
+        """
+        partitions = get_payroll_partitions()
+        self.assertEqual(len(partitions), 4)
+        employer_id = self.references['employer_name'].id
+        self.assertEqual(
+            [partition['employer'] for partition in partitions].count(
+                employer_id), 2)
+        counts = [run_payroll(1, '2021-01-31', partition)['count']
+                  for partition in partitions]
+        self.assertEqual(sorted(counts), [1, 1, 1, 2])
+        self.assertEqual(Payroll.objects.values(
+            'employee_id').distinct().count(), 5)
+
+    @override_settings(PAYROLL_PARTITION_SIZE=2)
+    def test_run_pays_every_partition(self):
+        """
+        Test a run pays every employee once and totals the payrolls
+        """
+        run = self.get_run(self.start_run())
+        self.assertEqual(run['status'], 'C')
+        self.assertEqual(run['totalPartitions'], 4)
+        self.assertEqual(run['completedPartitions'], 4)
+        self.assertEqual(run['payrollCount'], 5)
+        self.assertEqual(run['totalGross'], 5 * 1000)
+        self.assertEqual(Payroll.objects.count(), 5)
+
+    def test_failed_partitions_can_be_resumed(self):
+        """
+        Test a failed partition is reported and paid when resumed
+        """
+        employer_id = self.other_employer.id
+
+        def fail_other_employer(period_number, reimbursment_date, partition,
+                                run_id):
+            if partition['employer'] == employer_id:
+                raise ValueError('Bank unavailable')
+            return run_payroll(period_number, reimbursment_date, partition,
+                               run_id)
+        with mock.patch('app.api.employee.tasks.run_payroll',
+                        fail_other_employer):
+            id = self.start_run()
+        run = self.get_run(id)
+        self.assertEqual(run['status'], 'F')
+        self.assertEqual(list(run['failedPartitions'].values()),
+                         ['Bank unavailable'])
+        self.assertEqual(run['payrollCount'], 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.execute(resume_payroll_run_mutation,
+                                variables={'id': id})
+        run = self.get_run(id)
+        self.assertEqual(run['status'], 'C')
+        self.assertEqual(run['failedPartitions'], {})
+        self.assertEqual(run['payrollCount'], 5)
+        self.assertEqual(Payroll.objects.filter(
+            employee__employer_name=employer_id).count(), 1)
+        self.assertEqual(Employee.objects.count(), 5)
+
+    def test_totals_only_count_the_payrolls_of_the_run(self):
+        """
+        Test payrolls of the period made outside the run are left out
+        """
+        employee = Employee.objects.get(email='employee0@example.com')
+        Payroll(period_number=1, employee=employee, employee_net_salary=700,
+                employee_gross_salary=700,
+                reimbursment_date='2021-01-31').save()
+        run = self.get_run(self.start_run())
+        self.assertEqual(run['status'], 'C')
+        self.assertEqual(run['payrollCount'], 4)
+        self.assertEqual(run['totalGross'], 4 * 1000)
+        self.assertEqual(Payroll.objects.count(), 5)
+
+    def test_only_failed_runs_are_resumed(self):
+        """
+        Test running and completed runs are not queued again
+        """
+        id = self.start_run()
+        with mock.patch('app.api.employee.mutations.queue_payroll_run') \
+                as queue:
+            for status in ['R', 'C']:
+                PayrollRun.objects.filter(id=id).update(status=status)
+                response = self.client.execute(resume_payroll_run_mutation,
+                                               variables={'id': id})
+                self.assertEqual(response.errors[0].message,
+                                 'Only failed payroll runs can be resumed')
+                self.assertEqual(self.get_run(id)['status'], status)
+        queue.assert_not_called()
+
+    def test_resuming_a_run_with_nothing_pending_finishes_it(self):
+        """
+        Test a failed run whose partitions have all been paid completes
+        """
+        id = self.start_run()
+        PayrollRun.objects.filter(id=id).update(
+            status=PayrollRun.StatusOptions.FAILED, payroll_count=0)
+        response = self.client.execute(resume_payroll_run_mutation,
+                                       variables={'id': id})
+        self.assertIsNone(response.errors)
+        run = self.get_run(id)
+        self.assertEqual(run['status'], 'C')
+        self.assertEqual(run['payrollCount'], 5)
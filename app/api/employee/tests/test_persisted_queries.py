@@ -0,0 +1,127 @@
+import json
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from graphql_jwt.shortcuts import get_token
+
+from ...helpers.persisted_queries import (
+    get_query_hash, persisted_query_cache, register_persisted_query
+)
+from ...models import PersistedQuery
+from .base import BaseTest
+
+titles_query = 'query { titles { items { titleName } } }'
+
+
+class TestPersistedQueries(BaseTest):
+    """
+    Automatic persisted query tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        persisted_query_cache.clear()
+        self.http = Client(HTTP_AUTHORIZATION='JWT {}'.format(
+            get_token(self.admin)))
+
+    def post(self, sha256_hash=None, query=None):
+        data = {'extensions': {'persistedQuery': {
+            'version': 1, 'sha256Hash': sha256_hash}}}
+        if query:
+            data['query'] = query
+        return self.http.post('/api/v1/graphql/', json.dumps(data),
+                              content_type='application/json').json()
+
+    def test_hash_is_registered_then_served(self):
+        """
+        Test an unknown hash asks for the query which is then persisted
+        in memory without growing the registry
+        """
+        sha256_hash = get_query_hash(titles_query)
+        response = self.post(sha256_hash)
+        self.assertEqual(response['errors'][0]['message'],
+                         'PersistedQueryNotFound')
+        response = self.post(sha256_hash, titles_query)
+        self.assertEqual(response['data'], {'titles': {'items': []}})
+        response = self.post(sha256_hash)
+        self.assertEqual(response['data'], {'titles': {'items': []}})
+        self.assertFalse(PersistedQuery.objects.exists())
+
+    def test_mismatched_hash_fails(self):
+        """
+        Test a query sent with somebody else's hash is rejected
+        """
+        response = self.post('0' * 64, titles_query)
+        self.assertEqual(response['errors'][0]['extensions']['code'],
+                         'PERSISTED_QUERY_HASH_MISMATCH')
+        self.assertFalse(PersistedQuery.objects.exists())
+
+    @override_settings(GRAPHQL_PERSISTED_QUERIES_ONLY=True)
+    def test_allowlist_only_rejects_unregistered_queries(self):
+        """
+        Test only queries registered by the command run in allowlist mode
+        """
+        response = self.post(get_query_hash(titles_query), titles_query)
+        self.assertEqual(response['errors'][0]['extensions']['code'],
+                         'PERSISTED_QUERY_NOT_ALLOWED')
+        with tempfile.NamedTemporaryFile('w', suffix='.graphql',
+                                         delete=False) as document:
+            document.write(titles_query)
+        call_command('register_queries', document.name, stdout=open(
+            os.devnull, 'w'))
+        os.remove(document.name)
+        response = self.post(get_query_hash(titles_query))
+        self.assertEqual(response['data'], {'titles': {'items': []}})
+
+    def test_allowlist_only_ignores_client_persisted_queries(self):
+        """
+        Test queries persisted by clients are not approved in allowlist mode
+        """
+        sha256_hash = get_query_hash(titles_query)
+        self.post(sha256_hash, titles_query)
+        with override_settings(GRAPHQL_PERSISTED_QUERIES_ONLY=True):
+            response = self.post(sha256_hash)
+            self.assertEqual(response['errors'][0]['message'],
+                             'PersistedQueryNotFound')
+            response = self.post(sha256_hash, titles_query)
+            self.assertEqual(response['errors'][0]['extensions']['code'],
+                             'PERSISTED_QUERY_NOT_ALLOWED')
+            register_persisted_query(titles_query)
+            response = self.post(sha256_hash)
+        self.assertEqual(response['data'], {'titles': {'items': []}})
+
+    def test_invalid_documents_are_not_registered(self):
+        """
+        Test the command refuses documents that fail validation
+        """
+        query = 'query { titles { unknownField } }'
+        with tempfile.NamedTemporaryFile('w', suffix='.json',
+                                         delete=False) as manifest:
+            json.dump({get_query_hash(query): query}, manifest)
+        with self.assertRaises(CommandError):
+            call_command('register_queries', manifest.name)
+        os.remove(manifest.name)
+        self.assertFalse(PersistedQuery.objects.exists())
+
+    def test_registered_queries_are_served_from_memory(self):
+        """
+        Test hashes are resolved without reading the registry until the
+        query is revoked
+        """
+        sha256_hash = get_query_hash(titles_query)
+        register_persisted_query(titles_query)
+        persisted_query_cache.clear()
+        self.post(sha256_hash)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(sha256_hash)
+        self.assertEqual(response['data'], {'titles': {'items': []}})
+        self.assertFalse([query for query in queries.captured_queries
+                          if 'api_persistedquery' in query['sql']])
+        PersistedQuery.objects.get().delete()
+        response = self.post(sha256_hash)
+        self.assertEqual(response['errors'][0]['message'],
+                         'PersistedQueryNotFound')
@@ -0,0 +1,127 @@
+import os
+from threading import Thread
+from unittest import mock
+
+import numpy
+from django.test import SimpleTestCase
+
+from ...helpers.push_id import PushID, push_id as shared_push_id
+
+
+class TestPushID(SimpleTestCase):
+    """
+    Push id batch generation tests
+    """
+
+    def test_batches_sort_after_earlier_ids(self):
+        """
+        Test batches are unique and sort after the ids made before them
+        """
+        push_id = PushID()
+        ids = push_id.next_ids(1000) + [push_id.next_id()] + \
+            push_id.next_ids(1000) + push_id.next_ids(1)
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(ids, sorted(ids))
+        self.assertTrue(all(len(id) == 20 for id in ids))
+        self.assertEqual(push_id.next_ids(0), [])
+
+    def test_batches_count_up_from_the_random_part(self):
+        """
+        Test the ids of a batch share a timestamp and count up by one
+        """
+        push_id = PushID()
+        with mock.patch('app.api.helpers.push_id.time', return_value=1.0):
+            ids = push_id.next_ids(70)
+            following = push_id.next_id()
+        self.assertEqual({id[:8] for id in ids + [following]},
+                         {push_id.get_unique_id(1000)})
+        values = [push_id.get_rand_value(
+            [PushID.PUSH_CHARS.index(char) for char in id[8:]])
+            for id in ids + [following]]
+        self.assertEqual(values, list(range(values[0], values[0] + 71)))
+
+    def test_wrapping_moves_on_to_the_next_millisecond(self):
+        """
+        Test pushes that would run out of random values move on to the
+        next timestamp instead of wrapping around
+        """
+        push_id = PushID()
+        last_id = push_id.get_unique_id(1000) + 'z' * 12
+        push_id.last_push_time = 1000
+        push_id.last_rand_chars[:] = 63
+        with mock.patch('app.api.helpers.push_id.time', return_value=1.0):
+            ids = push_id.next_ids(3)
+            push_id.last_rand_chars[:] = 63
+            ids.append(push_id.next_id())
+        self.assertEqual(push_id.last_push_time, 1002)
+        self.assertEqual(ids, sorted(ids))
+        self.assertTrue(ids[0] > last_id)
+
+    def test_ids_increase_when_the_clock_goes_back(self):
+        """
+        Test ids made after the system clock is set back still sort after
+        the earlier ones
+        """
+        push_id = PushID()
+        with mock.patch('app.api.helpers.push_id.time',
+                        side_effect=[2.0, 1.0, 1.0]):
+            ids = [push_id.next_id(), push_id.next_id()] + \
+                push_id.next_ids(2)
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual({id[:8] for id in ids},
+                         {push_id.get_unique_id(2000)})
+
+    def test_threads_share_the_generator(self):
+        """
+        Test threads pushing at once get unique, increasing ids
+        """
+        results = []
+
+        def push():
+            ids = []
+            for _ in range(200):
+                ids += shared_push_id.next_ids(5) + [shared_push_id.next_id()]
+            results.append(ids)
+        threads = [Thread(target=push) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ids = [id for result in results for id in result]
+        self.assertEqual(len(set(ids)), 8 * 200 * 6)
+        for result in results:
+            self.assertEqual(result, sorted(result))
+
+    def test_forked_children_reseed(self):
+        """
+        Test a forked child does not repeat the random characters of its
+        parent
+        """
+        shared_push_id.next_id()
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            os.write(write, '{} {}'.format(
+                shared_push_id.last_push_time,
+                shared_push_id.random.randint(0, 2 ** 31)).encode())
+            os._exit(0)
+        os.close(write)
+        os.waitpid(pid, 0)
+        with os.fdopen(read) as child:
+            last_push_time, value = child.read().split()
+        self.assertEqual(last_push_time, '0')
+        self.assertNotEqual(int(value),
+                            shared_push_id.random.randint(0, 2 ** 31))
+
+    def test_single_ids_use_the_generator_state(self):
+        """
+        Test single ids draw their random characters from the state the
+        generator reseeds
+        """
+        generators = [PushID(), PushID()]
+        for generator in generators:
+            generator.random = numpy.random.RandomState(7)
+        with mock.patch('app.api.helpers.push_id.time', return_value=1.0):
+            ids = [generator.next_id() for generator in generators]
+        self.assertEqual(ids[0], ids[1])
@@ -0,0 +1,69 @@
+import json
+
+from django.test import Client, override_settings
+from graphql import parse
+from graphql_jwt.shortcuts import get_token
+
+from ....schema import schema
+from ...helpers.query_cost import analyze_query_cost
+from .base import BaseTest
+
+employees_query = '''query($limit: Int) {
+    employees(limit: $limit) {
+        count items { id ...departments } } }
+fragment departments on EmployeeType { department { departmentName } }'''
+
+
+class TestQueryCost(BaseTest):
+    """
+    Query cost analysis tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.http = Client(HTTP_AUTHORIZATION='JWT {}'.format(
+            get_token(self.admin)))
+
+    def post(self, query, variables=None):
+        return self.http.post('/api/v1/graphql/', json.dumps(
+            {'query': query, 'variables': variables}),
+            content_type='application/json')
+
+    def test_cost_grows_with_limit_and_nesting(self):
+        """
+        Test the cost multiplies by the limit and nested lists
+        """
+        document = parse(employees_query)
+        self.assertEqual(analyze_query_cost(
+            schema, document, {'limit': 50}), (603, 4))
+        # the default page size applies without a limit
+        self.assertEqual(analyze_query_cost(schema, document), (123, 4))
+
+    def test_cost_is_reported(self):
+        """
+        Test the cost is sent in the response extensions
+        """
+        response = self.post(employees_query, {'limit': 5}).json()
+        self.assertEqual(response['data']['employees']['items'], [])
+        self.assertEqual(response['extensions']['cost']['requested'], 63)
+        self.assertEqual(response['extensions']['cost']['depth'], 4)
+
+    @override_settings(GRAPHQL_MAX_QUERY_COST=1000)
+    def test_costly_query_is_rejected(self):
+        """
+        Test a query over budget is rejected before it runs
+        """
+        response = self.post(employees_query, {'limit': 10000})
+        self.assertEqual(response.status_code, 400)
+        error = response.json()['errors'][0]
+        self.assertEqual(error['extensions']['code'], 'QUERY_TOO_COSTLY')
+        self.assertNotIn('data', response.json())
+
+    @override_settings(GRAPHQL_MAX_QUERY_DEPTH=3)
+    def test_deep_query_is_rejected(self):
+        """
+        Test a query nested deeper than allowed is rejected
+        """
+        response = self.post(employees_query).json()
+        self.assertEqual(response['errors'][0]['extensions']['code'],
+                         'QUERY_TOO_DEEP')
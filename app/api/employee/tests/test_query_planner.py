@@ -0,0 +1,45 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import SubDepartment
+from .base import BaseTest
+from .mocks import nested_employees_query
+
+
+class TestQueryPlanner(BaseTest):
+    """
+    Selection aware query planning tests
+    """
+
+    def create_employees(self, number):
+        references = self.create_references()
+        sub_department = SubDepartment(name="Payables")
+        sub_department.save()
+        references['department'][0].sub_departments.add(sub_department)
+        for index in range(number):
+            self.create_employee(first_name="Jane{}".format(index),
+                                 **references)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.execute(nested_employees_query)
+        self.assertIsNone(response.errors)
+        return response, len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """
+        Test nested relations are loaded in a fixed number of queries
+        """
+        self.create_employees(2)
+        _, few = self.count_queries()
+        self.create_employees(8)
+        response, many = self.count_queries()
+        self.assertEqual(few, many)
+        employee = response.data['employees']['items'][0]
+        self.assertEqual(employee['jobTitle']['titleName'], "Accountant")
+        self.assertEqual(employee['employerName']['employerDetails'],
+                         {'username': "Admin"})
+        self.assertEqual(
+            employee['department'][0]['subDepartments'], [{'name': "Payables"}])
+        self.assertEqual(employee['department'][0]['payGrade'],
+                         {'gradeName': "Senior"})
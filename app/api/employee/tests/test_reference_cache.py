@@ -0,0 +1,84 @@
+from django.test import override_settings
+
+from ...helpers.reference_cache import (
+    get_reference, get_references, reference_cache
+)
+from ..models import Department, Grade
+from .base import BaseTest
+from .mocks import create_employee_mutation
+
+
+class TestReferenceCache(BaseTest):
+    """
+    In process reference row cache tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        reference_cache.clear()
+        self.references = self.create_references()
+        self.grade = self.references['grade']
+
+    def test_rows_are_read_once(self):
+        """
+        Test a cached row is served without a query
+        """
+        with self.assertNumQueries(1):
+            get_reference(self.grade.id, Grade, "Grade")
+        with self.assertNumQueries(0):
+            grade = get_reference(self.grade.id, Grade, "Grade")
+        self.assertEqual(grade.grade_name, "Senior")
+
+    def test_saved_rows_are_dropped(self):
+        """
+        Test a row is read again after it changes
+        """
+        get_reference(self.grade.id, Grade, "Grade")
+        self.grade.grade_name = "Junior"
+        self.grade.save()
+        with self.assertNumQueries(1):
+            grade = get_reference(self.grade.id, Grade, "Grade")
+        self.assertEqual(grade.grade_name, "Junior")
+
+    @override_settings(REFERENCE_CACHE_TTL=0)
+    def test_rows_expire(self):
+        """
+        Test rows are read again once they expire
+        """
+        get_reference(self.grade.id, Grade, "Grade")
+        with self.assertNumQueries(1):
+            get_reference(self.grade.id, Grade, "Grade")
+
+    def test_missing_rows_fail(self):
+        """
+        Test referencing a row that does not exist fails
+        """
+        department = self.references['department'][0]
+        with self.assertRaisesMessage(Exception,
+                                      "Department does not exist"):
+            get_references([department.id, "-missing"], Department,
+                           "Department")
+
+    def test_employee_references_are_cached(self):
+        """
+        Test an employee is created from cached references
+        """
+        department = self.references['department'][0]
+        get_references([department.id], Department, "Department")
+        get_reference(self.grade.id, Grade, "Grade")
+        response = self.client.execute(create_employee_mutation, {
+            "input": {"firstName": "Jane", "lastName": "Doe",
+                      "email": "jane@example.com", "otherNames": "Wanjiku",
+                      "address": "Nairobi", "phoneNumbers": "+254700000000",
+                      "emergencyNumbers": "+254700000001",
+                      "qualifications": "CPA", "period": "M",
+                      "dateOfBirth": "1990-01-01",
+                      "hiringDate": "2020-01-01", "currentSalary": 50000,
+                      "startingSalary": 40000, "status": "F",
+                      "gender": "F", "grade": self.grade.id,
+                      "department": [department.id]}})
+        self.assertIsNone(response.errors)
+        employee = response.data['createEmployee']['employee']
+        self.assertEqual(employee['grade'], {'gradeName': 'Senior'})
+        self.assertEqual(employee['department'],
+                         [{'departmentName': 'Finance'}])
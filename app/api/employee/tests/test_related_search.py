@@ -0,0 +1,39 @@
+from ..models import Department
+from .base import BaseTest
+from .mocks import fuzzy_employees_query, list_employers_query
+
+
+class TestRelatedSearch(BaseTest):
+    """
+    Searching through related rows tests
+    """
+
+    def test_fuzzy_search_matches_each_employee_once(self):
+        """
+        Test an employee in several matching departments is listed once
+        """
+        references = self.create_references()
+        other = Department(department_name="Finance Operations",
+                           pay_grade=references['grade'])
+        other.save()
+        references['department'].append(other)
+        self.create_employee(first_name="Jane", **references)
+        self.create_employee(first_name="Peter")
+        response = self.client.execute(fuzzy_employees_query,
+                                       {"search": "finance"})
+        self.assertIsNone(response.errors)
+        employees = response.data['employees']
+        self.assertEqual(employees['count'], 1)
+        self.assertEqual([item['firstName'] for item in employees['items']],
+                         ["Jane"])
+
+    def test_employer_search_matches_contact_user(self):
+        """
+        Test employers can be searched by the user managing them
+        """
+        self.create_references()
+        response = self.client.execute(list_employers_query,
+                                       {"search": "kiptoo"})
+        self.assertIsNone(response.errors)
+        self.assertEqual(response.data['employers']['items'],
+                         [{"businessName": "Samar Insurance"}])
@@ -0,0 +1,96 @@
+import json
+import unittest
+
+import redis
+from django.test import Client, override_settings
+from graphql_jwt.shortcuts import get_token
+
+from ...helpers.response_cache import (
+    RESPONSE_CACHE_HITS, RESPONSE_CACHE_MISSES
+)
+from ..models import SubDepartment, Title
+from .base import BaseTest
+
+CACHE_URL = 'redis://localhost:6379/15'
+
+titles_query = 'query { titles { count items { titleName } } }'
+departments_query = '''query {
+    departments { items { departmentName subDepartments { name } } } }'''
+update_sub_department_mutation = '''mutation($id: String!) {
+    updateSubDepartment(id: $id, input: {name: "Payables"}) { status } }'''
+
+
+def redis_available():
+    try:
+        return redis.Redis.from_url(CACHE_URL).ping()
+    except redis.RedisError:
+        return False
+
+
+@unittest.skipUnless(redis_available(), 'redis is not running')
+@override_settings(GRAPHQL_RESPONSE_CACHE_URL=CACHE_URL)
+class TestResponseCache(BaseTest):
+    """
+    Reference data response cache tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        redis.Redis.from_url(CACHE_URL).flushdb()
+        self.http = Client(HTTP_AUTHORIZATION='JWT {}'.format(
+            get_token(self.admin)))
+        Title(title_name='Accountant').save()
+
+    def post(self, query, variables=None):
+        return self.http.post('/api/v1/graphql/', json.dumps(
+            {'query': query, 'variables': variables}),
+            content_type='application/json').json()
+
+    def test_reference_reads_are_cached_until_a_change(self):
+        """
+        Test a repeated read is a hit until a title is saved
+        """
+        hits, misses = RESPONSE_CACHE_HITS.value, RESPONSE_CACHE_MISSES.value
+        first = self.post(titles_query)
+        self.assertEqual(self.post(titles_query)['data'], first['data'])
+        self.assertEqual(RESPONSE_CACHE_HITS.value, hits + 1)
+        self.assertEqual(RESPONSE_CACHE_MISSES.value, misses + 1)
+        Title(title_name='Director').save()
+        response = self.post(titles_query)
+        self.assertEqual(response['data']['titles']['count'], 2)
+        self.assertEqual(RESPONSE_CACHE_MISSES.value, misses + 2)
+
+    def test_other_operations_are_not_cached(self):
+        """
+        Test operations outside reference data always run
+        """
+        query = 'query { employees { count } }'
+        hits = RESPONSE_CACHE_HITS.value
+        self.post(query)
+        self.post(query)
+        self.assertEqual(RESPONSE_CACHE_HITS.value, hits)
+
+    def test_anonymous_reads_are_not_served_from_cache(self):
+        """
+        Test a cached response is not sent to anonymous users
+        """
+        self.post(titles_query)
+        response = Client().post(
+            '/api/v1/graphql/', json.dumps({'query': titles_query}),
+            content_type='application/json').json()
+        self.assertIn('errors', response)
+
+    def test_queryset_updates_invalidate(self):
+        """
+        Test sub departments updated without signals are dropped
+        """
+        department = self.create_references()['department'][0]
+        sub_department = SubDepartment(name='Receivables')
+        sub_department.save()
+        department.sub_departments.add(sub_department)
+        self.post(departments_query)
+        self.post(update_sub_department_mutation, {'id': sub_department.id})
+        response = self.post(departments_query)
+        self.assertEqual(
+            response['data']['departments']['items'][0]['subDepartments'],
+            [{'name': 'Payables'}])
@@ -0,0 +1,75 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Payroll
+from .base import BaseTest
+from .mocks import run_payroll_mutation
+
+
+class TestRunPayroll(BaseTest):
+    """
+    Payroll run tests
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.references = self.create_references()
+        fields = {'status': 'F', 'gender': 'F', 'phone_numbers': '',
+                  'emergency_numbers': '', 'qualifications': '',
+                  'period': 'M'}
+        self.salaried = self.create_employee(
+            grade=self.references['grade'], **fields)
+        fields.update(period='W', status='P')
+        self.weekly = self.create_employee(
+            email='john@example.com', per_period=1200, **fields)
+        fields.update(status='L')
+        self.create_employee(email='gone@example.com', **fields)
+
+    def run_payroll(self, period_number=1):
+        return self.client.execute(
+            run_payroll_mutation, variables={'periodNumber': period_number})
+
+    def test_run_payroll(self):
+        """
+        Test the pay of every active employee is computed and saved
+        """
+        response = self.run_payroll()
+        result = response.data['runPayroll']
+        self.assertEqual(result['count'], 2)
+        self.assertEqual(result['totalGross'], 56150 + 5200)
+        self.assertEqual(result['totalDeductions'], 2550)
+        salaried = Payroll.objects.get(employee=self.salaried)
+        self.assertEqual(salaried.employee_gross_salary, 56150)
+        self.assertEqual(salaried.employee_net_salary, 53600)
+        self.assertEqual(salaried.grade, self.references['grade'])
+        self.assertEqual(str(salaried.reimbursment_date), '2021-01-31')
+        weekly = Payroll.objects.get(employee=self.weekly)
+        self.assertEqual(weekly.employee_net_salary, 5200)
+        self.assertIsNone(weekly.grade)
+
+    def test_run_payroll_skips_paid_employees(self):
+        """
+        Test running a period again only pays employees added since
+        """
+        self.run_payroll()
+        self.assertEqual(self.run_payroll().data['runPayroll']['count'], 0)
+        self.create_employee(email='new@example.com', status='F', gender='F',
+                             phone_numbers='', emergency_numbers='',
+                             qualifications='', period='M')
+        self.assertEqual(self.run_payroll().data['runPayroll']['count'], 1)
+        self.assertEqual(self.run_payroll(2).data['runPayroll']['count'], 3)
+
+    def test_run_payroll_query_count_is_constant(self):
+        """
+        Test the queries of a run do not grow with the employees
+        """
+        with CaptureQueriesContext(connection) as first:
+            self.run_payroll(1)
+        for index in range(5):
+            self.create_employee(
+                email='employee{}@example.com'.format(index), status='F',
+                gender='M', phone_numbers='', emergency_numbers='',
+                qualifications='', period='D', per_period=100)
+        with CaptureQueriesContext(connection) as second:
+            self.run_payroll(2)
+        self.assertEqual(len(first), len(second))
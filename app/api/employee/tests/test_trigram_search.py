@@ -0,0 +1,62 @@
+from django.db import connection
+
+from ..models import Title
+from .base import BaseTest
+from .mocks import fuzzy_employees_query, fuzzy_titles_query
+
+
+class TestTrigramSearch(BaseTest):
+    """
+    Fuzzy and substring search tests
+    """
+
+    def test_fuzzy_search_tolerates_typos(self):
+        """
+        Test fuzzy search matches misspelt names
+        """
+        self.create_employee(first_name="Jonathan")
+        self.create_employee(first_name="Peter", email="peter@example.com")
+        response = self.client.execute(fuzzy_employees_query,
+                                       {"search": "Jonathon"})
+        self.assertIsNone(response.errors)
+        items = response.data['employees']['items']
+        self.assertEqual([item['firstName'] for item in items], ["Jonathan"])
+
+    def test_fuzzy_search_matches_substrings(self):
+        """
+        Test fuzzy search matches text in the middle of a column
+        """
+        Title(title_name="Senior Accountant").save()
+        Title(title_name="Driver").save()
+        response = self.client.execute(fuzzy_titles_query,
+                                       {"search": "ccount"})
+        self.assertIsNone(response.errors)
+        self.assertEqual(response.data['titles']['items'],
+                         [{"titleName": "Senior Accountant"}])
+
+    def test_fuzzy_search_invalid_similarity_fails(self):
+        """
+        Test a similarity threshold outside 0 and 1 is rejected
+        """
+        response = self.client.execute(
+            fuzzy_employees_query, {"search": "Jane", "similarity": 2.0})
+        self.assertIsNotNone(response.errors)
+        self.assertIn("similarity", response.errors[0].message)
+
+    def test_similarity_does_not_change_the_connection(self):
+        """
+        Test a lower similarity matches more rows without changing the
+        threshold later queries on the connection use
+        """
+        self.create_employee(first_name="Jonathan")
+        response = self.client.execute(
+            fuzzy_employees_query, {"search": "Jonny", "similarity": 0.1})
+        self.assertIsNone(response.errors)
+        self.assertEqual(len(response.data['employees']['items']), 1)
+        response = self.client.execute(fuzzy_employees_query,
+                                       {"search": "Jonny"})
+        self.assertEqual(response.data['employees']['items'], [])
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting("
+                           "'pg_trgm.similarity_threshold', true)")
+            self.assertIn(cursor.fetchone()[0], [None, '', '0.3'])
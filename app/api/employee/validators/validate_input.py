@@ -2,7 +2,7 @@
 import re
 
 # Local imports
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from graphql import GraphQLError
 
 from ...helpers.constants import (
@@ -15,6 +15,7 @@ from ...helpers.validate_input import (check_email_validity,
                                        check_empty_fields,
                                        check_missing_fields)
 from ...helpers.validation_errors import error_dict
+from ...helpers.reference_cache import get_reference, reference_cache
 from ...helpers.validate_object_id import validate_object_id
 from ..models import (
     Course, Department, Employee,
@@ -22,6 +23,30 @@ from ..models import (
 )
 
 
+# Fields of an employee that reference other rows with the model and the
+# name used in errors
+EMPLOYEE_REFERENCES = (
+    ('grade', Grade, 'Grade'),
+    ('job_title', Title, 'Title'),
+    ('employer_name', Employer, 'Employer'),
+    ('completed_courses', Course, 'Course'),
+)
+DEPARTMENT_REFERENCE = (('department', Department, 'Department'),)
+
+
+def as_list(value):
+    """
+    wraps a single id in a list
+    args:
+        value (str|list): id, ids or None
+    returns:
+        ids (list): ids
+    """
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
 class EmployeeValidations:
     """
     Validations for the employment
@@ -36,6 +61,23 @@ class EmployeeValidations:
         returns:
             input_data(dict):validated data
         """
+        input_data = self.clean_employee_data(kwargs)
+        for field, model, entity in EMPLOYEE_REFERENCES:
+            if input_data[field]:
+                input_data[field] = get_reference(
+                    input_data[field], model, entity)
+
+        return input_data
+
+    def clean_employee_data(self, kwargs):
+        """
+        checks the fields of an employee that do not
+        reference other rows
+        args:
+            kwargs(dict):request data
+        returns:
+            input_data(dict):validated data
+        """
         check_missing_fields(kwargs, EMPLOYEE_REQUIRED_FIELD)
         input_data = {}
         input_data['first_name'] = kwargs.get('first_name', None)
@@ -65,27 +107,71 @@ class EmployeeValidations:
         check_email_validity(
             input_data['email']) if input_data['email'] else ""
 
-        if input_data['grade']:
-            input_data['grade'] = validate_object_id(
-                input_data['grade'], Grade,
-                "Grade")
+        return input_data
 
-        if input_data['job_title']:
-            input_data['job_title'] = validate_object_id(
-                input_data['job_title'], Title,
-                "Title")
-        
-        if input_data['employer_name']:
-            input_data['employer_name'] = validate_object_id(
-                input_data['employer_name'], Employer,
-                "Employer")
+    def validate_employee_rows(self, rows):
+        """
+        validates many employees at once, reading the rows
+        they reference with one query per model
+        args:
+            rows (list): request data of each employee
+        returns:
+            employees (list): index and employee object of each valid row
+            errors (list): index and message of each invalid row
+        """
+        cleaned, errors = [], []
+        for index, row in enumerate(rows):
+            try:
+                cleaned.append((index, self.clean_employee_data(row)))
+            except GraphQLError as error:
+                errors.append((index, error.message))
 
-        if input_data['completed_courses']:
-            input_data['completed_courses'] = validate_object_id(
-                input_data['completed_courses'], Course,
-                "Course")
+        references = {}
+        for field, model, _ in EMPLOYEE_REFERENCES + DEPARTMENT_REFERENCE:
+            ids = {id for _, data in cleaned
+                   for id in as_list(data[field]) if id}
+            references[field] = reference_cache.get_many(model, list(ids))
 
-        return input_data
+        employees = []
+        for index, data in cleaned:
+            try:
+                employees.append(
+                    (index, self.build_employee(data, references)))
+            except GraphQLError as error:
+                errors.append((index, error.message))
+        errors.sort()
+        return employees, errors
+
+    def build_employee(self, data, references):
+        """
+        builds an unsaved employee from its validated data
+        args:
+            data (dict): validated data
+            references (dict): referenced rows keyed by field and id
+        returns:
+            employee (obj): employee object with its departments
+                in the departments attribute
+        """
+        for field, _, entity in EMPLOYEE_REFERENCES + DEPARTMENT_REFERENCE:
+            ids = [id for id in as_list(data[field]) if id]
+            if any(id not in references[field] for id in ids):
+                raise GraphQLError(error_dict['does_not_exist'].format(entity))
+            rows = [references[field][id] for id in ids]
+            data[field] = rows if field == 'department' else (
+                rows[0] if rows else None)
+        departments = data.pop('department')
+        # leave the model defaults of the fields that were not sent
+        employee = Employee(
+            **{key: value for key, value in data.items() if value is not None})
+        try:
+            employee.clean_fields(exclude=[
+                'id', *(field for field, _, _ in EMPLOYEE_REFERENCES)])
+        except ValidationError as error:
+            raise GraphQLError('; '.join(
+                '{}: {}'.format(field, ' '.join(messages))
+                for field, messages in sorted(error.message_dict.items())))
+        employee.departments = departments
+        return employee
 
     def validate_employee_update_data(self, data, employee_id):
         """
@@ -259,7 +345,7 @@ class EmployeeValidations:
         input_data['sub_departments'] = kwargs.get('sub_departments',[])
         input_data['pay_grade']=kwargs.get('pay_grade',None)
         if input_data['pay_grade']:
-            input_data['pay_grade'] = validate_object_id(
+            input_data['pay_grade'] = get_reference(
                 input_data['pay_grade'], Grade,
                 "Grade")
         return input_data
@@ -278,7 +364,7 @@ class EmployeeValidations:
         """
         validate_object_id(department_id,Department,"Department")
         if data['pay_grade']:
-            data['pay_grade'] = validate_object_id(
+            data['pay_grade'] = get_reference(
                 data['pay_grade'], Grade,
                 "Grade")
         data_ = check_empty_fields(data)
@@ -1,3 +1,35 @@
-from django.shortcuts import render
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+from ..helpers.permission_required import admin_request_error
+from ..helpers.validation_errors import error_dict
+from .helpers.export_helpers import (
+    EXPORT_FORMATS, EXPORTS, get_export_formats, stream_export
+)
+
+
+@require_GET
+def export(request, kind):
+    """
+    Streams every employee or payroll row as a CSV or parquet download
+    without holding the table in memory. Only admins and managers
+    authenticated with a JWT may export.
+    Args:
+        request (obj): request object
+        kind (str): employees or payrolls
+    """
+    if kind not in EXPORTS:
+        raise Http404
+    file_format = request.GET.get('format', 'csv')
+    if file_format not in get_export_formats():
+        return HttpResponseBadRequest(error_dict['valid_options'].format(
+            'format', ', '.join(get_export_formats())))
+    error = admin_request_error(request, 'export ' + kind)
+    if error:
+        return error
+    content_type, extension = EXPORT_FORMATS[file_format]
+    response = StreamingHttpResponse(
+        stream_export(kind, file_format), content_type=content_type)
+    response['Content-Disposition'] = 'attachment; filename="{}.{}"'.format(
+        kind, extension)
+    return response
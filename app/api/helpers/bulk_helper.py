@@ -0,0 +1,21 @@
+from .push_id import push_id
+
+BATCH_SIZE = 1000
+
+
+def bulk_create(model, objects, batch_size=BATCH_SIZE):
+    '''
+    Inserts rows in batches giving each of them a push id, which
+    bulk_create does not do as it skips the save method of the models
+    Args:
+        model (obj): model class
+        objects (list): unsaved model objects
+        batch_size (int): rows inserted per statement
+    Return:
+        objects (list): saved model objects
+    '''
+    objects = list(objects)
+    missing = [obj for obj in objects if not obj.id]
+    for obj, id in zip(missing, push_id.next_ids(len(missing))):
+        obj.id = id
+    return model.objects.bulk_create(objects, batch_size=batch_size)
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from functools import partial
+from hashlib import sha256
+from threading import Lock
+
+from graphql.backend.core import GraphQLCoreBackend
+from graphql.execution import ExecutionResult
+from graphql.validation import validate
+
+from .metrics import registry
+from .query_cost import execute_within_budget
+from .response_cache import execute_cached
+
+DOCUMENT_CACHE_HITS = registry.counter(
+    'graphql_document_cache_hits_total',
+    'Requests served a cached parsed and validated document')
+DOCUMENT_CACHE_MISSES = registry.counter(
+    'graphql_document_cache_misses_total',
+    'Requests whose document had to be parsed and validated')
+DOCUMENT_CACHE_EVICTIONS = registry.counter(
+    'graphql_document_cache_evictions_total',
+    'Documents dropped from the cache to stay within its size')
+DOCUMENT_CACHE_SIZE = registry.gauge(
+    'graphql_document_cache_size', 'Documents held in the cache')
+
+
+def invalid_document(errors, *args, **kwargs):
+    '''
+    Stands in for the execution of a document that failed validation
+    Args:
+        errors (list): validation errors
+    Return:
+        result (obj): invalid execution result
+    '''
+    return ExecutionResult(errors=errors, invalid=True)
+
+
+class CachedGraphQLBackend(GraphQLCoreBackend):
+    """
+    GraphQL backend keeping the most recently used documents parsed and
+    validated, keyed by the hash of their query string. A cached document
+    is executed straight away, skipping both parsing and validation, once
+    its estimated cost is found to be within budget, and reference data
+    operations are answered from the response cache. Documents that fail
+    validation are not cached.
+    """
+
+    def __init__(self, max_size=500, executor=None):
+        super().__init__(executor)
+        self.max_size = max_size
+        self.documents = OrderedDict()
+        self.lock = Lock()
+
+    def document_from_string(self, schema, document_string):
+        if not isinstance(document_string, str):
+            return super().document_from_string(schema, document_string)
+        key = (schema, sha256(document_string.encode('utf-8')).hexdigest())
+        with self.lock:
+            document = self.documents.get(key)
+            if document is not None:
+                self.documents.move_to_end(key)
+                DOCUMENT_CACHE_HITS.inc()
+                return document
+        DOCUMENT_CACHE_MISSES.inc()
+        document = super().document_from_string(schema, document_string)
+        errors = validate(schema, document.document_ast)
+        if errors:
+            document.execute = partial(invalid_document, errors)
+            return document
+        document.execute = partial(
+            execute_within_budget, schema, document.document_ast,
+            execute=partial(execute_cached, key[1]), **self.execute_params)
+        with self.lock:
+            self.documents[key] = document
+            while len(self.documents) > self.max_size:
+                self.documents.popitem(last=False)
+                DOCUMENT_CACHE_EVICTIONS.inc()
+            DOCUMENT_CACHE_SIZE.set(len(self.documents))
+        return document
@@ -0,0 +1,174 @@
+import logging
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from graphql import GraphQLEnumType, GraphQLScalarType
+from graphql.type.definition import get_named_type
+
+from .metrics import (
+    DURATION_BUCKETS, QUERY_BUCKETS, ROW_BUCKETS, registry
+)
+
+logger = logging.getLogger(__name__)
+
+RESOLVER_DURATION = registry.histogram(
+    'graphql_resolver_duration_seconds',
+    'Wall time spent in a field resolver', ('path',), DURATION_BUCKETS)
+RESOLVER_QUERIES = registry.histogram(
+    'graphql_resolver_queries', 'SQL queries run by a field resolver',
+    ('path',), QUERY_BUCKETS)
+RESOLVER_ROWS = registry.histogram(
+    'graphql_resolver_rows', 'Rows fetched by a field resolver',
+    ('path',), ROW_BUCKETS)
+OPERATION_DURATION = registry.histogram(
+    'graphql_operation_duration_seconds', 'Wall time of an operation',
+    ('operation',), DURATION_BUCKETS)
+OPERATION_QUERIES = registry.histogram(
+    'graphql_operation_queries', 'SQL queries run by an operation',
+    ('operation',), QUERY_BUCKETS)
+OPERATION_ROWS = registry.histogram(
+    'graphql_operation_rows', 'Rows fetched by an operation',
+    ('operation',), ROW_BUCKETS)
+
+
+class QueryCounter(object):
+    """
+    Database execute wrapper counting the queries run and rows fetched
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        self.queries += 1
+        rowcount = context['cursor'].rowcount
+        if sql.lstrip()[:6].upper() == 'SELECT' and rowcount > 0:
+            self.rows += rowcount
+        return result
+
+
+@contextmanager
+def count_queries():
+    '''
+    Counts the queries run and rows fetched on every database connection
+    of the current thread while the block runs
+    Return:
+        counter (obj): query counter
+    '''
+    counter = QueryCounter()
+    wrappers = [connection.execute_wrapper(counter)
+                for connection in connections.all()]
+    for wrapper in wrappers:
+        wrapper.__enter__()
+    try:
+        yield counter
+    finally:
+        for wrapper in reversed(wrappers):
+            wrapper.__exit__(None, None, None)
+
+
+def is_leaf(info):
+    '''
+    Checks whether a field resolves to a scalar or enum value
+    Args:
+        info (obj): graphql resolve info
+    Return:
+        leaf (bool): True for scalar and enum fields
+    '''
+    return isinstance(get_named_type(info.return_type),
+                      (GraphQLScalarType, GraphQLEnumType))
+
+
+class InstrumentationMiddleware(object):
+    """
+    Graphene middleware recording the wall time, SQL queries and rows
+    fetched of every field resolver that returns objects, labelled with
+    the parent type and field name. Scalar fields are passed straight
+    through to keep the overhead off the hot path. Work deferred to data
+    loaders is accounted to the operation rather than to a resolver.
+    """
+
+    def resolve(self, next, root, info, **args):
+        if root is None and info.operation.name:
+            info.context.graphql_operation_name = info.operation.name.value
+        if is_leaf(info):
+            return next(root, info, **args)
+        path = '{}.{}'.format(info.parent_type.name, info.field_name)
+        with count_queries() as counter:
+            start = perf_counter()
+            try:
+                return next(root, info, **args)
+            finally:
+                RESOLVER_DURATION.observe(perf_counter() - start, path=path)
+                RESOLVER_QUERIES.observe(counter.queries, path=path)
+                RESOLVER_ROWS.observe(counter.rows, path=path)
+
+
+class OperationLabels(object):
+    """
+    Operation names used to label the operation metrics. Clients choose
+    the names of their operations, so the names of registered queries
+    are always used while any other name is only used until the
+    GRAPHQL_OPERATION_LABEL_LIMIT setting is reached. Later names are
+    recorded as 'other' and unnamed operations as 'anonymous'.
+    """
+
+    def __init__(self):
+        self.names = set()
+        self.lock = Lock()
+
+    def get(self, name, registered=False):
+        '''
+        Gets the label an operation is recorded under
+        Args:
+            name (str): operation name, if any
+            registered (bool): whether the operation is a registered query
+        Return:
+            label (str): metric label
+        '''
+        if not name:
+            return 'anonymous'
+        with self.lock:
+            if name in self.names:
+                return name
+            if registered or len(self.names) < \
+                    settings.GRAPHQL_OPERATION_LABEL_LIMIT:
+                self.names.add(name)
+                return name
+        return 'other'
+
+    def clear(self):
+        '''
+        Forgets every name
+        '''
+        with self.lock:
+            self.names.clear()
+
+
+operation_labels = OperationLabels()
+
+
+def record_operation(name, duration, counter, registered=False):
+    '''
+    Records the metrics of a whole operation and logs it when it is
+    slower than the GRAPHQL_SLOW_OPERATION_MS setting
+    Args:
+        name (str): operation name, if any
+        duration (float): wall time in seconds
+        counter (obj): query counter of the operation
+        registered (bool): whether the operation is a registered query
+    '''
+    label = operation_labels.get(name, registered)
+    OPERATION_DURATION.observe(duration, operation=label)
+    OPERATION_QUERIES.observe(counter.queries, operation=label)
+    OPERATION_ROWS.observe(counter.rows, operation=label)
+    threshold = getattr(settings, 'GRAPHQL_SLOW_OPERATION_MS', None)
+    if threshold is not None and duration * 1000 >= float(threshold):
+        logger.warning(
+            'Slow GraphQL operation %s took %.1fms, %d queries, %d rows',
+            name or 'anonymous', duration * 1000, counter.queries, counter.rows)
@@ -0,0 +1,141 @@
+from collections import defaultdict
+
+from django.contrib.auth.models import Group
+from django.db.models import F
+from promise import Promise
+from promise.dataloader import DataLoader
+from rolepermissions.roles import RolesManager
+
+
+class ModelLoader(DataLoader):
+    """
+    Loads the rows of a model by primary key, one query per batch
+    """
+
+    def __init__(self, model):
+        self.model = model
+        super().__init__()
+
+    def batch_load_fn(self, keys):
+        objects = self.model._default_manager.in_bulk(keys)
+        return Promise.resolve([objects.get(key) for key in keys])
+
+
+class ManyToManyLoader(DataLoader):
+    """
+    Loads the related rows of a many to many field for a batch of
+    owners in one query
+    """
+
+    def __init__(self, field):
+        self.field = field
+        super().__init__()
+
+    def batch_load_fn(self, keys):
+        query_name = self.field.related_query_name()
+        related = self.field.related_model._default_manager.filter(
+            **{query_name + '__in': keys}).annotate(
+                _loader_key=F(query_name))
+        objects = defaultdict(list)
+        for obj in related:
+            objects[obj._loader_key].append(obj)
+        return Promise.resolve([objects[key] for key in keys])
+
+
+class RolesLoader(DataLoader):
+    """
+    Loads the role names of a batch of users in one query
+    """
+
+    def batch_load_fn(self, keys):
+        groups = Group.objects.filter(
+            user__in=keys, name__in=RolesManager.get_roles_names()).annotate(
+                _loader_key=F('user')).order_by('name')
+        roles = defaultdict(list)
+        for group in groups:
+            roles[group._loader_key].append(group.name)
+        return Promise.resolve([roles[key] for key in keys])
+
+
+def get_loader(info, key, loader_class, *args):
+    """
+    Gets a loader shared by every resolver of the current request so
+    that sibling rows are batched together
+    Args:
+        info (obj): graphql resolve info
+        key (tuple): loader identity
+        loader_class (obj): loader class
+        args (tuple): loader arguments
+    Return:
+        loader (obj): data loader
+    """
+    loaders = getattr(info.context, 'loaders', None)
+    if loaders is None:
+        loaders = info.context.loaders = {}
+    if key not in loaders:
+        loaders[key] = loader_class(*args)
+    return loaders[key]
+
+
+def clear_loaders(context):
+    """
+    Drops the loaders of a request, e.g. after a mutation has changed
+    rows they may have cached
+    Args:
+        context (obj): graphql context
+    """
+    context.loaders = {}
+
+
+class LoaderMiddleware(object):
+    """
+    Graphene middleware dropping the loaders of a request before each
+    root mutation field, so that operations batched after a mutation in
+    the same request do not read rows cached before it
+    """
+
+    def resolve(self, next, root, info, **args):
+        if root is None and info.operation.operation == 'mutation':
+            clear_loaders(info.context)
+        return next(root, info, **args)
+
+
+def load_related(name):
+    """
+    Creates a resolver for a foreign key or many to many field that
+    reuses rows already joined or prefetched onto the object and
+    otherwise batches the lookup through a request scoped loader
+    Args:
+        name (str): field name
+    Return:
+        resolver (func): graphql resolver
+    """
+    def resolver(root, info, **kwargs):
+        field = root._meta.get_field(name)
+        if field.many_to_many:
+            if name in getattr(root, '_prefetched_objects_cache', {}):
+                return getattr(root, name).all()
+            loader = get_loader(info, ('m2m', field.model._meta.label, name),
+                                ManyToManyLoader, field)
+            return loader.load(root.pk)
+        if field.is_cached(root):
+            return getattr(root, name)
+        value = getattr(root, field.attname)
+        if value is None:
+            return None
+        loader = get_loader(info, ('pk', field.related_model._meta.label),
+                            ModelLoader, field.related_model)
+        return loader.load(value)
+    return resolver
+
+
+def load_roles(root, info, **kwargs):
+    """
+    Resolves the role names of a user through a request scoped loader
+    Args:
+        root (obj): user
+        info (obj): graphql resolve info
+    Return:
+        roles (promise): user roles
+    """
+    return get_loader(info, ('roles',), RolesLoader).load(root.pk)
@@ -0,0 +1,246 @@
+from bisect import bisect_left
+from threading import Lock
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                    2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+
+def escape(value):
+    '''
+    Escapes a label value for the Prometheus text format
+    Args:
+        value (str): label value
+    Return:
+        value (str): escaped label value
+    '''
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace(
+        '"', r'\"')
+
+
+def format_labels(labels):
+    '''
+    Formats label pairs for the Prometheus text format
+    Args:
+        labels (tuple): label name and value pairs
+    Return:
+        labels (str): formatted labels
+    '''
+    return ','.join('{}="{}"'.format(name, escape(value))
+                    for name, value in labels)
+
+
+class Counter(object):
+    """
+    Monotonic counter kept in process memory
+    """
+    kind = 'counter'
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self.value = 0
+        self.lock = Lock()
+
+    def inc(self, amount=1):
+        '''
+        Increments the counter
+        Args:
+            amount (float): increment
+        '''
+        with self.lock:
+            self.value += amount
+
+    def collect(self):
+        '''
+        Renders the metric in the Prometheus text format
+        Return:
+            lines (list): exposition lines
+        '''
+        return ['# HELP {} {}'.format(self.name, self.documentation),
+                '# TYPE {} {}'.format(self.name, self.kind),
+                '{} {}'.format(self.name, self.value)]
+
+    def clear(self):
+        '''
+        Resets the counter
+        '''
+        with self.lock:
+            self.value = 0
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down, kept in process memory
+    """
+    kind = 'gauge'
+
+    def set(self, value):
+        '''
+        Sets the gauge
+        Args:
+            value (float): new value
+        '''
+        with self.lock:
+            self.value = value
+
+
+class Histogram(object):
+    """
+    Cumulative histogram of observations for each set of label values,
+    kept in process memory
+    """
+
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = Lock()
+
+    def observe(self, value, **labels):
+        '''
+        Records an observation
+        Args:
+            value (float): observed value
+            labels (dict): label values
+        '''
+        key = tuple(labels[name] for name in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {
+                    'buckets': [0] * len(self.buckets), 'sum': 0, 'count': 0}
+            if index < len(self.buckets):
+                series['buckets'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def get(self, **labels):
+        '''
+        Gets the count and sum of the observations for label values
+        Args:
+            labels (dict): label values
+        Return:
+            count, sum (tuple): number and total of the observations
+        '''
+        key = tuple(labels[name] for name in self.label_names)
+        series = self.series.get(key, {'sum': 0, 'count': 0})
+        return series['count'], series['sum']
+
+    def collect(self):
+        '''
+        Renders the histogram in the Prometheus text format
+        Return:
+            lines (list): exposition lines
+        '''
+        lines = ['# HELP {} {}'.format(self.name, self.documentation),
+                 '# TYPE {} histogram'.format(self.name)]
+        with self.lock:
+            series = sorted(
+                (key, dict(value, buckets=list(value['buckets'])))
+                for key, value in self.series.items())
+        for key, value in series:
+            labels = tuple(zip(self.label_names, key))
+            total = 0
+            for bound, count in zip(self.buckets, value['buckets']):
+                total += count
+                lines.append('{}_bucket{{{}}} {}'.format(
+                    self.name, format_labels(labels + (('le', bound),)),
+                    total))
+            lines.append('{}_bucket{{{}}} {}'.format(
+                self.name, format_labels(labels + (('le', '+Inf'),)),
+                value['count']))
+            lines.append('{}_sum{{{}}} {}'.format(
+                self.name, format_labels(labels), value['sum']))
+            lines.append('{}_count{{{}}} {}'.format(
+                self.name, format_labels(labels), value['count']))
+        return lines
+
+    def clear(self):
+        '''
+        Drops every observation
+        '''
+        with self.lock:
+            self.series = {}
+
+
+class Registry(object):
+    """
+    The metrics of the process
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = Lock()
+
+    def histogram(self, name, documentation, label_names, buckets):
+        '''
+        Gets a histogram, creating it on first use
+        Args:
+            name (str): metric name
+            documentation (str): metric help text
+            label_names (tuple): label names
+            buckets (tuple): bucket upper bounds
+        Return:
+            histogram (obj): histogram
+        '''
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = Histogram(
+                    name, documentation, label_names, buckets)
+            return self.metrics[name]
+
+    def counter(self, name, documentation):
+        '''
+        Gets a counter, creating it on first use
+        Args:
+            name (str): metric name
+            documentation (str): metric help text
+        Return:
+            counter (obj): counter
+        '''
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = Counter(name, documentation)
+            return self.metrics[name]
+
+    def gauge(self, name, documentation):
+        '''
+        Gets a gauge, creating it on first use
+        Args:
+            name (str): metric name
+            documentation (str): metric help text
+        Return:
+            gauge (obj): gauge
+        '''
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = Gauge(name, documentation)
+            return self.metrics[name]
+
+    def render(self):
+        '''
+        Renders every metric in the Prometheus text format
+        Return:
+            text (str): exposition text
+        '''
+        lines = []
+        for name in sorted(self.metrics):
+            lines += self.metrics[name].collect()
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        '''
+        Drops every observation of every metric
+        '''
+        for metric in self.metrics.values():
+            metric.clear()
+
+
+registry = Registry()
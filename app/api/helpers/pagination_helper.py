@@ -1,7 +1,247 @@
+import base64
+import binascii
+import json
+import math
+from datetime import date, time
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import F, FloatField, OrderBy, Q
+from django.db.models.functions import Cast
+from graphql import GraphQLError
+
+from .validation_errors import error_dict
+
+DEFAULT_PAGE_SIZE = 10
+
+# How the total of a paginated list is worked out. An exact count is as
+# expensive as the page query for searches so lists that only need
+# has_next can skip it or settle for the planner's estimate.
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+
+
+def get_keyset(qs):
+    """
+    Works out the columns the rows of a queryset are ordered by so that
+    they can be paged through by cursor. Ties are broken by the id in
+    the order newest_first() lists ids.
+    Args:
+        qs (obj): queryset
+    Return:
+        keyset (list): expression and descending pairs, or None if the
+            ordering cannot be followed by cursor
+    """
+    id_order = qs.get_id_order() if hasattr(qs, 'get_id_order') \
+        else F('pk')
+    keyset = []
+    for key in qs.query.order_by:
+        if isinstance(key, OrderBy) and key.expression == id_order:
+            return keyset + [(id_order, key.descending)]
+        if not isinstance(key, str):
+            return None
+        name = key.lstrip('-')
+        if name in ('pk', qs.model._meta.pk.name):
+            return keyset + [(F('pk'), key.startswith('-'))]
+        expression = F(name)
+        if name in qs.query.annotations:
+            # ranks and similarities are reals, read back as doubles so
+            # that the values in cursors compare equal to the rows
+            if isinstance(qs.query.annotations[name].output_field,
+                          FloatField):
+                expression = Cast(expression, FloatField())
+        else:
+            try:
+                field = qs.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if field.is_relation:
+                return None
+        keyset.append((expression, key.startswith('-')))
+    if not keyset:
+        return None
+    return keyset + [(id_order, keyset[-1][1])]
+
+
+def apply_keyset(qs, keyset, backwards=False):
+    """
+    Orders a queryset by its keyset, annotating every row with the
+    values of its keys so that cursors can be made from them
+    Args:
+        qs (obj): queryset
+        keyset (list): keyset made by get_keyset
+        backwards (bool): whether to list the rows in reverse
+    Return:
+        qs (obj): ordered queryset
+    """
+    qs = qs.annotate(**{'keyset_{}'.format(index): expression
+                        for index, (expression, _) in enumerate(keyset)})
+    return qs.order_by(*[
+        F('keyset_{}'.format(index)).desc() if descending != backwards
+        else F('keyset_{}'.format(index)).asc()
+        for index, (_, descending) in enumerate(keyset)])
+
+
+def encode_cursor(obj, keyset):
+    """
+    Creates an opaque cursor pointing at an object
+    Args:
+        obj (obj): model object listed by a queryset ordered by
+            apply_keyset
+        keyset (list): keyset of the queryset
+    Return:
+        cursor (str): cursor made from the values of the object's keys
+    """
+    values = [getattr(obj, 'keyset_{}'.format(index))
+              for index in range(len(keyset))]
+    value = json.dumps([
+        value.isoformat() if isinstance(value, (date, time)) else value
+        for value in values])
+    return base64.urlsafe_b64encode(value.encode()).decode()
+
+
+def filter_by_cursor(qs, keyset, cursor, backwards=False):
+    """
+    Keeps the rows of a queryset ordered by apply_keyset that come after
+    the row a cursor points at
+    Args:
+        qs (obj): queryset
+        keyset (list): keyset of the queryset
+        cursor (str): cursor
+        backwards (bool): whether the rows are listed in reverse
+    Raise:
+        raise GraphQLError if the cursor is invalid
+    Return:
+        qs (obj): filtered queryset
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (ValueError, TypeError, binascii.Error):
+        values = None
+    if not isinstance(values, list) or len(values) != len(keyset):
+        raise GraphQLError(error_dict['invalid_input'].format('cursor'))
+    filter, equal = Q(), {}
+    for index, (_, descending) in enumerate(keyset):
+        name = 'keyset_{}'.format(index)
+        lookup = 'lt' if descending != backwards else 'gt'
+        filter |= Q(**equal, **{'{}__{}'.format(name, lookup): values[index]})
+        equal[name] = values[index]
+    try:
+        return qs.filter(filter)
+    except (ValidationError, ValueError, TypeError):
+        raise GraphQLError(error_dict['invalid_input'].format('cursor'))
+
+
+def get_cursors(items, keyset):
+    """
+    Makes the cursors of the first and last items of a page
+    Args:
+        items (list): page items
+        keyset (list): keyset of the queryset or None
+    Return:
+        cursors (dict): next and previous cursors, None when there are
+            no items or the ordering cannot be followed by cursor
+    """
+    if not items or keyset is None:
+        return {'next_cursor': None, 'prev_cursor': None}
+    return {'next_cursor': encode_cursor(items[-1], keyset),
+            'prev_cursor': encode_cursor(items[0], keyset)}
+
+
+def estimate_count(qs):
+    """
+    Reads the number of rows the query planner expects a queryset to
+    return. Unfiltered lists are estimated from the table statistics
+    and filtered ones from the selectivity of their conditions, without
+    scanning any rows.
+    Args:
+        qs (obj): queryset
+    Return:
+        count (int): estimated number of rows
+    """
+    sql, params = qs.order_by().query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def get_count(qs, count_mode):
+    """
+    Counts the rows of a queryset the way the client asked for
+    Args:
+        qs (obj): queryset
+        count_mode (str): exact, estimate or none
+    Raise:
+        raise GraphQLError if the count mode is not supported
+    Return:
+        count (int): number of rows or None when it was not requested
+    """
+    if count_mode not in COUNT_MODES:
+        raise GraphQLError(error_dict['valid_options'].format(
+            'count mode', ', '.join(COUNT_MODES)))
+    if count_mode == COUNT_NONE:
+        return None
+    if count_mode == COUNT_ESTIMATE:
+        return estimate_count(qs)
+    return qs.count()
+
+
+def get_cursor_paginator(qs, count, page_size, paginated_type, keyset,
+                         after=None, before=None, **kwargs):
+    """
+    Function to create keyset pagination. Rows are listed in the order
+    of the queryset and every page starts right after the row its cursor
+    points at, so that newest first lists are a bounded index range scan
+    no matter how deep the page is.
+    Args:
+        qs (obj): queryset
+        count (int): objects count
+        page_size (int): page size
+        paginated_type (obj): graphql object type
+        keyset (list): keyset of the queryset or None
+        after (str): cursor of the last item of the previous page
+        before (str): cursor of the first item of the next page
+    Raise:
+        raise GraphQLError if the queryset cannot be paged by cursor
+    Return:
+       paginated_type (obj): paginated object type
+    """
+    if after and before:
+        raise GraphQLError(error_dict['either_required'].format(
+            'after', 'before'))
+    if keyset is None:
+        raise GraphQLError(error_dict['invalid_input'].format(
+            'page, this list cannot be paged by cursor'))
+    # walk backwards from a before cursor then restore the order
+    qs = apply_keyset(qs, keyset, backwards=bool(before))
+    if after or before:
+        qs = filter_by_cursor(qs, keyset, after or before, bool(before))
+    items = list(qs[:page_size + 1])
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    if before:
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, bool(after)
+    return paginated_type(
+        count=count,
+        has_next=has_next,
+        has_prev=has_prev,
+        items=items,
+        **get_cursors(items, keyset),
+        **kwargs
+    )
 
 
-def get_paginator(qs, count, page_size, page, paginated_type, **kwargs):
+def get_paginator(qs, count, page_size, page, paginated_type, keyset=None,
+                  **kwargs):
     """
     Function to create custom pagination
     Args:
@@ -10,6 +250,7 @@ def get_paginator(qs, count, page_size, page, paginated_type, **kwargs):
         page_size (int): page size
         page (int): page number
         paginated_type (obj): graphql object type
+        keyset (list): keyset the queryset is ordered by, if any
     Return:
        paginated_type (obj): paginated object type
     """
@@ -20,17 +261,86 @@ def get_paginator(qs, count, page_size, page, paginated_type, **kwargs):
         page_obj = p.page(1)
     except EmptyPage:
         page_obj = p.page(p.num_pages)
+    object_list = list(page_obj.object_list)
     return paginated_type(
         count=count,
         page=page_obj.number,
         pages=p.num_pages,
         has_next=page_obj.has_next(),
         has_prev=page_obj.has_previous(),
-        items=page_obj.object_list,
+        items=object_list,
+        **get_cursors(object_list, keyset),
         **kwargs
     )
 
 
-def pagination_helper(items, page, page_size, paginatedType, **kwargs):
-    count = items.count()
-    return get_paginator(items, count, page_size, page, paginatedType, **kwargs)
+def get_uncounted_paginator(qs, count, page_size, page, paginated_type,
+                            keyset=None, **kwargs):
+    """
+    Function to paginate by page number without an exact count. One
+    extra row is fetched to tell whether there is a next page.
+    Args:
+        qs (obj): queryset
+        count (int): estimated objects count or None
+        page_size (int): page size
+        page (int): page number
+        paginated_type (obj): graphql object type
+        keyset (list): keyset the queryset is ordered by, if any
+    Return:
+       paginated_type (obj): paginated object type
+    """
+    page = page if page > 0 else 1
+    offset = (page - 1) * page_size
+    items = list(qs[offset:offset + page_size + 1])
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    if count is not None:
+        # the estimate is exact once the last page is reached and can
+        # never be less than the rows already seen
+        seen = offset + len(items)
+        count = max(count, seen + 1) if has_next else seen
+    return paginated_type(
+        count=count,
+        page=page,
+        pages=math.ceil(count / page_size) if count is not None else None,
+        has_next=has_next,
+        has_prev=page > 1,
+        items=items,
+        **get_cursors(items, keyset),
+        **kwargs
+    )
+
+
+def pagination_helper(items, page, page_size, paginatedType,
+                      after=None, before=None, count_mode=None, **kwargs):
+    """
+    Paginates a queryset. Passing either an after or a before cursor
+    switches from page numbers to keyset pagination, which follows the
+    order of the queryset with ties broken by id. Cursors are only given
+    out for orderings by columns of the rows. The total count can be
+    skipped or estimated through the count mode.
+    Args:
+        items (obj): queryset
+        page (int): page number
+        page_size (int): page size
+        paginatedType (obj): graphql object type
+        after (str): cursor of the last item of the previous page
+        before (str): cursor of the first item of the next page
+        count_mode (str): exact (default), estimate or none
+    Return:
+       paginated_type (obj): paginated object type
+    """
+    page_size = page_size or DEFAULT_PAGE_SIZE
+    count_mode = count_mode or COUNT_EXACT
+    count = get_count(items, count_mode)
+    keyset = get_keyset(items)
+    if after or before:
+        return get_cursor_paginator(items, count, page_size, paginatedType,
+                                    keyset, after, before, **kwargs)
+    if keyset is not None:
+        items = apply_keyset(items, keyset)
+    if count_mode != COUNT_EXACT:
+        return get_uncounted_paginator(items, count, page_size, page or 1,
+                                       paginatedType, keyset, **kwargs)
+    return get_paginator(items, count, page_size, page or 1, paginatedType,
+                         keyset, **kwargs)
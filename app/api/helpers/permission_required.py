@@ -1,10 +1,14 @@
 from functools import wraps
 
+from django.contrib.auth import authenticate
 from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
 from graphql import GraphQLError
+from graphql_jwt.exceptions import JSONWebTokenError
 from rolepermissions.checkers import has_permission, has_role
 
 from .jwt_errors import error_dict
+from .validation_errors import error_dict as validation_errors
 
 
 def permission_required(user, permissions, message):
@@ -70,3 +74,26 @@ def token_required(func):
         return func(*args, **kwargs)
 
     return decorated_function
+
+
+def admin_request_error(request, action):
+    """
+    Checks that a plain HTTP request carries the JWT of an active admin
+    or manager
+    Args:
+        request (obj): request object
+        action (str): what the request does, for the error message
+    Returns:
+        response (obj): 401 or 403 response, or None if permitted
+    """
+    try:
+        user = authenticate(request=request)
+    except JSONWebTokenError as error:
+        return HttpResponse(str(error), status=401)
+    if user is None:
+        return HttpResponse(status=401)
+    if not user.is_active or not any(
+            has_role(user, role) for role in ['admin', 'manager']):
+        return HttpResponse(
+            validation_errors['admin_only'].format(action), status=403)
+    return None
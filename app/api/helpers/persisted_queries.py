@@ -0,0 +1,206 @@
+import json
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from graphql import GraphQLError
+
+from ..models import PersistedQuery
+
+NOT_FOUND = GraphQLError(
+    'PersistedQueryNotFound',
+    extensions={'code': 'PERSISTED_QUERY_NOT_FOUND'})
+NOT_ALLOWED = GraphQLError(
+    'Only persisted queries are allowed',
+    extensions={'code': 'PERSISTED_QUERY_NOT_ALLOWED'})
+HASH_MISMATCH = GraphQLError(
+    'provided sha does not match query',
+    extensions={'code': 'PERSISTED_QUERY_HASH_MISMATCH'})
+
+
+class PersistedQueryCache(object):
+    """
+    Texts of persisted queries kept in process memory by hash so that
+    hash only requests and allowlist checks do not read the registry.
+    Queries registered with the register_queries command are approved,
+    while queries clients persist themselves only live here, are never
+    approved and make way for newer queries like any other entry.
+    Entries are dropped when they are changed or revoked in this process
+    and expire after the GRAPHQL_PERSISTED_QUERY_CACHE_TTL setting so
+    that revocations made by other processes are seen too.
+    """
+
+    def __init__(self):
+        self.queries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, sha256_hash, approved=False):
+        '''
+        Gets the text of a persisted query, reading the registry when it
+        is not cached
+        Args:
+            sha256_hash (str): query hash
+            approved (bool): only return queries registered by the command
+        Return:
+            query (str): query text or None if it is not persisted
+        '''
+        now = monotonic()
+        with self.lock:
+            entry = self.queries.get(sha256_hash)
+            if entry is not None and entry[0] > now and \
+                    (entry[2] or not approved):
+                self.queries.move_to_end(sha256_hash)
+                return entry[1]
+        query = PersistedQuery.objects.filter(
+            sha256_hash=sha256_hash).values_list('query', flat=True).first()
+        if query:
+            self.add(sha256_hash, query)
+        return query
+
+    def add(self, sha256_hash, query, approved=True):
+        '''
+        Keeps the text of a persisted query
+        Args:
+            sha256_hash (str): query hash
+            query (str): query text
+            approved (bool): whether the query was registered by the command
+        '''
+        now = monotonic()
+        with self.lock:
+            entry = self.queries.get(sha256_hash)
+            if not approved and entry is not None and entry[2] and \
+                    entry[0] > now:
+                # a client persisting a registered query does not revoke it
+                self.queries.move_to_end(sha256_hash)
+                return
+            self.queries[sha256_hash] = (
+                now + settings.GRAPHQL_PERSISTED_QUERY_CACHE_TTL, query,
+                approved)
+            self.queries.move_to_end(sha256_hash)
+            while len(self.queries) > settings.GRAPHQL_DOCUMENT_CACHE_SIZE:
+                self.queries.popitem(last=False)
+
+    def invalidate(self, sha256_hash):
+        '''
+        Drops a query that has changed or been revoked
+        Args:
+            sha256_hash (str): query hash
+        '''
+        with self.lock:
+            self.queries.pop(sha256_hash, None)
+
+    def clear(self):
+        '''
+        Drops every query
+        '''
+        with self.lock:
+            self.queries.clear()
+
+
+persisted_query_cache = PersistedQueryCache()
+
+
+@receiver(post_save, sender=PersistedQuery)
+@receiver(post_delete, sender=PersistedQuery)
+def invalidate_persisted_query(sender, instance, **kwargs):
+    """
+    Drop a registry entry from the cache whenever it is saved or deleted
+    """
+    persisted_query_cache.invalidate(instance.sha256_hash)
+
+
+def get_query_hash(query):
+    '''
+    Hashes a query the way persisted query clients do
+    Args:
+        query (str): query text
+    Return:
+        hash (str): hex SHA-256 of the query
+    '''
+    return sha256(query.encode('utf-8')).hexdigest()
+
+
+def get_requested_hash(request, data):
+    '''
+    Reads the hash of a persisted query request from the
+    extensions.persistedQuery.sha256Hash parameter
+    Args:
+        request (obj): request object
+        data (dict): request body
+    Return:
+        hash (str): requested hash or None
+    '''
+    extensions = request.GET.get('extensions') or data.get('extensions')
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    persisted_query = (extensions or {}).get('persistedQuery') or {}
+    return persisted_query.get('sha256Hash')
+
+
+def allowlist_only():
+    '''
+    Checks whether only registered queries may run
+    Return:
+        allowlist_only (bool): True when arbitrary queries are rejected
+    '''
+    return getattr(settings, 'GRAPHQL_PERSISTED_QUERIES_ONLY', False)
+
+
+def resolve_persisted_query(query, sha256_hash):
+    '''
+    Works out the query text a request runs
+    Args:
+        query (str): query text sent, if any
+        sha256_hash (str): persisted query hash sent, if any
+    Return:
+        query, error (tuple): query text to run or the error to reply with
+    '''
+    if not query and not sha256_hash:
+        return query, None
+    if not query:
+        persisted = persisted_query_cache.get(
+            sha256_hash, approved=allowlist_only())
+        return (persisted, None) if persisted else (None, NOT_FOUND)
+    query_hash = get_query_hash(query)
+    if sha256_hash and sha256_hash != query_hash:
+        return None, HASH_MISMATCH
+    if allowlist_only() and \
+            not persisted_query_cache.get(query_hash, approved=True):
+        return None, NOT_ALLOWED
+    return query, None
+
+
+def remember_persisted_query(query):
+    '''
+    Keeps a query a client has persisted in process memory only, so that
+    anonymous clients can neither grow the registry nor get their
+    queries approved
+    Args:
+        query (str): query text
+    '''
+    persisted_query_cache.add(get_query_hash(query), query, approved=False)
+
+
+def register_persisted_query(query):
+    '''
+    Adds a query that has been validated to the registry, approving it
+    to run in allowlist mode
+    Args:
+        query (str): query text
+    Return:
+        persisted_query (obj): registry entry
+    '''
+    # a revoked entry stays revoked rather than clashing with the new one
+    persisted_query, _ = PersistedQuery.objects.all_with_deleted().get_or_create(
+        sha256_hash=get_query_hash(query), defaults={'query': query})
+    if persisted_query.deleted_at is None:
+        persisted_query_cache.add(persisted_query.sha256_hash,
+                                  persisted_query.query)
+    return persisted_query
@@ -1,7 +1,12 @@
-from random import random
+import os
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from threading import Lock
 from time import time
+from uuid import UUID
 
 import numpy
+from django.utils import timezone
 
 
 class PushID(object):
@@ -17,14 +22,39 @@ class PushID(object):
        in the same timestamp, the latter ones will sort after the former ones.
        We do this by using the previous random bits but "incrementing" them by
        1 (only in the case of a timestamp collision).
+
+    Ids only increase across the pushes of one generator, so the process
+    shares the push_id instance below. Its pushes are serialized with a
+    lock, which gevent patches into a greenlet lock, and the timestamp
+    never goes back even if the system clock does.
     """
 
     # Modeled after base64 web-safe chars, but ordered by ASCII.
     PUSH_CHARS = ('-0123456789'
                   'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
                   '_abcdefghijklmnopqrstuvwxyz')
+    # ASCII codes of the characters, indexed by their 6-bit values.
+    PUSH_CODES = numpy.frombuffer(PUSH_CHARS.encode('ascii'), dtype=numpy.uint8)
+    # Number of distinct 72-bit random parts.
+    RAND_RANGE = 64 ** 12
+    # The random part is split into its 2 high and 10 low characters so
+    # that both halves fit into 64-bit integers.
+    LOW_BITS = 60
+    LOW_SHIFTS = numpy.arange(54, -1, -6, dtype=numpy.uint64)
+    HIGH_SHIFTS = numpy.array([6, 0], dtype=numpy.uint64)
 
     def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forgets the last push and reseeds the random characters.
+
+        Called in forked children, which would otherwise repeat the
+        random characters of their parent, and hold the lock if another
+        thread of the parent did when it forked.
+        """
+        self.lock = Lock()
+        self.random = numpy.random.RandomState()
 
         # Timestamp of last push, used to prevent local collisions if you
         # pushtwice in one ms.
@@ -44,19 +74,105 @@ class PushID(object):
             unique_id (string): String of length 12.
         """
 
-        now = int(time() * 1000)
-        duplicate_time = (now == self.last_push_time)
-        self.last_push_time = now
+        with self.lock:
+            now = self.get_push_time()
+            duplicate_time = (now == self.last_push_time)
+            if duplicate_time and (self.last_rand_chars == 63).all():
+                # The random characters would wrap around, so move on
+                # to the next timestamp rather than break the ordering.
+                now += 1
+                duplicate_time = False
+            self.last_push_time = now
 
-        unique_id = self.get_unique_id(now)
+            unique_id = self.get_unique_id(now)
 
-        self.set_last_rand_char(duplicate_time)
+            self.set_last_rand_char(duplicate_time)
 
-        for i in range(12):
-            unique_id += self.PUSH_CHARS[self.last_rand_chars[i]]
+            for i in range(12):
+                unique_id += self.PUSH_CHARS[self.last_rand_chars[i]]
 
         return unique_id
 
+    def next_ids(self, count):
+        """Generates many unique ids at once.
+
+        The ids of a batch share the timestamp of the call and their
+        random parts follow each other, as the ids of pushes made within
+        the same millisecond do. The random parts are added up and
+        encoded for the whole batch with numpy array operations.
+
+        Args:
+            count (int): Number of ids to generate.
+        Returns:
+            unique_ids (list): Increasing strings of length 20.
+        """
+        if count <= 0:
+            return []
+
+        with self.lock:
+            now = self.get_push_time()
+            start = None
+            if now == self.last_push_time:
+                start = self.get_rand_value(self.last_rand_chars) + 1
+                if start + count > self.RAND_RANGE:
+                    # The random part would wrap around, so move on to
+                    # the next timestamp rather than break the ordering.
+                    now += 1
+                    start = None
+            if start is None:
+                start = self.get_rand_value(self.random.randint(0, 64, 12))
+                # Leave room for the whole batch below the largest value.
+                start = min(start, self.RAND_RANGE - count)
+            self.last_push_time = now
+            rand_chars = self.get_rand_chars(start, count)
+            self.last_rand_chars = rand_chars[-1].astype(int)
+
+        codes = numpy.empty((count, 20), dtype=numpy.uint8)
+        codes[:, :8] = numpy.frombuffer(
+            self.get_unique_id(now).encode('ascii'), dtype=numpy.uint8)
+        codes[:, 8:] = self.PUSH_CODES[rand_chars]
+        text = codes.tobytes().decode('ascii')
+        return [text[i:i + 20] for i in range(0, count * 20, 20)]
+
+    def get_push_time(self):
+        """Gets the timestamp of a push, which is never before the last.
+
+        Returns:
+            now (int): Milliseconds since the epoch.
+        """
+        return max(int(time() * 1000), self.last_push_time)
+
+    def get_rand_chars(self, start, count):
+        """Encodes consecutive random parts into characters.
+
+        Args:
+            start (int): First random part.
+            count (int): Number of random parts.
+        Returns:
+            rand_chars (array): Character values, 12 per random part.
+        """
+        high, low = divmod(start, 1 << self.LOW_BITS)
+        lows = numpy.arange(count, dtype=numpy.uint64) + numpy.uint64(low)
+        highs = (lows >> numpy.uint64(self.LOW_BITS)) + numpy.uint64(high)
+        lows &= numpy.uint64((1 << self.LOW_BITS) - 1)
+        return numpy.concatenate([
+            (highs[:, None] >> self.HIGH_SHIFTS) & numpy.uint64(63),
+            (lows[:, None] >> self.LOW_SHIFTS) & numpy.uint64(63),
+        ], axis=1).astype(numpy.intp)
+
+    def get_rand_value(self, rand_chars):
+        """Converts random characters into the number they encode.
+
+        Args:
+            rand_chars (array): 12 character values between 0 and 63.
+        Returns:
+            value (int): Number between 0 and 64 ** 12.
+        """
+        value = 0
+        for char in rand_chars:
+            value = value * 64 + int(char)
+        return value
+
     def get_unique_id(self, now):
         """Creates a unique id which is of length 8.
 
@@ -82,10 +198,9 @@ class PushID(object):
             duplicate_time (bool): Boolean value if time is duplicate.
         """
         if not duplicate_time:
-            for i in range(12):
-                # random() returns a floating point number in the
-                # range(0.0, 1.0)
-                self.last_rand_chars[i] = int(random() * 64)
+            # drawn from the generator's own state, which forked
+            # children reseed
+            self.last_rand_chars = self.random.randint(0, 64, 12)
         else:
             # If the timestamp hasn't changed since last push, use the
             # same random number, except incremented by 1.
@@ -100,3 +215,79 @@ class PushID(object):
             else:
                 break
         self.last_rand_chars[i] += 1
+
+
+# The generator shared by the process
+push_id = PushID()
+os.register_at_fork(after_in_child=push_id.reset)
+
+
+def get_id_bound(moment):
+    """Gets the smallest id that can be pushed at a moment.
+
+    Ids pushed before the moment sort before it and the others do not,
+    so time ranges turn into id ranges. Bounds are precise to the
+    millisecond and compare as plain ASCII strings.
+
+    Args:
+        moment (datetime): Aware, or naive in the default time zone.
+    Returns:
+        bound (string): String of length 8.
+    """
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return push_id.get_unique_id(int(moment.timestamp() * 1000))
+
+
+def get_id_time(unique_id):
+    """Reads the moment an id was pushed at.
+
+    Args:
+        unique_id (string): Push id.
+    Returns:
+        moment (datetime): Aware datetime in UTC.
+    """
+    now = 0
+    for char in unique_id[:8]:
+        now = now * 64 + PushID.PUSH_CHARS.index(char)
+    return datetime.fromtimestamp(now / 1000, tz=timezone.utc)
+
+
+# Push id characters mapped to the url safe base64 characters of the same
+# 6-bit values, and back
+TO_BASE64 = str.maketrans(
+    PushID.PUSH_CHARS,
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_')
+FROM_BASE64 = {value: key for key, value in TO_BASE64.items()}
+
+
+def push_id_to_uuid(unique_id):
+    """Packs a push id into a UUID.
+
+    The 20 characters of 6 bits make up the last 15 bytes of the UUID so
+    that UUIDs sort in the same order as the ids they pack.
+
+    Args:
+        unique_id (string): Push id.
+    Raises:
+        ValueError: If the id is not a push id.
+    Returns:
+        value (UUID): Packed id.
+    """
+    if not isinstance(unique_id, str) or len(unique_id) != 20 or \
+            unique_id.strip(PushID.PUSH_CHARS):
+        raise ValueError('{!r} is not a push id'.format(unique_id))
+    return UUID(bytes=b'\0' + urlsafe_b64decode(
+        unique_id.translate(TO_BASE64)))
+
+
+def uuid_to_push_id(value):
+    """Unpacks a push id from a UUID made by push_id_to_uuid.
+
+    Args:
+        value (UUID): Packed id.
+    Returns:
+        unique_id (string): Push id.
+    """
+    return urlsafe_b64encode(value.bytes[1:]).decode('ascii').translate(
+        FROM_BASE64)
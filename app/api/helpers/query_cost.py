@@ -0,0 +1,233 @@
+from django.conf import settings
+from graphql import GraphQLError, GraphQLList, GraphQLNonNull
+from graphql.execution import ExecutionResult, execute
+from graphql.language.ast import (
+    FragmentDefinition, FragmentSpread, InlineFragment, IntValue,
+    OperationDefinition, Variable
+)
+from graphql.type.definition import get_named_type
+
+from .pagination_helper import DEFAULT_PAGE_SIZE
+from .validation_errors import error_dict
+
+# Rows assumed for list fields that take no limit, e.g. the departments
+# of an employee
+DEFAULT_LIST_SIZE = 10
+
+
+def get_operation(document_ast, operation_name=None):
+    '''
+    Finds the operation of a document that a request runs
+    Args:
+        document_ast (obj): document ast node
+        operation_name (str): name of the operation to run
+    Return:
+        operation, fragments (tuple): operation ast node, or None, and
+            the fragment definitions by name
+    '''
+    operations, fragments = [], {}
+    for definition in document_ast.definitions:
+        if isinstance(definition, OperationDefinition):
+            operations.append(definition)
+        elif isinstance(definition, FragmentDefinition):
+            fragments[definition.name.value] = definition
+    if operation_name:
+        operations = [operation for operation in operations
+                      if operation.name and
+                      operation.name.value == operation_name]
+    return (operations[0] if len(operations) == 1 else None), fragments
+
+
+def get_int_argument(field, name, variables):
+    '''
+    Reads an integer argument of a field, resolving variables
+    Args:
+        field (obj): field ast node
+        name (str): argument name
+        variables (dict): request variables
+    Return:
+        value (int): argument value or None
+    '''
+    for argument in field.arguments or []:
+        if argument.name.value != name:
+            continue
+        if isinstance(argument.value, Variable):
+            value = variables.get(argument.value.name.value)
+        elif isinstance(argument.value, IntValue):
+            value = argument.value.value
+        else:
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def is_list(field_type):
+    '''
+    Checks whether a field returns a list
+    Args:
+        field_type (obj): graphql field type
+    Return:
+        is_list (bool): True for list fields
+    '''
+    if isinstance(field_type, GraphQLNonNull):
+        field_type = field_type.of_type
+    return isinstance(field_type, GraphQLList)
+
+
+def get_fields(schema, parent_type, selection_set, fragments):
+    '''
+    Flattens a selection set, expanding fragments, into its fields with
+    the type each of them is selected on
+    Args:
+        schema (obj): graphql schema
+        parent_type (obj): type the selection set is made on
+        selection_set (obj): selection set ast node
+        fragments (dict): fragment definitions by name
+    Return:
+        fields (list): field ast node and parent type pairs
+    '''
+    fields = []
+    for selection in selection_set.selections:
+        if isinstance(selection, FragmentSpread):
+            fragment = fragments.get(selection.name.value)
+            if fragment is not None:
+                fields += get_fields(
+                    schema, schema.get_type(fragment.type_condition.name.value),
+                    fragment.selection_set, fragments)
+        elif isinstance(selection, InlineFragment):
+            fragment_type = parent_type
+            if selection.type_condition:
+                fragment_type = schema.get_type(
+                    selection.type_condition.name.value)
+            fields += get_fields(schema, fragment_type,
+                                 selection.selection_set, fragments)
+        else:
+            fields.append((selection, parent_type))
+    return fields
+
+
+def selection_cost(schema, parent_type, selection_set, fragments, variables,
+                   multiplier=1, page_size=None, depth=1):
+    '''
+    Estimates the fields resolved for a selection set. Every field costs
+    the number of times it is resolved, that is the rows of each list
+    above it, taken from the limit of paginated fields or assumed for
+    other lists.
+    Args:
+        schema (obj): graphql schema
+        parent_type (obj): type the selection set is made on
+        selection_set (obj): selection set ast node
+        fragments (dict): fragment definitions by name
+        variables (dict): request variables
+        multiplier (int): times each field of the selection set resolves
+        page_size (int): limit of the paginated field above, if any
+        depth (int): nesting depth of the selection set
+    Return:
+        cost, depth (tuple): estimated cost and deepest nesting
+    '''
+    cost, max_depth = 0, depth
+    for field, field_parent in get_fields(
+            schema, parent_type, selection_set, fragments):
+        name = field.name.value
+        definition = getattr(field_parent, 'fields', {}).get(name)
+        # introspection is bounded by the size of the schema
+        if name.startswith('__') or definition is None:
+            continue
+        cost += multiplier
+        if not field.selection_set:
+            continue
+        child_multiplier, child_page_size = multiplier, page_size
+        if 'limit' in definition.args:
+            child_page_size = get_int_argument(field, 'limit', variables) \
+                or DEFAULT_PAGE_SIZE
+        if is_list(definition.type):
+            child_multiplier *= max(page_size or DEFAULT_LIST_SIZE, 0)
+            child_page_size = None
+        child_cost, child_depth = selection_cost(
+            schema, get_named_type(definition.type), field.selection_set,
+            fragments, variables, child_multiplier, child_page_size,
+            depth + 1)
+        cost += child_cost
+        max_depth = max(max_depth, child_depth)
+    return cost, max_depth
+
+
+def analyze_query_cost(schema, document_ast, variables=None,
+                       operation_name=None):
+    '''
+    Statically estimates the cost and depth of an operation before it is
+    executed
+    Args:
+        schema (obj): graphql schema
+        document_ast (obj): validated document ast node
+        variables (dict): request variables
+        operation_name (str): name of the operation to run
+    Return:
+        cost, depth (tuple): estimated cost and deepest nesting
+    '''
+    operation, fragments = get_operation(document_ast, operation_name)
+    if operation is None:
+        return 0, 0
+    root_type = {
+        'query': schema.get_query_type,
+        'mutation': schema.get_mutation_type,
+        'subscription': schema.get_subscription_type,
+    }[operation.operation]()
+    if root_type is None:
+        return 0, 0
+    return selection_cost(schema, root_type, operation.selection_set,
+                          fragments, variables or {})
+
+
+def check_query_cost(cost, depth):
+    '''
+    Checks an operation against the GRAPHQL_MAX_QUERY_COST and
+    GRAPHQL_MAX_QUERY_DEPTH settings
+    Args:
+        cost (int): estimated cost
+        depth (int): deepest nesting
+    Return:
+        error (obj): GraphQLError when over budget or None
+    '''
+    max_cost = getattr(settings, 'GRAPHQL_MAX_QUERY_COST', None)
+    max_depth = getattr(settings, 'GRAPHQL_MAX_QUERY_DEPTH', None)
+    if max_depth is not None and depth > max_depth:
+        return GraphQLError(
+            error_dict['query_too_deep'].format(depth, max_depth),
+            extensions={'code': 'QUERY_TOO_DEEP'})
+    if max_cost is not None and cost > max_cost:
+        return GraphQLError(
+            error_dict['query_too_costly'].format(cost, max_cost),
+            extensions={'code': 'QUERY_TOO_COSTLY'})
+    return None
+
+
+def execute_within_budget(schema, document_ast, execute=execute, **options):
+    '''
+    Executes an operation unless its estimated cost or depth is over
+    budget, reporting the cost in the result extensions
+    Args:
+        schema (obj): graphql schema
+        document_ast (obj): validated document ast node
+        execute (func): executes the operation once it is within budget
+        options (dict): execute keyword arguments
+    Return:
+        result (obj): execution result
+    '''
+    cost, depth = analyze_query_cost(
+        schema, document_ast, options.get('variable_values'),
+        options.get('operation_name'))
+    extensions = {'cost': {
+        'requested': cost, 'depth': depth,
+        'maximum': getattr(settings, 'GRAPHQL_MAX_QUERY_COST', None)}}
+    error = check_query_cost(cost, depth)
+    if error:
+        return ExecutionResult(errors=[error], invalid=True,
+                               extensions=extensions)
+    result = execute(schema, document_ast, **options)
+    if isinstance(result, ExecutionResult):
+        result.extensions.update(extensions)
+    return result
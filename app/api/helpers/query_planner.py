@@ -0,0 +1,185 @@
+from django.db.models import Prefetch
+from graphene.utils.str_converters import to_snake_case
+from graphql.language.ast import FragmentSpread, InlineFragment
+
+
+def get_selections(info, selection_set):
+    """
+    Flattens a selection set, expanding fragments, into the fields it
+    selects
+    Args:
+        info (obj): graphql resolve info
+        selection_set (obj): selection set ast node
+    Return:
+        fields (list): field ast nodes
+    """
+    fields = []
+    if not selection_set:
+        return fields
+    for selection in selection_set.selections:
+        if isinstance(selection, FragmentSpread):
+            fragment = info.fragments[selection.name.value]
+            fields += get_selections(info, fragment.selection_set)
+        elif isinstance(selection, InlineFragment):
+            fields += get_selections(info, selection.selection_set)
+        else:
+            fields.append(selection)
+    return fields
+
+
+def get_selected_fields(info, path=None):
+    """
+    Collects what the query selects below the field being resolved
+    Args:
+        info (obj): graphql resolve info
+        path (str): name of a nested field to start from e.g. items
+    Return:
+        selections (dict): selected names mapped to their own selections
+    """
+    nodes = info.field_asts
+    if path:
+        nodes = [node for field_ast in nodes
+                 for node in get_selections(info, field_ast.selection_set)
+                 if node.name.value == path]
+    return merge_selections(info, nodes)
+
+
+def merge_selections(info, nodes):
+    """
+    Merges the selections of several ast nodes of the same field
+    Args:
+        info (obj): graphql resolve info
+        nodes (list): field ast nodes
+    Return:
+        selections (dict): selected names mapped to their ast nodes
+    """
+    selections = {}
+    for node in nodes:
+        for field in get_selections(info, node.selection_set):
+            selections.setdefault(field.name.value, []).append(field)
+    return selections
+
+
+def get_model_fields(model):
+    """
+    Maps the names graphene exposes a model's fields under to the fields
+    Args:
+        model (obj): model class
+    Return:
+        fields (dict): field name or reverse accessor mapped to the field
+    """
+    fields = {}
+    for field in model._meta.get_fields():
+        if field.auto_created and not field.concrete:
+            fields[field.get_accessor_name()] = field
+        else:
+            fields[field.name] = field
+    return fields
+
+
+def plan(info, model, selections, prefix=''):
+    """
+    Works out the columns, joins and prefetches the selections need
+    Args:
+        info (obj): graphql resolve info
+        model (obj): model class the selections are made on
+        selections (dict): selected names mapped to their ast nodes
+        prefix (str): lookup path of the model from the queryset's model
+    Return:
+        only, select_related, prefetches (tuple): column lookups or None
+        when a selection is not backed by a column, relations to join
+        and Prefetch objects
+    """
+    model_fields = get_model_fields(model)
+    # pagination cursors are built from the creation time and id
+    only = {prefix + model._meta.pk.name}
+    if 'created_at' in model_fields:
+        only.add(prefix + 'created_at')
+    select_related, prefetches = [], []
+    for name, nodes in selections.items():
+        if name.startswith('__'):
+            continue
+        field = model_fields.get(to_snake_case(name))
+        if field is None:
+            # a custom resolver may read any column
+            only = None
+            continue
+        lookup = prefix + field.name
+        if not field.is_relation:
+            if only is not None:
+                only.add(prefix + field.attname)
+            continue
+        related_selections = merge_selections(info, nodes)
+        if field.many_to_one or field.one_to_one and field.concrete:
+            select_related.append(lookup)
+            related_only, related_joins, related_prefetches = plan(
+                info, field.related_model, related_selections,
+                lookup + '__')
+            if only is not None:
+                only.add(lookup)
+                only = only | related_only if related_only else None
+            select_related += related_joins
+            prefetches += related_prefetches
+        else:
+            accessor = field.name if field.concrete else \
+                field.get_accessor_name()
+            queryset = optimize_related_queryset(
+                info, field, related_selections)
+            prefetches.append(Prefetch(prefix + accessor, queryset=queryset))
+    return only, select_related, prefetches
+
+
+def optimize_related_queryset(info, field, selections):
+    """
+    Builds the queryset a many valued relation is prefetched with
+    Args:
+        info (obj): graphql resolve info
+        field (obj): many to many field or reverse relation
+        selections (dict): selected names mapped to their ast nodes
+    Return:
+        queryset (obj): queryset of the related model
+    """
+    model = field.related_model
+    only, select_related, prefetches = plan(info, model, selections)
+    queryset = model._default_manager.all()
+    if only is not None and field.one_to_many:
+        # the rows are matched to their parents on the foreign key
+        only.add(field.field.attname)
+    return apply_plan(queryset, only, select_related, prefetches)
+
+
+def apply_plan(queryset, only, select_related, prefetches):
+    """
+    Applies a plan to a queryset
+    Args:
+        queryset (obj): queryset
+        only (set): columns to load or None to load every column
+        select_related (list): relations to join
+        prefetches (list): Prefetch objects
+    Return:
+        queryset (obj): optimized queryset
+    """
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    if only is not None:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+def optimize_queryset(queryset, info, path=None):
+    """
+    Loads everything a query selects from a queryset up front so that
+    resolving the results takes a bounded number of queries however
+    deeply the relations are nested. Foreign keys are joined, many valued
+    relations are prefetched and only the selected columns are read.
+    Args:
+        queryset (obj): queryset being resolved
+        info (obj): graphql resolve info
+        path (str): name of the field the rows are listed under e.g. items
+    Return:
+        queryset (obj): optimized queryset
+    """
+    selections = get_selected_fields(info, path)
+    return apply_plan(queryset, *plan(info, queryset.model, selections))
@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from copy import copy
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from graphql import GraphQLError
+
+from .metrics import registry
+from .validation_errors import error_dict
+
+REFERENCE_CACHE_HITS = registry.counter(
+    'reference_cache_hits_total', 'Reference rows found in process memory')
+REFERENCE_CACHE_MISSES = registry.counter(
+    'reference_cache_misses_total',
+    'Reference rows that had to be read from the database')
+
+
+class ReferenceCache(object):
+    """
+    Rows of small, rarely changing tables kept in process memory by
+    primary key. Rows are dropped when they are saved or deleted in this
+    process and expire after the REFERENCE_CACHE_TTL setting so that
+    changes made by other processes are seen too.
+    """
+
+    def __init__(self):
+        self.rows = OrderedDict()
+        self.lock = Lock()
+
+    def get_many(self, model, ids):
+        '''
+        Gets rows by primary key, reading the ones not cached in a single
+        query
+        Args:
+            model (obj): model class
+            ids (list): primary keys
+        Return:
+            rows (dict): copies of the rows found keyed by primary key
+        '''
+        label = model._meta.label_lower
+        now = monotonic()
+        found, missing = {}, []
+        with self.lock:
+            for pk in ids:
+                row = self.rows.get((label, pk))
+                if row is not None and row[0] > now:
+                    self.rows.move_to_end((label, pk))
+                    found[pk] = row[1]
+                else:
+                    missing.append(pk)
+        REFERENCE_CACHE_HITS.inc(len(found))
+        if missing:
+            REFERENCE_CACHE_MISSES.inc(len(missing))
+            expires = now + settings.REFERENCE_CACHE_TTL
+            rows = list(model.objects.filter(id__in=missing))
+            with self.lock:
+                for row in rows:
+                    self.rows[(label, row.pk)] = (expires, row)
+                    found[row.pk] = row
+                while len(self.rows) > settings.REFERENCE_CACHE_SIZE:
+                    self.rows.popitem(last=False)
+        # callers may change the rows they are given
+        return {pk: copy(row) for pk, row in found.items()}
+
+    def invalidate(self, model, pk):
+        '''
+        Drops a row that has changed
+        Args:
+            model (obj): model class
+            pk (str): primary key
+        '''
+        with self.lock:
+            self.rows.pop((model._meta.label_lower, pk), None)
+
+    def clear(self):
+        '''
+        Drops every row
+        '''
+        with self.lock:
+            self.rows.clear()
+
+
+reference_cache = ReferenceCache()
+
+
+def get_reference(id, model, entity):
+    '''
+    Checks that a referenced row exists, reading it from the reference
+    cache
+    Args:
+        id (str): object id
+        model (obj): model class
+        entity (str): entity name
+    Raise:
+        raise GraphQLError if the object does not exist
+    Return:
+        obj (obj): model object
+    '''
+    return get_references([id], model, entity)[0]
+
+
+def get_references(ids, model, entity):
+    '''
+    Checks that referenced rows exist, reading them from the reference
+    cache
+    Args:
+        ids (list): object ids
+        model (obj): model class
+        entity (str): entity name
+    Raise:
+        raise GraphQLError if any of the objects does not exist
+    Return:
+        objs (list): model objects in the order of the ids
+    '''
+    if not all(ids):
+        raise GraphQLError(error_dict['empty_field'].format('id field'))
+    rows = reference_cache.get_many(model, ids)
+    if len(rows) < len(set(ids)):
+        raise GraphQLError(error_dict['does_not_exist'].format(entity))
+    return [rows[id] for id in ids]
@@ -0,0 +1,217 @@
+import json
+import logging
+from hashlib import sha256
+
+import redis
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import transaction
+from graphql.execution import ExecutionResult, execute
+from graphql.type.definition import get_named_type
+from rolepermissions.roles import RolesManager
+
+from .metrics import registry
+from .query_cost import get_fields, get_operation
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_HITS = registry.counter(
+    'graphql_response_cache_hits_total',
+    'Operations answered from the response cache')
+RESPONSE_CACHE_MISSES = registry.counter(
+    'graphql_response_cache_misses_total',
+    'Cacheable operations that had to be executed')
+
+# Root fields of reference data that is read far more often than it is
+# written. Operations selecting only these fields are cached.
+CACHEABLE_FIELDS = frozenset([
+    'course', 'courses', 'department', 'departments', 'employer',
+    'employers', 'grade', 'grades', 'title', 'titles',
+])
+KEY_PREFIX = 'graphql:response:'
+VERSION_PREFIX = 'graphql:version:'
+
+clients = {}
+
+
+def get_client():
+    '''
+    Gets the redis client of the GRAPHQL_RESPONSE_CACHE_URL setting
+    Return:
+        client (obj): redis client or None when caching is turned off
+    '''
+    url = getattr(settings, 'GRAPHQL_RESPONSE_CACHE_URL', None)
+    if not url:
+        return None
+    if url not in clients:
+        clients[url] = redis.Redis.from_url(
+            url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    return clients[url]
+
+
+def get_models(parent_type, selection_set, fragments, schema, models):
+    '''
+    Collects the models of the object types a selection set reaches
+    Args:
+        parent_type (obj): type the selection set is made on
+        selection_set (obj): selection set ast node
+        fragments (dict): fragment definitions by name
+        schema (obj): graphql schema
+        models (set): model labels found so far
+    Return:
+        models (set): model labels
+    '''
+    for field, field_parent in get_fields(
+            schema, parent_type, selection_set, fragments):
+        definition = getattr(field_parent, 'fields', {}).get(
+            field.name.value)
+        if definition is None or not field.selection_set:
+            continue
+        field_type = get_named_type(definition.type)
+        meta = getattr(getattr(field_type, 'graphene_type', None),
+                       '_meta', None)
+        model = getattr(meta, 'model', None)
+        if model is not None:
+            models.add(model._meta.label_lower)
+        get_models(field_type, field.selection_set, fragments, schema,
+                   models)
+    return models
+
+
+def get_cached_models(schema, document_ast, operation_name=None):
+    '''
+    Works out whether an operation can be cached and which models its
+    response is built from
+    Args:
+        schema (obj): graphql schema
+        document_ast (obj): validated document ast node
+        operation_name (str): name of the operation to run
+    Return:
+        models (set): model labels or None when it cannot be cached
+    '''
+    operation, fragments = get_operation(document_ast, operation_name)
+    if operation is None or operation.operation != 'query':
+        return None
+    root_type = schema.get_query_type()
+    fields = get_fields(schema, root_type, operation.selection_set,
+                        fragments)
+    names = {field.name.value for field, _ in fields} - {'__typename'}
+    if not names or not names <= CACHEABLE_FIELDS:
+        return None
+    return get_models(root_type, operation.selection_set, fragments, schema,
+                      set())
+
+
+def get_user_roles(context):
+    '''
+    Authenticates the user of a request ahead of execution and gets
+    their role names
+    Args:
+        context (obj): request object
+    Return:
+        roles (list): sorted role names or None for anonymous users
+    '''
+    user = getattr(context, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            user = authenticate(request=context)
+        except Exception:
+            # the resolvers report invalid tokens
+            return None
+        if user is None:
+            return None
+        context.user = user
+    return sorted(user.groups.filter(
+        name__in=RolesManager.get_roles_names()).values_list(
+            'name', flat=True))
+
+
+def get_cache_key(client, query_hash, models, roles, options):
+    '''
+    Builds the key of a response from the operation, its variables, the
+    roles of the user and the versions of the models it is built from
+    Args:
+        client (obj): redis client
+        query_hash (str): hash of the query text
+        models (set): model labels
+        roles (list): role names
+        options (dict): execute keyword arguments
+    Return:
+        key (str): cache key
+    '''
+    labels = sorted(models)
+    versions = client.mget([VERSION_PREFIX + label for label in labels]) \
+        if labels else []
+    parts = [query_hash, options.get('operation_name'),
+             options.get('variable_values'), roles, labels,
+             [version and version.decode() for version in versions]]
+    return KEY_PREFIX + sha256(json.dumps(
+        parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def execute_cached(query_hash, schema, document_ast, **options):
+    '''
+    Answers reference data operations from the response cache, executing
+    and caching them on a miss. Responses live for at most the
+    GRAPHQL_RESPONSE_CACHE_TTL setting and are dropped as soon as a model
+    they are built from changes.
+    Args:
+        query_hash (str): hash of the query text
+        schema (obj): graphql schema
+        document_ast (obj): validated document ast node
+        options (dict): execute keyword arguments
+    Return:
+        result (obj): execution result
+    '''
+    client = get_client()
+    models = roles = None
+    if client is not None:
+        models = get_cached_models(
+            schema, document_ast, options.get('operation_name'))
+    if models is not None:
+        roles = get_user_roles(options.get('context_value'))
+    if roles is None:
+        return execute(schema, document_ast, **options)
+    try:
+        key = get_cache_key(client, query_hash, models, roles, options)
+        cached = client.get(key)
+    except redis.RedisError:
+        logger.warning('Response cache unavailable', exc_info=True)
+        return execute(schema, document_ast, **options)
+    if cached is not None:
+        RESPONSE_CACHE_HITS.inc()
+        return ExecutionResult(data=json.loads(cached.decode('utf-8')))
+    RESPONSE_CACHE_MISSES.inc()
+    result = execute(schema, document_ast, **options)
+    if isinstance(result, ExecutionResult) and not result.errors:
+        try:
+            client.set(key, json.dumps(result.data),
+                       ex=settings.GRAPHQL_RESPONSE_CACHE_TTL)
+        except redis.RedisError:
+            logger.warning('Response cache unavailable', exc_info=True)
+    return result
+
+
+def invalidate_models(*models):
+    '''
+    Drops the cached responses built from models by bumping their
+    versions. The versions are bumped again once the transaction commits
+    so that responses cached from uncommitted reads are dropped too.
+    Args:
+        models (tuple): model classes
+    '''
+    client = get_client()
+    if client is None:
+        return
+    keys = [VERSION_PREFIX + model._meta.label_lower for model in models]
+
+    def bump():
+        try:
+            with client.pipeline(transaction=False) as pipeline:
+                for key in keys:
+                    pipeline.incr(key)
+                pipeline.execute()
+        except redis.RedisError:
+            logger.warning('Response cache unavailable', exc_info=True)
+    bump()
+    transaction.on_commit(bump)
@@ -0,0 +1,123 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import (
+    BooleanField, CharField, Exists, Func, OuterRef, Q, TextField, Value
+)
+from django.db.models.functions import Greatest
+from django.db.models.lookups import PatternLookup
+from graphql import GraphQLError
+
+from .validation_errors import error_dict
+
+# pg_trgm's own default similarity threshold
+DEFAULT_SIMILARITY = 0.3
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class TrigramContains(PatternLookup):
+    """
+    Case insensitive substring lookup that compares the bare column with
+    ILIKE so that a gin_trgm_ops index on the column can serve it.
+    The builtin icontains wraps the column in UPPER() which no plain
+    column index can be used for.
+    """
+    lookup_name = 'trigram_contains'
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return '{} ILIKE {}'.format(lhs_sql, rhs_sql), lhs_params + rhs_params
+
+
+class SimilarityAtLeast(Func):
+    """
+    Condition that a column is at least as similar to a text as a
+    threshold. Unlike the similarity operator it does not depend on the
+    pg_trgm.similarity_threshold setting of the connection.
+    """
+    arg_joiner = ' >= '
+    template = '(%(expressions)s)'
+    output_field = BooleanField()
+
+    def __init__(self, expression, string, threshold):
+        super().__init__(TrigramSimilarity(expression, string),
+                         Value(threshold))
+
+
+def trigram_filter(search, fields, similarity):
+    '''
+    Builds the condition matching rows whose columns contain the search
+    text or are similar enough to it. Thresholds of at least the pg_trgm
+    default also go through the similarity operator so that the trigram
+    indexes narrow the rows down before their similarity is checked.
+    Args:
+        search (str): search text
+        fields (list): columns to search
+        similarity (float): similarity threshold between 0 and 1
+    Return:
+        filter (obj): Q object
+    '''
+    filter = Q()
+    for field in fields:
+        similar = Q(SimilarityAtLeast(field, search, similarity))
+        if similarity >= DEFAULT_SIMILARITY:
+            similar &= Q(**{'{}__trigram_similar'.format(field): search})
+        filter |= similar | Q(
+            **{'{}__trigram_contains'.format(field): search})
+    return filter
+
+
+def related_exists(model, relation, filter):
+    '''
+    Builds a semi join keeping the rows that have at least one related
+    row matching a condition. Unlike filtering across the relation this
+    never repeats a row however many of its related rows match, so
+    counts stay correct without a DISTINCT over the whole row.
+    Args:
+        model (obj): model of the rows being filtered
+        relation (str): foreign key, many to many or reverse relation
+        filter (obj): Q object applied to the related rows
+    Return:
+        exists (obj): Exists expression
+    '''
+    field = model._meta.get_field(relation)
+    if field.many_to_many and field.concrete:
+        link = {field.related_query_name(): OuterRef('pk')}
+    elif field.concrete:
+        link = {'pk': OuterRef(field.attname)}
+    else:
+        link = {field.field.name: OuterRef('pk')}
+    return Exists(field.related_model._default_manager.filter(filter, **link))
+
+
+def trigram_search(queryset, search, fields, similarity=None, related=None):
+    '''
+    Fuzzy and substring search served by the trigram indexes of the
+    given columns. Rows whose columns contain the search text or are
+    similar enough to it are returned, most similar first.
+    Args:
+        queryset (obj): queryset to search
+        search (str): search text
+        fields (list): columns to search
+        similarity (float): similarity threshold, defaults to 0.3
+        related (dict): relations mapped to the columns of the related
+            rows to search, each searched through its own semi join
+    Raise:
+        raise GraphQLError if the threshold is out of range
+    Return:
+        queryset (obj): matching rows annotated with their similarity
+    '''
+    if similarity is None:
+        similarity = DEFAULT_SIMILARITY
+    if not 0 <= similarity <= 1:
+        raise GraphQLError(error_dict['invalid_input'].format(
+            'similarity between 0 and 1'))
+    filter = trigram_filter(search, fields, similarity)
+    for relation, related_fields in (related or {}).items():
+        filter |= Q(related_exists(
+            queryset.model, relation,
+            trigram_filter(search, related_fields, similarity)))
+    scores = [TrigramSimilarity(field, search) for field in fields]
+    score = Greatest(*scores) if len(scores) > 1 else scores[0]
+    return queryset.filter(filter).annotate(
+        similarity=score).order_by('-similarity', '-created_at')
@@ -15,6 +15,12 @@ error_dict = {
     "permission_denied": "You are not permitted to {} this {}",
     "admin_only": "You are not permitted to {}",
     "valid_options": "Invalid {} options. Allowed options are {}",
+    "query_too_costly": "Query cost {} exceeds the maximum of {}",
+    "query_too_deep": "Query depth {} exceeds the maximum of {}",
+    "too_many_rows": "You can submit at most {} rows at a time",
+    "invalid_rows": "{} rows are invalid. Nothing was saved",
+    "duplicate_row": "Replaced by row {} with the same {}",
+    "not_resumable": "Only failed {} can be resumed",
     'account_deactivated': 'Account is temporarily deactivated. Kindly activate it to continue.',
     'account_unverified': 'Account is not verified. Kindly verify your account via the link sent to your email to continue',
     'email_text_missing': "You must provide either the email or text",
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from graphql import parse
+from graphql.error import GraphQLSyntaxError
+from graphql.validation import validate
+
+from ....schema import schema
+from ...helpers.persisted_queries import (
+    get_query_hash, register_persisted_query
+)
+
+
+class Command(BaseCommand):
+    help = ('Validates GraphQL documents and registers them as persisted '
+            'queries. Accepts .graphql files holding one document each and '
+            'JSON manifests mapping SHA-256 hashes to documents.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+',
+                            help='.graphql documents or JSON manifests')
+
+    def handle(self, *args, **options):
+        documents = []
+        for path in options['paths']:
+            with open(path) as source:
+                if path.endswith('.json'):
+                    documents += self.read_manifest(path, json.load(source))
+                else:
+                    documents.append((path, source.read()))
+        for name, query in documents:
+            self.validate(name, query)
+        for name, query in documents:
+            persisted_query = register_persisted_query(query)
+            self.stdout.write('{} {}'.format(persisted_query.sha256_hash, name))
+        self.stdout.write(self.style.SUCCESS(
+            'Registered {} queries'.format(len(documents))))
+
+    def read_manifest(self, path, manifest):
+        documents = []
+        for sha256_hash, query in manifest.items():
+            if get_query_hash(query) != sha256_hash:
+                raise CommandError('{}: {} does not match its query'.format(
+                    path, sha256_hash))
+            documents.append(('{}#{}'.format(path, sha256_hash), query))
+        return documents
+
+    def validate(self, name, query):
+        try:
+            errors = validate(schema, parse(query))
+        except GraphQLSyntaxError as error:
+            errors = [error]
+        if errors:
+            raise CommandError('{}: {}'.format(
+                name, '; '.join(error.message for error in errors)))
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.4 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersistedQuery',
+            fields=[
+                ('deleted_at', models.DateTimeField(blank=True, db_index=True, default=None, editable=False, null=True)),
+                ('id', models.CharField(db_index=True, max_length=255, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sha256_hash', models.CharField(max_length=64, unique=True)),
+                ('query', models.TextField()),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='persistedquery',
+            index=models.Index(fields=['created_at', 'id'], name='persistedquery_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.4 on 2026-10-18 10:29
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_persisted_query'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='persistedquery',
+            index=models.Index(django.db.models.functions.comparison.Collate('id', 'C'), name='persistedquery_id_order_idx'),
+        ),
+    ]
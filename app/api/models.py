@@ -1,15 +1,117 @@
+from copy import deepcopy
+from uuid import UUID
+
+from django.core import exceptions
 from django.db import models
+from django.db.models.functions import Collate
 
-from softdelete.models import SoftDeleteObject
+from softdelete.models import SoftDeleteObject, SoftDeleteQuerySet
 from softdelete.models import SoftDeleteManager
-from .helpers.push_id import PushID
+from .helpers.push_id import (
+    get_id_bound, push_id, push_id_to_uuid, uuid_to_push_id
+)
+
+# Push ids sort in ASCII order, which only the C collation follows
+ID_ORDER = Collate('id', 'C')
+# Pads a time bound into the smallest push id of its millisecond
+ID_BOUND_PADDING = '-' * 12
+
+
+class PushIDField(models.UUIDField):
+    """
+    Stores push ids in 16 byte uuid columns rather than as text. Values
+    are push id strings in Python and packed into UUIDs that sort in the
+    same order only when they are sent to the database.
+    """
+    description = 'Push id stored as a UUID'
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        if not isinstance(value, UUID):
+            value = UUID(value)
+        return uuid_to_push_id(value)
+
+    def to_python(self, value):
+        if isinstance(value, UUID):
+            return uuid_to_push_id(value)
+        return value
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or isinstance(value, UUID):
+            return value
+        try:
+            return push_id_to_uuid(value)
+        except ValueError:
+            raise exceptions.ValidationError(
+                self.error_messages['invalid'], code='invalid',
+                params={'value': value})
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None or connection.features.has_native_uuid_field:
+            return value
+        return value.hex
+
+
+class BaseQuerySet(SoftDeleteQuerySet):
+    """
+    Queries on the creation time of rows that are answered from their
+    ids, whose first characters encode the millisecond they were
+    pushed at
+    """
+
+    def created_between(self, start=None, end=None):
+        '''
+        Filters the rows created from start up to, but not including, end
+        as a range scan of the id index
+        Args:
+            start (datetime): earliest creation time, if any
+            end (datetime): creation time to stop at, if any
+        Return:
+            queryset (obj): filtered queryset
+        '''
+        qs = self.alias(id_order=self.get_id_order())
+        if start is not None:
+            qs = qs.filter(
+                id_order__gte=get_id_bound(start) + ID_BOUND_PADDING)
+        if end is not None:
+            qs = qs.filter(id_order__lt=get_id_bound(end) + ID_BOUND_PADDING)
+        return qs
+
+    def newest_first(self):
+        '''
+        Orders rows by their ids, newest first, which is the order of
+        their creation time
+        Return:
+            queryset (obj): ordered queryset
+        '''
+        return self.order_by(self.get_id_order().desc())
+
+    def get_id_order(self):
+        '''
+        Gets the expression ordering the ids of the model as push ids
+        Return:
+            expression (obj): the id, collated as C when it is text
+        '''
+        if isinstance(self.model._meta.pk, PushIDField):
+            return models.F('id')
+        return ID_ORDER
+
+
+class BaseManager(SoftDeleteManager.from_queryset(BaseQuerySet)):
+    """
+    Manager of the rows that have not been deleted
+    """
 
 
 class BaseModel(SoftDeleteObject):
     """
     The common field in all the models are defined here
     """
-    objects = SoftDeleteManager()
+    objects = BaseManager()
 
     # Add id to every entry in the database
     id = models.CharField(db_index=True, max_length=255,
@@ -21,12 +123,118 @@ class BaseModel(SoftDeleteObject):
     # A timestamp reprensenting when this object was last updated.
     updated_at = models.DateTimeField(auto_now=True)
 
-    def save(self, *args, **kwargs):  # pylint: disable=W0221
-        push_id = PushID()
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(BaseModel, cls).from_db(db, field_names, values)
+        instance._loaded_values = instance.get_field_values(field_names)
+        return instance
+
+    def get_field_values(self, field_names):
+        '''
+        Snapshots the values of loaded fields so that later changes to them
+        can be found. Lists and dicts are copied as they may be changed in
+        place.
+        Args:
+            field_names (list): attribute names of the fields
+        Return:
+            values (dict): values keyed by attribute name
+        '''
+        values = {}
+        for name in field_names:
+            if name in self.__dict__:
+                value = self.__dict__[name]
+                values[name] = deepcopy(value) \
+                    if isinstance(value, (list, dict)) else value
+        return values
+
+    def get_changed_fields(self):
+        '''
+        Lists the fields changed since the instance was loaded or saved
+        Return:
+            fields (list): attribute names of the changed fields, or None
+                if the instance was not loaded or its primary key changed
+        '''
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None or loaded.get(self._meta.pk.attname) != self.pk:
+            return None
+        changed = []
+        for field in self._meta.concrete_fields:
+            name = field.attname
+            if field.primary_key or name not in self.__dict__:
+                continue
+            if name not in loaded or loaded[name] != self.__dict__[name]:
+                changed.append(name)
+        return changed
+
+    def save(self, force_insert=False, force_update=False, using=None,
+             update_fields=None):
         # This to check if it creates a new or updates an old instance
         if not self.id:
             self.id = push_id.next_id()
-        super(BaseModel, self).save()  # pylint: disable=W0221
+        if update_fields is None and not force_insert and \
+                not self._state.adding:
+            changed = self.get_changed_fields()
+            if changed is not None:
+                update_fields = changed + ['updated_at']
+        super(BaseModel, self).save(
+            force_insert=force_insert, force_update=force_update,
+            using=using, update_fields=update_fields)
+        self.remember_fields(update_fields)
+
+    def refresh_from_db(self, using=None, fields=None):
+        super(BaseModel, self).refresh_from_db(using=using, fields=fields)
+        self.remember_fields(fields)
+
+    def remember_fields(self, names=None):
+        '''
+        Takes the values of fields that were just saved or read as the
+        ones later changes are found against
+        Args:
+            names (list): names of the fields, all of them if None
+        '''
+        if names is None:
+            fields = self._meta.concrete_fields
+        else:
+            fields = [self._meta.get_field(name) for name in names]
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **self.get_field_values([field.attname for field in fields])}
 
     class Meta:
         abstract = True  # Set this model as Abstract
+        # Serves the newest first listings and their keyset pagination
+        indexes = [
+            models.Index(fields=['created_at', 'id'],
+                         name='%(class)s_keyset_idx'),
+            # Serves created_between and newest_first
+            models.Index(ID_ORDER, name='%(class)s_id_order_idx'),
+        ]
+
+
+class CompactBaseModel(BaseModel):
+    """
+    Base of the models whose push ids are stored in uuid columns, which
+    makes their primary key and foreign key indexes and joins smaller
+    and faster. Push ids are still read and written as strings.
+    """
+    id = PushIDField(primary_key=True)
+
+    class Meta(BaseModel.Meta):
+        abstract = True
+        # uuids already sort like the push ids they pack
+        indexes = [
+            models.Index(fields=['created_at', 'id'],
+                         name='%(class)s_keyset_idx'),
+        ]
+
+
+class PersistedQuery(BaseModel):
+    """
+    A validated GraphQL document clients can run by sending the
+    SHA-256 hash of its text instead of the text itself
+    """
+    sha256_hash = models.CharField(max_length=64, unique=True)
+    query = models.TextField()
+
+    def __str__(self):
+        return self.sha256_hash
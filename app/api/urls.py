@@ -15,10 +15,14 @@ Including another URLconf
 """
 from django.urls import path, include
 from django.views.decorators.csrf import csrf_exempt
-from graphene_django.views import GraphQLView
+
+from .employee.views import export
+from .views import GraphQLView, metrics
 
 urlpatterns = [
     path('graphql/', csrf_exempt(GraphQLView.as_view(graphiql=True))),
     path('graphql/users/', include(('app.api.authentication.urls',
                                     'authentication'), namespace='authentication')),
+    path('metrics/', metrics, name='metrics'),
+    path('export/<str:kind>/', export, name='export'),
 ]
@@ -0,0 +1,102 @@
+from hmac import compare_digest
+from time import perf_counter
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBadRequest
+from graphene_django.views import GraphQLView as BaseGraphQLView, HttpError
+from graphql.execution import ExecutionResult
+
+from .helpers.document_cache import CachedGraphQLBackend
+from .helpers.instrumentation import count_queries, record_operation
+from .helpers.metrics import CONTENT_TYPE, registry
+from .helpers.permission_required import admin_request_error
+from .helpers.persisted_queries import (
+    allowlist_only, get_requested_hash, remember_persisted_query,
+    resolve_persisted_query
+)
+
+
+# shared by every view so that documents are parsed and validated once
+# per process
+document_backend = CachedGraphQLBackend(settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+
+
+class GraphQLView(BaseGraphQLView):
+    """
+    GraphQL endpoint recording the wall time, SQL queries and rows
+    fetched of every operation. Parsed and validated documents are
+    reused across requests and clients may send the hash of a persisted
+    query in place of its text. The extensions of a result, such as its
+    estimated cost, are sent along with its data.
+
+    A JSON array of operations posted in one request is executed in
+    order and answered with an array of results. The operations share
+    the request as their context, so the user is authenticated once and
+    data loaders are reused across them.
+    """
+
+    def __init__(self, backend=None, **kwargs):
+        super().__init__(backend=backend or document_backend, **kwargs)
+
+    def parse_body(self, request):
+        if self.get_content_type(request) == 'application/json' and \
+                request.body.lstrip().startswith(b'['):
+            # views are instantiated per request
+            self.batch = True
+        data = super().parse_body(request)
+        max_size = settings.GRAPHQL_MAX_BATCH_SIZE
+        if self.batch and len(data) > max_size:
+            raise HttpError(HttpResponseBadRequest(
+                'A batch can hold at most {} operations.'.format(max_size)))
+        return data
+
+    def execute_graphql_request(self, request, data, query, variables,
+                                operation_name, show_graphiql=False):
+        sha256_hash = get_requested_hash(request, data)
+        sent_query = query
+        query, error = resolve_persisted_query(query, sha256_hash)
+        if error:
+            return ExecutionResult(errors=[error])
+        request.graphql_operation_name = operation_name
+        request.graphql_extensions = None
+        with count_queries() as counter:
+            start = perf_counter()
+            result = super().execute_graphql_request(
+                request, data, query, variables, operation_name,
+                show_graphiql)
+            duration = perf_counter() - start
+        if result:
+            request.graphql_extensions = result.extensions
+        if query:
+            # only registered queries run in allowlist mode
+            record_operation(
+                request.graphql_operation_name, duration, counter,
+                registered=allowlist_only())
+        if sha256_hash and sent_query and result and not result.invalid \
+                and not allowlist_only():
+            remember_persisted_query(sent_query)
+        return result
+
+    def json_encode(self, request, d, pretty=False):
+        extensions = getattr(request, 'graphql_extensions', None)
+        if extensions and isinstance(d, dict) and 'extensions' not in d:
+            d = dict(d, extensions=extensions)
+        return super().json_encode(request, d, pretty)
+
+
+def metrics(request):
+    """
+    Exposes the metrics of the process in the Prometheus text format to
+    scrapers sending the METRICS_SCRAPE_TOKEN setting as a bearer token,
+    and to admins and managers authenticated with a JWT
+    Args:
+        request (obj): request object
+    """
+    token = settings.METRICS_SCRAPE_TOKEN
+    if not token or not compare_digest(
+            request.META.get('HTTP_AUTHORIZATION', '').encode(),
+            'Bearer {}'.format(token).encode()):
+        error = admin_request_error(request, 'read metrics')
+        if error:
+            return error
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
@@ -11,6 +11,7 @@ if not os.getenv('DJANGO_SETTINGS_MODULE', ''):
 
 CELERY_TASKS = [
     'app.api.helpers.tasks',
+    'app.api.employee.tasks',
 ]
 
 app = Celery('app', include=CELERY_TASKS)
@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
 
     'graphene_django',
@@ -62,9 +63,52 @@ GRAPHENE = {
     'SCHEMA': 'app.schema.schema',
     'MIDDLEWARE': [
         'graphql_jwt.middleware.JSONWebTokenMiddleware',
+        'app.api.helpers.instrumentation.InstrumentationMiddleware',
+        'app.api.helpers.loaders.LoaderMiddleware',
     ],
 }
 
+# Most operations accepted in one batched request
+GRAPHQL_MAX_BATCH_SIZE = int(os.getenv('GRAPHQL_MAX_BATCH_SIZE', 10))
+
+# Most rows a bulk create mutation accepts at a time
+BULK_CREATE_MAX_ROWS = int(os.getenv('BULK_CREATE_MAX_ROWS', 5000))
+
+# Operations taking longer than this many milliseconds are logged, unset
+# to turn the slow operation log off
+GRAPHQL_SLOW_OPERATION_MS = os.getenv('GRAPHQL_SLOW_OPERATION_MS')
+
+# Most operation names clients choose that label the operation metrics,
+# later names are recorded as 'other'. Registered queries are always
+# labelled with their names.
+GRAPHQL_OPERATION_LABEL_LIMIT = int(
+    os.getenv('GRAPHQL_OPERATION_LABEL_LIMIT', 100))
+
+# Bearer token metrics scrapers authenticate with, unset to only let
+# admins read the metrics
+METRICS_SCRAPE_TOKEN = os.getenv('METRICS_SCRAPE_TOKEN')
+
+# Number of parsed and validated GraphQL documents kept per process
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.getenv('GRAPHQL_DOCUMENT_CACHE_SIZE', 500))
+
+# Seconds and number of rows that reference rows looked up by mutations
+# are kept in process memory
+REFERENCE_CACHE_TTL = int(os.getenv('REFERENCE_CACHE_TTL', 60))
+REFERENCE_CACHE_SIZE = int(os.getenv('REFERENCE_CACHE_SIZE', 10000))
+
+# Only run queries registered with the register_queries command
+GRAPHQL_PERSISTED_QUERIES_ONLY = os.getenv(
+    'GRAPHQL_PERSISTED_QUERIES_ONLY', 'False') == 'True'
+# Seconds registered and client persisted queries are kept in process
+# memory, as many of them as there are cached documents
+GRAPHQL_PERSISTED_QUERY_CACHE_TTL = int(
+    os.getenv('GRAPHQL_PERSISTED_QUERY_CACHE_TTL', 300))
+
+# Operations estimated to resolve more fields, or nest deeper, than this
+# are rejected before they run
+GRAPHQL_MAX_QUERY_COST = int(os.getenv('GRAPHQL_MAX_QUERY_COST', 20000))
+GRAPHQL_MAX_QUERY_DEPTH = int(os.getenv('GRAPHQL_MAX_QUERY_DEPTH', 10))
+
 GRAPHQL_JWT = {
     'JWT_VERIFY_EXPIRATION': True,
     'JWT_EXPIRATION_DELTA': timedelta(days=1),
@@ -188,6 +232,18 @@ CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 
+# Most employees of an employer paid by one payroll task, larger
+# employers are split into employee id ranges
+PAYROLL_PARTITION_SIZE = int(os.getenv('PAYROLL_PARTITION_SIZE', 20000))
+
+# Redis database caching reference data responses, unset to turn the
+# response cache off. Cached responses are dropped when the models they
+# are built from change and live for at most GRAPHQL_RESPONSE_CACHE_TTL
+# seconds.
+GRAPHQL_RESPONSE_CACHE_URL = os.getenv(
+    'GRAPHQL_RESPONSE_CACHE_URL', CELERY_BROKER_URL)
+GRAPHQL_RESPONSE_CACHE_TTL = int(os.getenv('GRAPHQL_RESPONSE_CACHE_TTL', 300))
+
 # Agency
 MAIL_CAPTION=os.getenv('MAIL_CAPTION', '')
 